@@ -193,6 +193,7 @@ export class JobService {
     const avgTimes: Record<string, number> = {
       // GPU operations (RunPod)
       img2vid: 5,
+      img2vid_timeline: 5,
       caption: 2,
       addaudio: 1,
       caption_segments: 2,
@@ -9,6 +9,7 @@ import { RunPodService } from '../services/runpodService';
 import { QueueManager } from './queueManager';
 import { WebhookService } from './webhookService';
 import { logger } from '../../shared/utils/logger';
+import { aggregateResults, isFailedResult, getResultError } from '../utils/resultAggregator';
 
 export class WorkerMonitor {
   private storage: JobStorage;
@@ -194,7 +195,13 @@ export class WorkerMonitor {
       // Verificar se todos completaram
       const allCompleted = statuses.every(s => s.status === 'COMPLETED');
       if (allCompleted) {
-        await this.handleJobCompleted(job, statuses);
+        // Streaming img2vid completa mesmo com clips falhos: sem nenhum vídeo é falha
+        const result = aggregateResults(job.operation, statuses);
+        if (isFailedResult(result)) {
+          await this.handleJobFailed(job, statuses, getResultError(result));
+        } else {
+          await this.handleJobCompleted(job, result);
+        }
         return;
       }
 
@@ -234,11 +241,17 @@ export class WorkerMonitor {
   /**
    * Processa job completado
    */
-  private async handleJobCompleted(job: Job, statuses: any[]): Promise<void> {
-    logger.info('✅ Job COMPLETED', { jobId: job.jobId });
-
-    // Agregar resultados
-    const result = this.aggregateResults(job.operation, statuses);
+  private async handleJobCompleted(job: Job, result: any): Promise<void> {
+    if (result.success === false) {
+      // Parcial: vídeos prontos + failures no resultado (webhook COMPLETED com success: false)
+      logger.warn('⚠️ Job COMPLETED with failures', {
+        jobId: job.jobId,
+        videos: result.videos?.length || 0,
+        failures: result.failures?.length || 0
+      });
+    } else {
+      logger.info('✅ Job COMPLETED', { jobId: job.jobId });
+    }
 
     // Calcular execution time
     const startTime = job.submittedAt || job.createdAt;
@@ -349,37 +362,6 @@ export class WorkerMonitor {
     } as any);
   }
 
-  /**
-   * Agregar resultados de múltiplos sub-jobs
-   */
-  private aggregateResults(operation: JobOperation, statuses: any[]): any {
-    if (operation === 'img2vid' && statuses.length > 1) {
-      // Multi-worker img2vid: agregar todos os vídeos
-      const allVideos: any[] = [];
-      for (const status of statuses) {
-        if (status.output?.videos) {
-          allVideos.push(...status.output.videos);
-        }
-      }
-
-      // Ordenar por filename (video_1.mp4, video_2.mp4, etc)
-      allVideos.sort((a, b) => {
-        const aNum = parseInt(a.filename.match(/video_(\d+)\.mp4/)?.[1] || '0');
-        const bNum = parseInt(b.filename.match(/video_(\d+)\.mp4/)?.[1] || '0');
-        return aNum - bNum;
-      });
-
-      return {
-        code: 200,
-        message: `${allVideos.length} videos processed successfully`,
-        videos: allVideos
-      };
-    }
-
-    // Single job: retornar output direto
-    return statuses[0]?.output || {};
-  }
-
   /**
    * Verificar timeouts de jobs GPU/RunPod
    * IMPORTANTE: Apenas jobs GPU são verificados
@@ -453,6 +435,7 @@ export class WorkerMonitor {
     const executionTimeouts: Record<string, number> = {
       // Baseado em análise de logs reais + requisitos de produção:
       img2vid: 45 * 60 * 1000,           // 45 min (80-150 imgs, 2 workers, ~37 min max + margem)
+      img2vid_timeline: 45 * 60 * 1000,  // 45 min (1 worker renders all segments + concat copy)
       caption: 10 * 60 * 1000,           // 10 min (operação rápida)
       addaudio: 10 * 60 * 1000,          // 10 min
       caption_segments: 10 * 60 * 1000,  // 10 min
@@ -7,6 +7,7 @@ import { Router, Request, Response } from 'express';
 import { logger } from '../../shared/utils/logger';
 import { JobService } from '../queue/jobService';
 import Joi from 'joi';
+import { renderQualitySchema, chunkedEncodingSchema } from '../../shared/middleware/validation';
 import { WebhookService } from '../queue/webhookService';
 
 const router = Router();
@@ -93,6 +94,8 @@ const unifiedCaptionSchema = Joi.object({
   output_filename: Joi.string().required(),
   type: Joi.string().valid('segments', 'highlight').required(),
   uppercase: Joi.boolean().default(false),
+  quality: renderQualitySchema,
+  chunked: chunkedEncodingSchema,
 
   // Conditional style validation based on type
   style: Joi.when('type', {
@@ -175,7 +178,7 @@ router.post('/runpod/video/caption_style', authenticateApiKey, async (req: Reque
       });
     }
 
-    const { webhook_url, id_roteiro, url_video, url_caption, path, output_filename, type, uppercase, style } = value;
+    const { webhook_url, id_roteiro, url_video, url_caption, path, output_filename, type, uppercase, style, quality, chunked } = value;
 
     // Extract path_raiz from path
     const pathRaiz = extractPathRaiz(path);
@@ -262,6 +265,9 @@ router.post('/runpod/video/caption_style', authenticateApiKey, async (req: Reque
       };
     }
 
+    // Worker render options (undefined keys are dropped by JSON serialization)
+    jobData = { ...jobData, quality, chunked };
+
     // Create job and enqueue (with pathRaiz)
     const job = await jobService.createJob(operation, jobData, webhook_url, id_roteiro, pathRaiz);
 
@@ -6,6 +6,7 @@ import { Router, Request, Response } from 'express';
 import { logger } from '../../shared/utils/logger';
 import { JobService } from '../queue/jobService';
 import Joi from 'joi';
+import { renderQualitySchema } from '../../shared/middleware/validation';
 import { WebhookService } from '../queue/webhookService';
 
 const router = Router();
@@ -50,7 +51,8 @@ const trilhaSonoraSchema = Joi.object({
   trilha_sonora: Joi.string().required(),
   path: Joi.string().required(),
   output_filename: Joi.string().required(),
-  volume_reduction_db: Joi.number().min(0).max(40).optional()  // Optional: auto-normalizes to -20dB if not provided
+  volume_reduction_db: Joi.number().min(0).max(40).optional(),  // Optional: auto-normalizes to -20dB if not provided
+  quality: renderQualitySchema
 });
 
 // ============================================
@@ -94,7 +96,7 @@ router.post('/runpod/video/trilhasonora', authenticateApiKey, async (req: Reques
       return;
     }
 
-    const { webhook_url, id_roteiro, url_video, trilha_sonora, path, output_filename, volume_reduction_db } = value;
+    const { webhook_url, id_roteiro, url_video, trilha_sonora, path, output_filename, volume_reduction_db, quality } = value;
     const pathRaiz = extractPathRaiz(path);
 
     logger.info('🚀 TrilhaSonora request received (GPU-accelerated)', {
@@ -116,7 +118,8 @@ router.post('/runpod/video/trilhasonora', authenticateApiKey, async (req: Reques
       trilha_sonora,
       path,
       output_filename,
-      volume_reduction_db
+      volume_reduction_db,
+      quality
     };
 
     // Create job (processed by RunPod GPU worker with NVENC)
@@ -7,6 +7,7 @@ import { logger } from '../../shared/utils/logger';
 import { JobService } from '../queue/jobService';
 import {
   Img2VidRequestAsync,
+  Img2VidTimelineRequestAsync,
   AddAudioRequestAsync,
   ConcatenateRequestAsync,
   ConcatVideoAudioRequestAsync
@@ -14,6 +15,7 @@ import {
 import {
   validateRequest,
   img2VidRequestSchema,
+  img2VidTimelineRequestSchema,
   addAudioRequestSchema,
   concatenateRequestSchema,
   concatVideoAudioRequestSchema
@@ -128,6 +130,58 @@ router.post(
   }
 );
 
+/**
+ * POST /runpod/video/img2vid_timeline
+ * Render images with zoom effects straight into ONE final video (optional audio)
+ * Returns immediately with jobId - result sent to webhook_url
+ */
+router.post(
+  '/runpod/video/img2vid_timeline',
+  authenticateApiKey,
+  validateRequest(img2VidTimelineRequestSchema),
+  async (req: Request, res: Response): Promise<void> => {
+    try {
+      const { webhook_url, id_roteiro, ...data }: Img2VidTimelineRequestAsync = req.body;
+
+      // Extract path_raiz from path
+      const pathRaiz = extractPathRaiz(data.path);
+
+      logger.info('🎞️ Img2Vid timeline request received', {
+        imageCount: data.images.length,
+        idRoteiro: id_roteiro,
+        webhookUrl: webhook_url,
+        path: data.path,
+        pathRaiz: pathRaiz,
+        outputFilename: data.output_filename,
+        withAudio: !!data.url_audio,
+        ip: req.ip
+      });
+
+      // Create job and enqueue (with pathRaiz)
+      const job = await jobService.createJob('img2vid_timeline', data, webhook_url, id_roteiro, pathRaiz);
+
+      logger.info('✅ Img2Vid timeline job created', {
+        jobId: job.jobId,
+        status: job.status,
+        imageCount: data.images.length,
+        pathRaiz: pathRaiz
+      });
+
+      res.status(202).json(job);
+
+    } catch (error) {
+      logger.error('❌ Img2Vid timeline job creation failed', {
+        error: error instanceof Error ? error.message : 'Unknown error'
+      });
+
+      res.status(500).json({
+        error: 'Job creation failed',
+        message: error instanceof Error ? error.message : 'Unknown error'
+      });
+    }
+  }
+);
+
 /**
  * POST /runpod/video/addaudio
  * Synchronize audio with video
@@ -4,6 +4,7 @@
 
 import axios, { AxiosInstance } from 'axios';
 import { logger } from '../../shared/utils/logger';
+import { isFailedResult, getResultError } from '../utils/resultAggregator';
 import {
   RunPodJobRequest,
   RunPodJobResponse,
@@ -14,6 +15,19 @@ import {
 } from '../../shared/types';
 import { buildForceStyleString } from '../../shared/utils/subtitleStyles';
 
+/**
+ * Workers started with STREAMING_HANDLER=on use a generator handler: /status
+ * returns the list of yielded events (return_aggregate_stream). The last
+ * event is the job result (img2vid summary or the operation's single dict),
+ * so callers keep reading a plain output object.
+ */
+function unwrapAggregatedOutput(job: RunPodJobResponse): RunPodJobResponse {
+  if (Array.isArray(job.output)) {
+    return { ...job, output: job.output.length ? job.output[job.output.length - 1] : undefined };
+  }
+  return job;
+}
+
 export class RunPodService {
   private client: AxiosInstance;
   private endpointId: string;
@@ -153,6 +167,7 @@ export class RunPodService {
           code: 200,
           message: result.output.message || 'Images converted to videos and uploaded to S3 successfully',
           videos,
+          ...(result.output.failures?.length ? { success: false, failures: result.output.failures } : {}),
           execution: {
             startTime: new Date(startTime).toISOString(),
             endTime: new Date(endTime).toISOString(),
@@ -308,7 +323,7 @@ export class RunPodService {
           `/${this.endpointId}/status/${jobId}`
         );
 
-        const job = response.data;
+        const job = unwrapAggregatedOutput(response.data);
         const elapsedSec = ((Date.now() - startTime) / 1000).toFixed(1);
 
         // Log only when status changes or every 10 attempts
@@ -329,6 +344,15 @@ export class RunPodService {
           if (!job.output) {
             throw new Error('Job completed but no output returned');
           }
+          // Streaming img2vid completes even when every clip failed
+          if (isFailedResult(job.output)) {
+            logger.error('❌ RunPod job completed without results', {
+              jobId,
+              error: getResultError(job.output),
+              totalTime: `${elapsedSec}s`
+            });
+            throw new Error(getResultError(job.output));
+          }
           logger.info('✅ RunPod job completed', {
             jobId,
             totalTime: `${elapsedSec}s`,
@@ -425,7 +449,7 @@ export class RunPodService {
       const response = await this.client.get<RunPodJobResponse>(
         `/${this.endpointId}/status/${jobId}`
       );
-      return response.data;
+      return unwrapAggregatedOutput(response.data);
     } catch (error) {
       if (axios.isAxiosError(error)) {
         throw new Error(
@@ -517,14 +541,18 @@ export class RunPodService {
 
     // Collect all videos from all workers (already uploaded to S3)
     const allVideos: any[] = [];
+    const failures: any[] = [];
     for (const result of results) {
       if (result.output.videos) {
-        allVideos.push(...result.output.videos.map((v: any) => ({
+        allVideos.push(...result.output.videos.filter((v: any) => v).map((v: any) => ({
           id: v.id,
           video_url: v.video_url,
           filename: v.filename
         })));
       }
+      if (result.output.failures) {
+        failures.push(...result.output.failures);
+      }
     }
 
     // Sort videos by filename (video_1.mp4, video_2.mp4, etc) to preserve original order
@@ -551,8 +579,11 @@ export class RunPodService {
 
     return {
       code: 200,
-      message: `${totalImages} images processed across ${workerBatches.length} workers and uploaded to S3`,
+      message: failures.length
+        ? `${allVideos.length} of ${totalImages} images processed across ${workerBatches.length} workers, ${failures.length} failed`
+        : `${totalImages} images processed across ${workerBatches.length} workers and uploaded to S3`,
       videos: allVideos,
+      ...(failures.length ? { success: false, failures } : {}),
       execution: {
         startTime: new Date(startTime).toISOString(),
         endTime: new Date(endTime).toISOString(),
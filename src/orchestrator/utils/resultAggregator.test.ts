@@ -0,0 +1,62 @@
+import { aggregateResults, isFailedResult, getResultError } from './resultAggregator';
+
+const video = (n: number) => ({ id: `img-${n}`, filename: `video_${n}.mp4`, video_url: `https://s3/video_${n}.mp4` });
+
+// Summary de um sub-job img2vid em streaming (worker com fail_fast=False)
+const summary = (videos: any[], failures: any[]) => ({
+  status: 'COMPLETED',
+  output: {
+    message: failures.length ? `${failures.length} of ${videos.length + failures.length} images failed` : 'ok',
+    videos,
+    failures,
+    success: failures.length === 0
+  }
+});
+
+describe('aggregateResults', () => {
+  it('reports a multi-worker img2vid batch with one failed clip as partial', () => {
+    const result = aggregateResults('img2vid', [
+      summary([video(3), null], [{ index: 1, id: 'img-4', error: 'ffmpeg exited 1' }]),
+      summary([video(2), video(1)], [])
+    ]);
+
+    expect(result.success).toBe(false);
+    expect(result.videos.map((v: any) => v.filename)).toEqual(['video_1.mp4', 'video_2.mp4', 'video_3.mp4']);
+    expect(result.failures).toHaveLength(1);
+    expect(result.message).toBe('3 videos processed, 1 failed');
+    expect(isFailedResult(result)).toBe(false);
+  });
+
+  it('keeps a fully successful multi-worker batch unchanged', () => {
+    const result = aggregateResults('img2vid', [summary([video(1)], []), summary([video(2)], [])]);
+
+    expect(result.success).toBe(true);
+    expect(result.failures).toBeUndefined();
+    expect(result.message).toBe('2 videos processed successfully');
+  });
+
+  it('drops null videos from a single-worker output', () => {
+    const result = aggregateResults('img2vid', [
+      summary([video(1), null], [{ index: 1, id: 'img-2', error: 'ffmpeg exited 1' }])
+    ]);
+
+    expect(result.videos).toEqual([video(1)]);
+    expect(result.success).toBe(false);
+    expect(isFailedResult(result)).toBe(false);
+  });
+});
+
+describe('isFailedResult', () => {
+  it('fails a batch where every clip failed', () => {
+    const result = aggregateResults('img2vid', [
+      summary([], [{ index: 0, id: 'img-1', error: 'ffmpeg exited 1' }])
+    ]);
+
+    expect(isFailedResult(result)).toBe(true);
+    expect(getResultError(result)).toBe('ffmpeg exited 1');
+  });
+
+  it('fails an error output yielded by the generator handler', () => {
+    expect(isFailedResult({ error: 'Missing S3 config', error_type: 'CONFIG_ERROR' })).toBe(true);
+  });
+});
@@ -0,0 +1,70 @@
+// ============================================
+// Result Aggregator
+// Combina os outputs dos sub-jobs RunPod de um job
+// ============================================
+
+import { JobOperation } from '../../shared/types';
+
+/**
+ * Agregar resultados de múltiplos sub-jobs
+ *
+ * Sub-jobs img2vid em streaming (STREAMING_HANDLER=on) completam mesmo com
+ * clips falhos: o output traz success: false e a lista failures. Entradas
+ * nulas em videos são ignoradas e as falhas são propagadas no resultado.
+ */
+export function aggregateResults(operation: JobOperation, statuses: any[]): any {
+  if (operation === 'img2vid' && statuses.length > 1) {
+    // Multi-worker img2vid: agregar todos os vídeos
+    const allVideos: any[] = [];
+    const failures: any[] = [];
+    for (const status of statuses) {
+      if (status.output?.videos) {
+        allVideos.push(...status.output.videos.filter((video: any) => video));
+      }
+      if (status.output?.failures) {
+        failures.push(...status.output.failures);
+      }
+    }
+
+    // Ordenar por filename (video_1.mp4, video_2.mp4, etc)
+    allVideos.sort((a, b) => {
+      const aNum = parseInt(a.filename?.match(/video_(\d+)\.mp4/)?.[1] || '0');
+      const bNum = parseInt(b.filename?.match(/video_(\d+)\.mp4/)?.[1] || '0');
+      return aNum - bNum;
+    });
+
+    const success = failures.length === 0 && statuses.every(s => s.output?.success !== false);
+    return {
+      code: 200,
+      success,
+      message: success
+        ? `${allVideos.length} videos processed successfully`
+        : `${allVideos.length} videos processed, ${failures.length} failed`,
+      videos: allVideos,
+      ...(success ? {} : { failures })
+    };
+  }
+
+  // Single job: retornar output direto (sem entradas nulas)
+  const output = statuses[0]?.output || {};
+  if (Array.isArray(output.videos)) {
+    return { ...output, videos: output.videos.filter((video: any) => video) };
+  }
+  return output;
+}
+
+/**
+ * Job que completou no RunPod mas não produziu nada: output com
+ * success: false ou error e nenhum vídeo (todos os clips falharam, ou um
+ * generator handler emitiu um erro, que o RunPod não marca como FAILED)
+ */
+export function isFailedResult(result: any): boolean {
+  return (result?.success === false || Boolean(result?.error)) && !(result.videos?.length > 0);
+}
+
+/**
+ * Mensagem de erro de um resultado com falha
+ */
+export function getResultError(result: any): string {
+  return result?.error || result?.failures?.[0]?.error || result?.message || 'Job reported failure';
+}
@@ -23,6 +23,11 @@ const webhookUrlValidator = (value: string, helpers: Joi.CustomHelpers) => {
 // Validation Schemas
 // ============================================
 
+// Worker render options (forwarded as-is in the job input)
+export const renderQualitySchema = Joi.string().valid('production', 'draft').optional();
+export const chunkedEncodingSchema = Joi.boolean().optional();
+export const packSizeSchema = Joi.number().integer().min(1).max(8).optional();
+
 export const captionRequestSchema = Joi.object({
   webhook_url: Joi.string().uri().custom(webhookUrlValidator).required(),
   id_roteiro: Joi.number().integer().optional(),
@@ -45,7 +50,29 @@ export const img2VidRequestSchema = Joi.object({
   path: Joi.string().required(),
   zoom_types: Joi.array().items(
     Joi.string().valid('zoomin', 'zoomout', 'zoompanright')
-  ).optional()
+  ).optional(),
+  quality: renderQualitySchema,
+  pack_size: packSizeSchema
+});
+
+export const img2VidTimelineRequestSchema = Joi.object({
+  webhook_url: Joi.string().uri().custom(webhookUrlValidator).required(),
+  id_roteiro: Joi.number().integer().optional(),
+  images: Joi.array().items(
+    Joi.object({
+      id: Joi.string().required(),
+      image_url: Joi.string().pattern(/^https?:\/\/.+/).required(),
+      duracao: Joi.number().min(0.1).max(1000).required()
+    })
+  ).min(1).required(),
+  path: Joi.string().required(),
+  output_filename: Joi.string().required(),
+  zoom_types: Joi.array().items(
+    Joi.string().valid('zoomin', 'zoomout', 'zoompanright')
+  ).optional(),
+  url_audio: Joi.string().pattern(/^https?:\/\/.+/).optional(),
+  quality: renderQualitySchema,
+  pack_size: packSizeSchema
 });
 
 export const addAudioRequestSchema = Joi.object({
@@ -54,7 +81,8 @@ export const addAudioRequestSchema = Joi.object({
   url_video: Joi.string().pattern(/^https?:\/\/.+/).required(),
   url_audio: Joi.string().pattern(/^https?:\/\/.+/).required(),
   path: Joi.string().required(),
-  output_filename: Joi.string().required()
+  output_filename: Joi.string().required(),
+  chunked: chunkedEncodingSchema
 });
 
 export const concatenateRequestSchema = Joi.object({
@@ -66,7 +94,8 @@ export const concatenateRequestSchema = Joi.object({
     })
   ).min(2).required(),
   path: Joi.string().required(),
-  output_filename: Joi.string().required()
+  output_filename: Joi.string().required(),
+  chunked: chunkedEncodingSchema
 });
 
 export const concatVideoAudioRequestSchema = Joi.object({
@@ -78,7 +107,8 @@ export const concatVideoAudioRequestSchema = Joi.object({
   audio_url: Joi.string().pattern(/^https?:\/\/.+/).required(),
   path: Joi.string().required(),
   output_filename: Joi.string().required(),
-  normalize: Joi.boolean().default(true)
+  normalize: Joi.boolean().default(true),
+  quality: renderQualitySchema
 });
 
 export const captionStyledRequestSchema = Joi.object({
@@ -31,6 +31,15 @@ export interface Img2VidRequest {
   // bucket is read from S3_BUCKET_NAME env var
 }
 
+export interface Img2VidTimelineRequest {
+  images: Img2VidImage[];
+  path: string; // S3 path including /videos/ (e.g., "Sleepless Historian/Video Title/videos/")
+  output_filename: string; // Final video filename (e.g., "video_final.mp4")
+  zoom_types?: ZoomType[]; // Optional: zoom types to distribute proportionally (default: ['zoomin'])
+  url_audio?: string; // Optional: audio muxed into the final video
+  // Segments are rendered in parallel and joined with stream copy (no temp uploads, no second encode)
+}
+
 export interface Img2VidResponse {
   code: number;
   message: string;
@@ -313,6 +322,7 @@ export type JobStatus = 'QUEUED' | 'SUBMITTED' | 'PROCESSING' | 'COMPLETED' | 'F
 
 export type JobOperation =
   | 'img2vid'
+  | 'img2vid_timeline'
   | 'caption'
   | 'addaudio'
   | 'caption_segments'
@@ -394,6 +404,11 @@ export interface Img2VidRequestAsync extends Img2VidRequest {
   id_roteiro?: number;
 }
 
+export interface Img2VidTimelineRequestAsync extends Img2VidTimelineRequest {
+  webhook_url: string;
+  id_roteiro?: number;
+}
+
 export interface AddAudioRequestAsync extends AddAudioRequest {
   webhook_url: string;
   id_roteiro?: number;
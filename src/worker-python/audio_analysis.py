@@ -0,0 +1,190 @@
+"""
+Fast Audio Level Analysis with NumPy
+Replaces "ffmpeg -af volumedetect -f null -" (which also decodes the video
+stream and full-rate multichannel audio) with:
+  1. Audio-only decode (-vn), downmixed to mono at a low sample rate,
+     streamed as float32 PCM through a pipe
+  2. Vectorized statistics: mean (RMS) dB, peak dB and a gated
+     LUFS-style loudness (400ms blocks, 75% overlap, -70/-10 gates)
+  3. Optional window sampling: decode K evenly spaced windows in ONE
+     ffmpeg process instead of the whole file
+
+mean_db uses the same definition as volumedetect's mean_volume
+(10*log10(mean(x^2))), so existing offset math keeps working. Downmix and
+decimation shift it slightly (typically < 1 dB on speech/music).
+"""
+
+import os
+import time
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from resource_tracker import run_tracked
+
+logger = logging.getLogger(__name__)
+
+# NumPy is optional: callers fall back to volumedetect without it
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+    logger.warning("⚠️ NumPy not installed - audio analysis will use volumedetect")
+
+# Analysis configuration
+ANALYSIS_SAMPLE_RATE = int(os.getenv('AUDIO_ANALYSIS_RATE', '8000'))  # Hz (mono)
+ANALYSIS_WINDOWS = int(os.getenv('AUDIO_ANALYSIS_WINDOWS', '0'))  # 0 = decode whole file
+ANALYSIS_WINDOW_SECONDS = float(os.getenv('AUDIO_ANALYSIS_WINDOW_SECONDS', '10'))
+
+# Floor for digital silence (volumedetect reports ~-91 dB for 16-bit silence)
+SILENCE_DB = -91.0
+
+
+def plan_windows(
+    duration: Optional[float],
+    windows: int,
+    window_seconds: float
+) -> Optional[List[Tuple[float, float]]]:
+    """
+    Evenly spaced (start, length) analysis windows
+
+    Returns None (decode whole file) when sampling would not save at least half the decode.
+    """
+    if not windows or not duration or duration < windows * window_seconds * 2:
+        return None
+
+    step = duration / windows
+    return [(i * step + (step - window_seconds) / 2, window_seconds) for i in range(windows)]
+
+
+def decode_mono_pcm(
+    file_path: Path,
+    sample_rate: int = ANALYSIS_SAMPLE_RATE,
+    windows: Optional[List[Tuple[float, float]]] = None
+) -> "np.ndarray":
+    """
+    Decode audio only, mono, low sample rate, as float32 through a pipe
+
+    Args:
+        file_path: Media file (audio or video)
+        sample_rate: Output sample rate
+        windows: Optional (start, length) list - decoded in one process and concatenated
+
+    Returns:
+        1-D float32 array of samples
+    """
+    cmd = ['ffmpeg', '-v', 'error', '-nostdin']
+
+    if windows:
+        for start, length in windows:
+            cmd.extend(['-ss', f'{start:.3f}', '-t', f'{length:.3f}', '-vn', '-i', str(file_path)])
+        labels = ''.join(f'[{i}:a:0]' for i in range(len(windows)))
+        cmd.extend([
+            '-filter_complex', f'{labels}concat=n={len(windows)}:v=0:a=1[a]',
+            '-map', '[a]'
+        ])
+    else:
+        cmd.extend(['-vn', '-i', str(file_path), '-map', '0:a:0'])
+
+    cmd.extend([
+        '-ac', '1',
+        '-ar', str(sample_rate),
+        '-f', 'f32le',
+        '-'
+    ])
+
+    result = run_tracked(cmd, check=True, text=False, stage='analyze')
+    return np.frombuffer(result.stdout, dtype=np.float32)
+
+
+def _energy_to_db(energy: float) -> float:
+    if energy <= 0:
+        return SILENCE_DB
+    return max(SILENCE_DB, 10 * float(np.log10(energy)))
+
+
+def compute_levels(samples: "np.ndarray", sample_rate: int) -> Dict[str, float]:
+    """
+    Compute mean/peak dB and gated loudness of mono float samples
+
+    Loudness follows the BS.1770 gating scheme (400ms blocks, 100ms hop,
+    -70 LUFS absolute gate, -10 LU relative gate) without K-weighting,
+    which is not meaningful at the decimated rate.
+
+    Returns:
+        Dict with mean_db, peak_db, loudness_lufs
+    """
+    if samples.size == 0:
+        return {'mean_db': SILENCE_DB, 'peak_db': SILENCE_DB, 'loudness_lufs': SILENCE_DB}
+
+    x = samples.astype(np.float64)
+    squares = x * x
+
+    mean_db = _energy_to_db(float(squares.mean()))
+    peak = float(np.abs(x).max())
+    peak_db = max(SILENCE_DB, 20 * float(np.log10(peak))) if peak > 0 else SILENCE_DB
+
+    # 100ms hop energies → 400ms block energies (sum of 4 consecutive hops)
+    hop = max(1, sample_rate // 10)
+    hops = squares.size // hop
+    loudness = mean_db - 0.691
+    if hops >= 4:
+        hop_energy = squares[:hops * hop].reshape(hops, hop).sum(axis=1)
+        block_energy = np.convolve(hop_energy, np.ones(4), mode='valid') / (4 * hop)
+
+        with np.errstate(divide='ignore'):
+            block_lufs = -0.691 + 10 * np.log10(block_energy)
+
+        gated = block_energy[block_lufs > -70.0]
+        if gated.size:
+            relative_gate = -0.691 + 10 * np.log10(gated.mean()) - 10.0
+            gated = gated[(-0.691 + 10 * np.log10(gated)) > relative_gate]
+        if gated.size:
+            loudness = -0.691 + 10 * float(np.log10(gated.mean()))
+        else:
+            loudness = SILENCE_DB
+
+    return {
+        'mean_db': round(mean_db, 2),
+        'peak_db': round(peak_db, 2),
+        'loudness_lufs': round(max(SILENCE_DB, loudness), 2)
+    }
+
+
+def analyze_levels(
+    file_path: Path,
+    duration: Optional[float] = None,
+    windows: int = ANALYSIS_WINDOWS,
+    window_seconds: float = ANALYSIS_WINDOW_SECONDS
+) -> Dict[str, Any]:
+    """
+    Analyze audio levels of a media file
+
+    Args:
+        file_path: Media file (audio or video)
+        duration: Known duration (enables window sampling)
+        windows: Number of sampled windows (0 = whole file)
+        window_seconds: Length of each window
+
+    Returns:
+        Dict with mean_db, peak_db, loudness_lufs, analyzed_seconds, sampled, time_s
+    """
+    start = time.time()
+    plan = plan_windows(duration, windows, window_seconds)
+    samples = decode_mono_pcm(file_path, ANALYSIS_SAMPLE_RATE, plan)
+
+    levels = compute_levels(samples, ANALYSIS_SAMPLE_RATE)
+    levels.update({
+        'analyzed_seconds': round(samples.size / ANALYSIS_SAMPLE_RATE, 2),
+        'sampled': plan is not None,
+        'time_s': round(time.time() - start, 3)
+    })
+
+    logger.info(
+        f"🔊 {Path(file_path).name}: mean {levels['mean_db']:.2f} dB, peak {levels['peak_db']:.2f} dB, "
+        f"loudness {levels['loudness_lufs']:.2f} LUFS ({levels['analyzed_seconds']:.1f}s analyzed"
+        f"{', sampled' if plan else ''}, {levels['time_s']:.2f}s)"
+    )
+    return levels
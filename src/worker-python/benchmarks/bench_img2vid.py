@@ -0,0 +1,102 @@
+"""
+Benchmark: img2vid "loop" vs "single" render path
+
+Renders 5s and 10s clips at 24 fps from a generated 4000x2250 JPEG (or the
+given image) with both render paths and reports wall time and CPU time.
+
+Usage:
+    python benchmarks/bench_img2vid.py [--image photo.jpg] [--runs 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+import resource
+import subprocess
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from img2vid_render import get_max_zoom, build_zoompan_filter, build_render_command  # noqa: E402
+from upscale_planner import plan_working_resolution  # noqa: E402
+
+OUT_WIDTH, OUT_HEIGHT = 1920, 1080
+FRAME_RATE = 24
+
+
+def generate_image(path: Path) -> None:
+    subprocess.run(
+        ['ffmpeg', '-y', '-v', 'error', '-f', 'lavfi', '-i', 'testsrc2=size=4000x2250',
+         '-frames:v', '1', '-q:v', '2', str(path)],
+        check=True
+    )
+
+
+def probe_size(path: Path) -> tuple:
+    result = subprocess.run(
+        ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
+         '-show_entries', 'stream=width,height', '-of', 'csv=p=0', str(path)],
+        capture_output=True, text=True, check=True
+    )
+    width, height = result.stdout.strip().split(',')[:2]
+    return int(width), int(height)
+
+
+def render(image: Path, output: Path, duration: float, render_path: str, src_size: tuple) -> tuple:
+    """Render one clip, return (wall_s, cpu_s)"""
+    total_frames = FRAME_RATE * duration
+    plan = plan_working_resolution(
+        *src_size, OUT_WIDTH, OUT_HEIGHT,
+        max_zoom=get_max_zoom('zoomin'),
+        total_frames=total_frames,
+        tolerance=0.25
+    )
+    video_filter = build_zoompan_filter(
+        plan['width'], plan['height'], 'zoomin', total_frames,
+        OUT_WIDTH, OUT_HEIGHT, FRAME_RATE, render_path=render_path
+    )
+    cmd = build_render_command(
+        image, output, video_filter, FRAME_RATE, duration,
+        x264_preset='veryfast', crf=23, render_path=render_path
+    )
+
+    before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    start = time.perf_counter()
+    subprocess.run(cmd, capture_output=True, check=True)
+    wall = time.perf_counter() - start
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+    return wall, cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--image', type=Path)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        image = args.image or tmp / 'source.jpg'
+        if not args.image:
+            generate_image(image)
+        src_size = probe_size(image)
+        print(f"Source {src_size[0]}x{src_size[1]} → {OUT_WIDTH}x{OUT_HEIGHT}@{FRAME_RATE}fps, {os.cpu_count()} CPUs")
+        print(f"{'duration':>9}{'path':>8}{'wall s':>10}{'cpu s':>10}")
+
+        for duration in (5.0, 10.0):
+            results = {}
+            for render_path in ('loop', 'single'):
+                runs = [render(image, tmp / f'{render_path}.mp4', duration, render_path, src_size)
+                        for _ in range(args.runs)]
+                wall = min(r[0] for r in runs)
+                cpu = min(r[1] for r in runs)
+                results[render_path] = wall
+                print(f"{duration:>8.0f}s{render_path:>8}{wall:>10.2f}{cpu:>10.2f}")
+            print(f"{'':>9}speedup {results['loop'] / results['single']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
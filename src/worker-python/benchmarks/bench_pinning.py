@@ -0,0 +1,107 @@
+"""
+Benchmark: concurrent img2vid renders, pinned (CPU_PINNING) vs unpinned
+
+Renders --clips clips with --jobs concurrent ffmpeg processes (default: the
+worker's BATCH_SIZE formula, 1.5 x CPUs) from a generated 4000x2250 JPEG and
+reports batch wall time and total CPU time for both modes.
+
+Usage:
+    python benchmarks/bench_pinning.py [--clips 24] [--jobs N] [--duration 5] [--runs 2]
+"""
+
+import os
+import sys
+import time
+import argparse
+import resource
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from img2vid_render import get_max_zoom, build_zoompan_filter, build_render_command  # noqa: E402
+from upscale_planner import plan_working_resolution  # noqa: E402
+from cpu_placement import CpuPlacer, affinity_prefix  # noqa: E402
+
+OUT_WIDTH, OUT_HEIGHT = 1920, 1080
+FRAME_RATE = 24
+SRC_SIZE = (4000, 2250)
+
+
+def generate_image(path: Path) -> None:
+    subprocess.run(
+        ['ffmpeg', '-y', '-v', 'error', '-f', 'lavfi', '-i', f'testsrc2=size={SRC_SIZE[0]}x{SRC_SIZE[1]}',
+         '-frames:v', '1', '-q:v', '2', str(path)],
+        check=True
+    )
+
+
+def build_cmd(image: Path, output: Path, duration: float) -> list:
+    total_frames = FRAME_RATE * duration
+    plan = plan_working_resolution(
+        *SRC_SIZE, OUT_WIDTH, OUT_HEIGHT,
+        max_zoom=get_max_zoom('zoomin'),
+        total_frames=total_frames,
+        tolerance=0.25
+    )
+    video_filter = build_zoompan_filter(
+        plan['width'], plan['height'], 'zoomin', total_frames,
+        OUT_WIDTH, OUT_HEIGHT, FRAME_RATE
+    )
+    return build_render_command(
+        image, output, video_filter, FRAME_RATE, duration,
+        x264_preset='veryfast', crf=23
+    )
+
+
+def run_batch(image: Path, tmp: Path, clips: int, jobs: int, duration: float, placer: CpuPlacer) -> tuple:
+    """Render `clips` clips on `jobs` threads, return (wall_s, cpu_s)"""
+    def _render(i: int) -> None:
+        with placer.lease(placer.slot_size(jobs)):
+            cmd = build_cmd(image, tmp / f'clip_{i}.mp4', duration)
+            subprocess.run(affinity_prefix() + cmd, capture_output=True, check=True)
+
+    before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        list(executor.map(_render, range(clips)))
+    wall = time.perf_counter() - start
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+    return wall, cpu
+
+
+def main():
+    cpus = len(os.sched_getaffinity(0))
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clips', type=int, default=24)
+    parser.add_argument('--jobs', type=int, default=max(2, min(16, int(cpus * 1.5))))
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--runs', type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        image = tmp / 'source.jpg'
+        generate_image(image)
+
+        modes = {'unpinned': CpuPlacer(enabled=False), 'pinned': CpuPlacer(enabled=True)}
+        print(f"{args.clips} clips x {args.duration:.0f}s, {args.jobs} concurrent, {cpus} CPUs "
+              f"(render {len(modes['pinned'].render_cpus)}, I/O {len(modes['pinned'].io_cpus)})")
+        print(f"{'mode':>10}{'wall s':>10}{'cpu s':>10}")
+
+        results = {}
+        for name, placer in modes.items():
+            runs = [run_batch(image, tmp, args.clips, args.jobs, args.duration, placer) for _ in range(args.runs)]
+            wall = min(r[0] for r in runs)
+            cpu = min(r[1] for r in runs)
+            results[name] = wall
+            print(f"{name:>10}{wall:>10.2f}{cpu:>10.2f}")
+
+        print(f"speedup {results['unpinned'] / results['pinned']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: img2vid source decode, original vs Pillow pre-shrink
+
+Generates an 8K JPEG (or uses the given image) and measures, for a single
+decode + planner upscale in ffmpeg:
+  - original: ffmpeg decodes the full source
+  - preshrink: preprocess_image (JPEG draft decode) + ffmpeg on the intermediate
+Reports wall time and ffmpeg peak RSS.
+
+Usage:
+    python benchmarks/bench_preshrink.py [--image photo.jpg] [--runs 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from image_preprocess import preprocess_image  # noqa: E402
+from img2vid_render import get_max_zoom  # noqa: E402
+
+OUT_WIDTH, OUT_HEIGHT = 1920, 1080
+WORKING_WIDTH, WORKING_HEIGHT = 10752, 6048  # Production plan for a 16:9 source (quarter-pixel steps)
+
+
+def generate_image(path: Path) -> None:
+    subprocess.run(
+        ['ffmpeg', '-y', '-v', 'error', '-f', 'lavfi', '-i', 'testsrc2=size=7680x4320',
+         '-frames:v', '1', '-q:v', '2', str(path)],
+        check=True
+    )
+
+
+def decode_and_scale(image: Path) -> float:
+    """ffmpeg decode + lanczos to the working size (one frame), return its peak RSS in MB"""
+    proc = subprocess.Popen(
+        ['ffmpeg', '-v', 'error', '-i', str(image),
+         '-vf', f'scale={WORKING_WIDTH}:{WORKING_HEIGHT}:flags=lanczos',
+         '-frames:v', '1', '-f', 'null', '-']
+    )
+    _, status, rusage = os.wait4(proc.pid, 0)
+    if os.waitstatus_to_exitcode(status) != 0:
+        raise RuntimeError(f"ffmpeg failed on {image}")
+    return rusage.ru_maxrss / 1024  # Linux reports KB
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--image', type=Path)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    max_zoom = get_max_zoom('zoomin')
+    needed = (round(OUT_WIDTH * max_zoom), round(OUT_HEIGHT * max_zoom))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        image = args.image or tmp / 'source.jpg'
+        if not args.image:
+            generate_image(image)
+
+        original, preshrink = [], []
+        rss_original = rss_preshrink = 0.0
+        result = None
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            rss_original = decode_and_scale(image)
+            original.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            result = preprocess_image(image, *needed, tmp / 'pre.jpg')
+            source = result['path'] if result else image
+            rss_preshrink = decode_and_scale(source)
+            preshrink.append(time.perf_counter() - start)
+
+        if result:
+            print(f"needed {needed[0]}x{needed[1]}, intermediate {result['width']}x{result['height']}")
+        else:
+            print("source already small - no pre-shrink")
+        print(f"{'mode':>10}{'wall s':>10}{'ffmpeg peak MB':>16}")
+        print(f"{'original':>10}{min(original):>10.2f}{rss_original:>16.0f}")
+        print(f"{'preshrink':>10}{min(preshrink):>10.2f}{rss_preshrink:>16.0f}  (wall includes Pillow decode)")
+
+
+if __name__ == '__main__':
+    main()
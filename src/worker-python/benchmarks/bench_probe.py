@@ -0,0 +1,116 @@
+"""
+Benchmark: ffprobe subprocess vs in-process media probing
+
+Generates sample media with ffmpeg (JPEG, PNG, MP4, MP3) and times N probes
+of each file with both methods.
+
+Then checks that PyAV and ffprobe produce the same stream signature (the
+copy-concat checks mix both probe paths), and that the libx264 High/4.0
+sample matches the cyclic-concat normalization spec on both paths.
+
+Usage:
+    python benchmarks/bench_probe.py [--iterations 50] [files...]
+"""
+
+import sys
+import json
+import time
+import argparse
+import subprocess
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from media_probe import probe_media, PYAV_AVAILABLE, _probe_pyav, _probe_ffprobe  # noqa: E402
+from stream_compat import stream_signature, spec_differences, _differences  # noqa: E402
+
+# Same encoder settings as the cyclic-concat normalize step
+NORMALIZE_SPEC = {'codec_name': 'h264', 'profile': 'High', 'level': 40, 'pix_fmt': 'yuv420p'}
+
+
+def generate_samples(work_dir: Path) -> list:
+    """Create small test inputs with ffmpeg lavfi sources"""
+    samples = {
+        'image.jpg': ['-f', 'lavfi', '-i', 'testsrc=size=1920x1080', '-frames:v', '1'],
+        'image.png': ['-f', 'lavfi', '-i', 'testsrc=size=1920x1080', '-frames:v', '1'],
+        'video.mp4': ['-f', 'lavfi', '-i', 'testsrc=size=1280x720:rate=30:duration=10',
+                      '-f', 'lavfi', '-i', 'sine=duration=10',
+                      '-c:v', 'libx264', '-preset', 'ultrafast', '-profile:v', 'high', '-level', '4.0',
+                      '-pix_fmt', 'yuv420p', '-c:a', 'aac', '-shortest'],
+        'audio.mp3': ['-f', 'lavfi', '-i', 'sine=duration=30', '-c:a', 'libmp3lame']
+    }
+    paths = []
+    for name, args in samples.items():
+        path = work_dir / name
+        subprocess.run(['ffmpeg', '-y', '-v', 'error', *args, str(path)], check=True)
+        paths.append(path)
+    return paths
+
+
+def probe_subprocess(path: Path) -> dict:
+    """Baseline: what get_duration/get_image_metadata did before"""
+    result = subprocess.run(
+        ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams', str(path)],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+
+def time_calls(func, path: Path, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(path)
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def check_parity(files: list) -> bool:
+    """Compare PyAV and ffprobe signatures (and the normalize spec for the sample video)"""
+    ok = True
+    for path in files:
+        if path.suffix.lower() in ('.jpg', '.jpeg', '.png'):
+            continue
+        pyav_info, ffprobe_info = _probe_pyav(path), _probe_ffprobe(path)
+        diffs = _differences(stream_signature(pyav_info), stream_signature(ffprobe_info))
+        spec = ''
+        if path.name == 'video.mp4':
+            spec_diffs = spec_differences(pyav_info, NORMALIZE_SPEC) + spec_differences(ffprobe_info, NORMALIZE_SPEC)
+            spec = f", spec: {', '.join(spec_diffs) or 'match'}"
+            ok = ok and not spec_diffs
+        ok = ok and not diffs
+        print(f"{path.name:<24}signature: {', '.join(diffs) or 'identical'}{spec}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='*', type=Path)
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"PyAV available: {PYAV_AVAILABLE}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = args.files or generate_samples(Path(tmp))
+
+        print(f"{'file':<24}{'source':<10}{'ffprobe ms':>12}{'in-proc ms':>12}{'speedup':>10}")
+        total_sub = total_inproc = 0.0
+        for path in files:
+            sub_ms = time_calls(probe_subprocess, path, args.iterations)
+            inproc_ms = time_calls(probe_media, path, args.iterations)
+            total_sub += sub_ms
+            total_inproc += inproc_ms
+            source = probe_media(path)['source']
+            print(f"{path.name:<24}{source:<10}{sub_ms:>12.2f}{inproc_ms:>12.3f}{sub_ms / inproc_ms:>9.1f}x")
+
+        print(f"\nPer-probe savings: {(total_sub - total_inproc) / len(files):.2f} ms average")
+        print(f"e.g. 200-image img2vid batch: ~{(total_sub - total_inproc) / len(files) * 200 / 1000:.2f}s of spawns avoided")
+
+        if PYAV_AVAILABLE:
+            print("\nPyAV vs ffprobe:")
+            if not check_parity(files):
+                sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
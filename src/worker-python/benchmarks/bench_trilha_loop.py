@@ -0,0 +1,92 @@
+"""
+Benchmark: trilha looping memory, aloop vs -stream_loop
+
+Generates a voice track (video audio) and 1 and 10 minute soundtracks (or
+uses the given one) and runs the trilhasonora audio mix for each loop mode:
+  - aloop: decoded soundtrack buffered in RAM by the aloop filter (legacy)
+  - stream: -stream_loop -1 at the demuxer, constant memory
+  - crossfade: stream looping of a crossfaded loop unit (TRILHA_CROSSFADE)
+Reports wall time and ffmpeg peak RSS.
+
+Usage:
+    python benchmarks/bench_trilha_loop.py [--trilha music.mp3] [--video-minutes 30] [--crossfade 2]
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from media_probe import probe_media, get_media_duration  # noqa: E402
+from trilha_loop import build_trilha_mix  # noqa: E402
+
+
+def generate_tone(path: Path, seconds: int, frequency: int) -> None:
+    subprocess.run(
+        ['ffmpeg', '-y', '-v', 'error', '-f', 'lavfi',
+         '-i', f'sine=frequency={frequency}:sample_rate=48000:duration={seconds}',
+         '-ac', '2', '-c:a', 'aac', '-b:a', '128k', str(path)],
+        check=True
+    )
+
+
+def run_mix(voice: Path, trilha: Path, mode: str, crossfade: float) -> tuple:
+    """Mix voice + looped trilha to null, return (wall s, ffmpeg peak RSS MB)"""
+    voice_duration = get_media_duration(probe_media(voice))
+    trilha_duration = get_media_duration(probe_media(trilha))
+    loops_needed = int(voice_duration / trilha_duration) + 1
+
+    start = time.perf_counter()
+    trilha_input, filter_complex, temp_files, _ = build_trilha_mix(
+        trilha, trilha_duration, loops_needed, 20.0,
+        mode='aloop' if mode == 'aloop' else 'stream',
+        crossfade=crossfade if mode == 'crossfade' else 0.0
+    )
+    try:
+        proc = subprocess.Popen(
+            ['ffmpeg', '-v', 'error', '-i', str(voice), *trilha_input,
+             '-filter_complex', filter_complex, '-map', '[aout]', '-f', 'null', '-']
+        )
+        _, status, rusage = os.wait4(proc.pid, 0)
+        if os.waitstatus_to_exitcode(status) != 0:
+            raise RuntimeError(f"ffmpeg failed ({mode})")
+    finally:
+        for path in temp_files:
+            path.unlink(missing_ok=True)
+    return time.perf_counter() - start, rusage.ru_maxrss / 1024  # Linux reports KB
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--trilha', type=Path, action='append', help='Soundtrack(s) to test (repeatable)')
+    parser.add_argument('--video-minutes', type=int, default=30)
+    parser.add_argument('--crossfade', type=float, default=2.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        voice = tmp / 'voice.m4a'
+        generate_tone(voice, args.video_minutes * 60, 220)
+
+        trilhas = args.trilha or []
+        if not trilhas:
+            for minutes in (1, 10):
+                path = tmp / f'trilha_{minutes}min.m4a'
+                generate_tone(path, minutes * 60, 440)
+                trilhas.append(path)
+
+        print(f"video audio {args.video_minutes} min, crossfade {args.crossfade:.1f}s")
+        print(f"{'trilha':>20}{'mode':>11}{'wall s':>10}{'ffmpeg peak MB':>16}")
+        for trilha in trilhas:
+            for mode in ('aloop', 'stream', 'crossfade'):
+                wall, rss = run_mix(voice, trilha, mode, args.crossfade)
+                print(f"{trilha.name:>20}{mode:>11}{wall:>10.2f}{rss:>16.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,281 @@
+"""
+Normalized Clip Cache for cyclic concatenation
+Channels reuse the same B-roll libraries across many concat_video_audio
+jobs, and every job normalized each clip to the same spec again. Normalized
+outputs are cached by:
+
+    (source content hash, normalization spec, spec version, ffmpeg build)
+
+The ffmpeg build is part of the key so cached clips always carry the same
+SPS/PPS as clips encoded by this worker (required for -c copy concat).
+
+Levels:
+  - Local directory on tmpfs (/dev/shm) with LRU eviction by size. The
+    size limit follows the filesystem's free space (at most
+    CLIP_CACHE_SHM_FRACTION of it, always leaving CLIP_CACHE_RESERVE_MB),
+    so the cache never takes the room WORK_DIR and the img2vid concurrency
+    controller rely on; trim() re-applies it at job start
+  - Optional S3 prefix (CLIP_CACHE_S3_PREFIX), shared by all workers
+
+The source hash is only known after downloading, so callers remember
+URL → source hash in the metadata store, validated by a cheap remote
+version (S3/HTTP ETag or Last-Modified + size). A validated hit skips the
+download as well as the normalization. Google Drive links have no such
+version, so they are always downloaded and only the normalization is cached.
+
+Usage:
+    cache = get_clip_cache()
+    key = clip_key(content_digest(source), spec)
+    if not cache.fetch(key, dest, s3_client, bucket):
+        normalize(source, dest)
+        cache.store(key, dest, s3_client, bucket)
+"""
+
+import os
+import shutil
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from botocore.exceptions import ClientError
+
+from metadata_store import params_digest
+from resource_tracker import run_tracked
+
+logger = logging.getLogger(__name__)
+
+# CLIP_CACHE: "on" (default) | "off"
+CLIP_CACHE = os.getenv('CLIP_CACHE', 'on').lower() in ('on', 'true', '1')
+CLIP_CACHE_DIR = os.getenv('CLIP_CACHE_DIR', '')
+CLIP_CACHE_MAX_MB = int(os.getenv('CLIP_CACHE_MAX_MB', '2048'))
+# Share of the cache filesystem (cached clips + free space) the local level may use
+CLIP_CACHE_SHM_FRACTION = float(os.getenv('CLIP_CACHE_SHM_FRACTION', '0.25'))
+# Space always left free for job work (get_optimal_work_dir needs 2 GB on /dev/shm)
+CLIP_CACHE_RESERVE_MB = int(os.getenv('CLIP_CACHE_RESERVE_MB', '2048'))
+# S3 key prefix for the shared level ("" = local only), e.g. "cache/normalized/"
+CLIP_CACHE_S3_PREFIX = os.getenv('CLIP_CACHE_S3_PREFIX', '')
+
+# Bump when the normalize command changes in a way the spec dict doesn't capture
+CLIP_SPEC_VERSION = '2'
+
+
+def default_cache_dir() -> Path:
+    """tmpfs when available (same RAM-backed storage as WORK_DIR), else /tmp"""
+    if CLIP_CACHE_DIR:
+        return Path(CLIP_CACHE_DIR)
+    shm_path = Path('/dev/shm')
+    if shm_path.is_dir() and os.access(shm_path, os.W_OK):
+        return shm_path / 'clip-cache'
+    return Path('/tmp/clip-cache')
+
+
+_ffmpeg_version: Optional[str] = None
+
+
+def ffmpeg_version() -> str:
+    """First line of `ffmpeg -version` (encoder build identity, read once)"""
+    global _ffmpeg_version
+    if _ffmpeg_version is None:
+        try:
+            result = run_tracked(['ffmpeg', '-version'], check=True)
+            _ffmpeg_version = result.stdout.splitlines()[0].strip()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read ffmpeg version: {e}")
+            _ffmpeg_version = 'unknown'
+    return _ffmpeg_version
+
+
+def clip_key(source_digest: str, spec: Dict[str, Any]) -> str:
+    """Cache key of a normalized clip (source_digest: content_digest of the source)"""
+    return params_digest(source_digest, spec, CLIP_SPEC_VERSION, ffmpeg_version())
+
+
+def _empty_stats() -> Dict[str, Any]:
+    return {'hits_local': 0, 'hits_s3': 0, 'misses': 0, 'downloads_skipped': 0, 'stored': 0}
+
+
+class ClipCache:
+    """Local LRU directory of normalized clips with an optional S3 level"""
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int,
+        s3_prefix: str = '',
+        enabled: bool = CLIP_CACHE,
+        fs_fraction: float = CLIP_CACHE_SHM_FRACTION,
+        reserve_bytes: int = CLIP_CACHE_RESERVE_MB * 1024 * 1024
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.fs_fraction = fs_fraction
+        self.reserve_bytes = reserve_bytes
+        self.s3_prefix = s3_prefix.strip('/') + '/' if s3_prefix else ''
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stats = _empty_stats()
+
+        if self.enabled:
+            try:
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                logger.info(
+                    f"🗂️ Clip cache: {cache_dir} (max {max_bytes // (1024 * 1024)} MB, "
+                    f"{fs_fraction:.0%} of free space, {reserve_bytes // (1024 * 1024)} MB reserved)"
+                    f"{f', S3 prefix {self.s3_prefix}' if self.s3_prefix else ''}"
+                )
+            except OSError as e:
+                logger.warning(f"⚠️ Clip cache unavailable ({cache_dir}): {e}")
+                self.enabled = False
+
+    def _local_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.mp4"
+
+    def _record(self, field: str) -> None:
+        with self._lock:
+            self._stats[field] += 1
+
+    @staticmethod
+    def _link_or_copy(source: Path, dest: Path) -> None:
+        dest.unlink(missing_ok=True)
+        try:
+            os.link(source, dest)
+        except OSError:
+            shutil.copyfile(source, dest)
+
+    def fetch(
+        self,
+        key: str,
+        dest: Path,
+        s3_client=None,
+        bucket: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Materialize a cached clip at dest
+
+        Args:
+            key: clip_key()
+            dest: Destination path (hard link into the cache when possible)
+            s3_client, bucket: Shared level (used when CLIP_CACHE_S3_PREFIX is set)
+
+        Returns:
+            'local' | 's3' on hit, None on miss
+        """
+        if not self.enabled:
+            return None
+
+        local_path = self._local_path(key)
+        if local_path.exists():
+            try:
+                os.utime(local_path)  # LRU: mtime = last use
+                self._link_or_copy(local_path, dest)
+                self._record('hits_local')
+                return 'local'
+            except OSError as e:
+                logger.warning(f"⚠️ Clip cache read failed for {key}: {e}")
+
+        if self.s3_prefix and s3_client is not None and bucket:
+            try:
+                s3_client.download_file(bucket, f"{self.s3_prefix}{key}.mp4", str(dest))
+                self._record('hits_s3')
+                self._store_local(key, dest)
+                return 's3'
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') not in ('404', 'NoSuchKey', 'NotFound'):
+                    logger.warning(f"⚠️ Clip cache S3 read failed for {key}: {e}")
+                dest.unlink(missing_ok=True)
+
+        self._record('misses')
+        return None
+
+    def store(self, key: str, path: Path, s3_client=None, bucket: Optional[str] = None) -> None:
+        """Add a freshly normalized clip to the local (and S3) level"""
+        if not self.enabled:
+            return
+
+        self._store_local(key, path)
+        with self._lock:
+            self._stats['stored'] += 1
+
+        if self.s3_prefix and s3_client is not None and bucket:
+            try:
+                s3_client.upload_file(
+                    str(path), bucket, f"{self.s3_prefix}{key}.mp4",
+                    ExtraArgs={'ContentType': 'video/mp4'}
+                )
+            except ClientError as e:
+                logger.warning(f"⚠️ Clip cache S3 write failed for {key}: {e}")
+
+    def record_download_skipped(self) -> None:
+        self._record('downloads_skipped')
+
+    def _store_local(self, key: str, path: Path) -> None:
+        local_path = self._local_path(key)
+        tmp_path = local_path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            self._link_or_copy(path, tmp_path)
+            os.replace(tmp_path, local_path)
+        except OSError as e:
+            tmp_path.unlink(missing_ok=True)
+            logger.warning(f"⚠️ Clip cache write failed for {key}: {e}")
+            return
+        self._evict()
+
+    def _budget(self, cached_bytes: int) -> int:
+        """Current size limit: max_bytes, capped by the filesystem's free space"""
+        try:
+            free = shutil.disk_usage(self.cache_dir).free
+        except OSError:
+            return self.max_bytes
+        available = free + cached_bytes  # Space the cache could occupy if it held nothing
+        return max(0, min(self.max_bytes, int(available * self.fs_fraction), available - self.reserve_bytes))
+
+    def _evict(self) -> None:
+        """Drop least recently used clips until the directory fits the current budget"""
+        with self._lock:
+            try:
+                entries = [(p.stat().st_mtime, p.stat().st_size, p) for p in self.cache_dir.glob('*.mp4')]
+            except OSError:
+                return
+            total = sum(size for _, size, _ in entries)
+            budget = self._budget(total)
+            evicted = 0
+            for _, size, path in sorted(entries):
+                if total <= budget:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                evicted += 1
+            if evicted:
+                logger.debug(f"🗂️ Clip cache: evicted {evicted} clips (budget {budget // (1024 * 1024)} MB)")
+
+    def trim(self) -> None:
+        """Shrink the local level to the current budget (call at job start: free space may have dropped)"""
+        if self.enabled:
+            self._evict()
+
+    def reset_job_stats(self) -> None:
+        with self._lock:
+            self._stats = _empty_stats()
+
+    def job_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        hits = stats['hits_local'] + stats['hits_s3']
+        lookups = hits + stats['misses']
+        stats['hit_rate'] = round(hits / lookups, 3) if lookups else 0.0
+        stats['enabled'] = self.enabled
+        return stats
+
+
+_cache: Optional[ClipCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_clip_cache() -> ClipCache:
+    """Process-wide clip cache (disabled when CLIP_CACHE=off)"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ClipCache(default_cache_dir(), CLIP_CACHE_MAX_MB * 1024 * 1024, CLIP_CACHE_S3_PREFIX)
+        return _cache
@@ -0,0 +1,261 @@
+"""
+Adaptive Concurrency Controller for img2vid render pools
+BATCH_SIZE is fixed at import from the vCPU count. Clip cost varies a lot
+(a 6000x4000 source planned to a large working frame vs a small thumbnail),
+so a fixed count either over-commits memory or leaves CPU idle.
+
+The pool is created with max_permits threads; every render task takes a
+permit from this controller first. A sampler thread reads live pressure
+every ADAPTIVE_CONCURRENCY_INTERVAL seconds and moves the permit limit
+(AIMD, within [min_permits, max_permits]):
+
+  - Memory or /dev/shm below the low watermark → limit x 0.75 (+ cooldown)
+  - CPU below target, memory/shm healthy, tasks waiting → limit + 1
+  - Otherwise → hold
+
+Running tasks are never interrupted: lowering the limit only delays new
+starts until enough tasks finish.
+
+Each render's upscale memory budget is sized for max_permits concurrent
+tasks, so the budgets never add up past the planner's fraction of RAM. By
+default max_permits is BATCH_SIZE (the controller only backs off under
+pressure); growing above it is opt-in via ADAPTIVE_CONCURRENCY_MAX and
+trades smaller per-render budgets for more parallelism.
+"""
+
+import os
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+import psutil
+
+from upscale_planner import get_container_memory_bytes
+
+logger = logging.getLogger(__name__)
+
+# ADAPTIVE_CONCURRENCY: "on" (default) | "off" (fixed BATCH_SIZE)
+ADAPTIVE_CONCURRENCY = os.getenv('ADAPTIVE_CONCURRENCY', 'on').lower()
+SAMPLE_INTERVAL = float(os.getenv('ADAPTIVE_CONCURRENCY_INTERVAL', '2'))  # Seconds between decisions
+CPU_TARGET_PERCENT = float(os.getenv('ADAPTIVE_CPU_TARGET', '90'))  # Grow while container CPU is below this
+
+# Watermarks (fraction of container memory / MB of tmpfs)
+MEMORY_LOW_FRACTION = 0.10   # Shrink below 10% available
+MEMORY_OK_FRACTION = 0.25    # Grow only above 25% available
+SHM_LOW_MB = 512
+SHM_OK_MB = 1024
+
+# Permit bounds (defaults derived from BATCH_SIZE)
+ADAPTIVE_CONCURRENCY_MIN = os.getenv('ADAPTIVE_CONCURRENCY_MIN', '')
+ADAPTIVE_CONCURRENCY_MAX = os.getenv('ADAPTIVE_CONCURRENCY_MAX', '')
+MAX_PERMITS_CAP = 32
+
+DECREASE_FACTOR = 0.75
+COOLDOWN_SAMPLES = 2  # Samples without growth after a decrease
+MAX_LOGGED_DECISIONS = 50
+
+
+def _read_int(path: str) -> Optional[int]:
+    try:
+        with open(path, 'r') as f:
+            value = f.read().strip()
+        return None if value == 'max' else int(value)
+    except (OSError, ValueError):
+        return None
+
+
+def get_memory_available_bytes() -> int:
+    """Available memory inside the container (cgroup limit - usage, else psutil)"""
+    limit = get_container_memory_bytes()
+    usage = _read_int('/sys/fs/cgroup/memory.current') or _read_int('/sys/fs/cgroup/memory/memory.usage_in_bytes')
+    if usage is not None and limit < psutil.virtual_memory().total:
+        return max(0, limit - usage)
+    return psutil.virtual_memory().available
+
+
+def _read_cgroup_cpu_usec() -> Optional[int]:
+    """Cumulative container CPU time in microseconds (cgroup v2 / v1)"""
+    try:
+        with open('/sys/fs/cgroup/cpu.stat', 'r') as f:
+            for line in f:
+                if line.startswith('usage_usec'):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    nanoseconds = _read_int('/sys/fs/cgroup/cpuacct/cpuacct.usage')
+    return nanoseconds // 1000 if nanoseconds is not None else None
+
+
+def get_concurrency_bounds(batch_size: int) -> tuple:
+    """(min, max) permits: env overrides, else [1, BATCH_SIZE] (max capped at MAX_PERMITS_CAP)"""
+    low = int(ADAPTIVE_CONCURRENCY_MIN) if ADAPTIVE_CONCURRENCY_MIN else 1
+    high = min(MAX_PERMITS_CAP, int(ADAPTIVE_CONCURRENCY_MAX)) if ADAPTIVE_CONCURRENCY_MAX else batch_size
+    return max(1, low), max(batch_size, high)
+
+
+class ConcurrencyController:
+    """Permit gate whose limit follows live CPU, memory and tmpfs pressure"""
+
+    def __init__(
+        self,
+        initial: int,
+        min_permits: int,
+        max_permits: int,
+        vcpu_count: int,
+        shm_path: Path,
+        enabled: bool = ADAPTIVE_CONCURRENCY != 'off'
+    ):
+        self.min_permits = max(1, min_permits)
+        self.max_permits = max(self.min_permits, max_permits) if enabled else initial
+        self.limit = max(self.min_permits, min(initial, self.max_permits))
+        self.initial = self.limit
+        self.vcpu_count = max(1, vcpu_count)
+        self.shm_path = shm_path
+        self.enabled = enabled
+
+        self._cond = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+        self._peak_active = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._cooldown = 0
+        self._decisions: List[Dict[str, Any]] = []
+        self._adjustments = 0
+        self._start_time = 0.0
+        self._last_cpu: Optional[tuple] = None
+
+    # ----------------------------------------
+    # Permit gate
+    # ----------------------------------------
+
+    def run(self, func, *args):
+        """Run func(*args) once a permit is free"""
+        with self._cond:
+            self._waiting += 1
+            while self._active >= self.limit:
+                self._cond.wait()
+            self._waiting -= 1
+            self._active += 1
+            self._peak_active = max(self._peak_active, self._active)
+
+        try:
+            return func(*args)
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+    # ----------------------------------------
+    # Sampling / decisions
+    # ----------------------------------------
+
+    def _cpu_percent(self) -> float:
+        """Container CPU utilization since the last sample (% of allocated vCPUs)"""
+        usage = _read_cgroup_cpu_usec()
+        now = time.time()
+        if usage is None:
+            return psutil.cpu_percent(interval=None)
+
+        previous, self._last_cpu = self._last_cpu, (now, usage)
+        if previous is None or now <= previous[0]:
+            return 0.0
+        elapsed_usec = (now - previous[0]) * 1e6
+        return min(100.0, 100.0 * (usage - previous[1]) / (elapsed_usec * self.vcpu_count))
+
+    def sample(self) -> Dict[str, float]:
+        """Current CPU %, available memory and free tmpfs"""
+        try:
+            shm_free_mb = round(psutil.disk_usage(str(self.shm_path)).free / (1024 * 1024))
+        except OSError:
+            shm_free_mb = None  # Unknown: not treated as pressure
+        return {
+            'cpu_percent': round(self._cpu_percent(), 1),
+            'memory_available_fraction': round(get_memory_available_bytes() / get_container_memory_bytes(), 3),
+            'shm_free_mb': shm_free_mb
+        }
+
+    def _decide(self, reading: Dict[str, float]) -> None:
+        with self._cond:
+            old_limit = self.limit
+            waiting = self._waiting
+            reason = None
+
+            memory_low = reading['memory_available_fraction'] < MEMORY_LOW_FRACTION
+            shm_free_mb = reading['shm_free_mb']
+            shm_low = shm_free_mb is not None and shm_free_mb < SHM_LOW_MB
+
+            if memory_low or shm_low:
+                self.limit = max(self.min_permits, int(self.limit * DECREASE_FACTOR))
+                self._cooldown = COOLDOWN_SAMPLES
+                reason = 'memory' if memory_low else 'shm'
+            elif self._cooldown > 0:
+                self._cooldown -= 1
+            elif (
+                waiting > 0
+                and reading['cpu_percent'] < CPU_TARGET_PERCENT
+                and reading['memory_available_fraction'] >= MEMORY_OK_FRACTION
+                and (shm_free_mb is None or shm_free_mb >= SHM_OK_MB)
+            ):
+                self.limit = min(self.max_permits, self.limit + 1)
+                reason = 'cpu_idle'
+
+            if self.limit != old_limit:
+                self._adjustments += 1
+                self._cond.notify_all()
+                decision = {
+                    't': round(time.time() - self._start_time, 1),
+                    'from': old_limit,
+                    'to': self.limit,
+                    'reason': reason,
+                    'waiting': waiting,
+                    **reading
+                }
+                if len(self._decisions) < MAX_LOGGED_DECISIONS:
+                    self._decisions.append(decision)
+                logger.info(
+                    f"🎚️ Concurrency {old_limit} → {self.limit} ({reason}: cpu {reading['cpu_percent']:.0f}%, "
+                    f"mem avail {reading['memory_available_fraction'] * 100:.0f}%, shm {shm_free_mb} MB, "
+                    f"{waiting} waiting)"
+                )
+
+    def _loop(self) -> None:
+        self._cpu_percent()  # Prime the CPU counter
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            try:
+                self._decide(self.sample())
+            except Exception as e:
+                logger.warning(f"⚠️ Concurrency sample failed: {e}")
+
+    # ----------------------------------------
+    # Lifecycle
+    # ----------------------------------------
+
+    def __enter__(self) -> 'ConcurrencyController':
+        self._start_time = time.time()
+        if self.enabled:
+            self._thread = threading.Thread(target=self._loop, daemon=True, name='concurrency-controller')
+            self._thread.start()
+            logger.info(f"🎚️ Adaptive concurrency: start {self.limit}, bounds [{self.min_permits}, {self.max_permits}]")
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=SAMPLE_INTERVAL + 1)
+
+    def report(self) -> Dict[str, Any]:
+        """Controller summary for the job result"""
+        with self._cond:
+            return {
+                'adaptive': self.enabled,
+                'initial': self.initial,
+                'final': self.limit,
+                'min': self.min_permits,
+                'max': self.max_permits,
+                'peak_active': self._peak_active,
+                'adjustments': self._adjustments,
+                'decisions': list(self._decisions)
+            }
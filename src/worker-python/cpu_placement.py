@@ -0,0 +1,207 @@
+"""
+CPU Placement for concurrent ffmpeg processes
+Optional layer (CPU_PINNING=on) that gives each concurrent render its own
+core set instead of letting every ffmpeg float over all cores/sockets:
+  - Allowed CPUs come from sched_getaffinity (honors the cgroup cpuset)
+  - CPUs are ordered by topology (package → core → SMT sibling), so a lease
+    of N consecutive CPUs stays on one socket and shares L2/L3
+  - Each lease picks the least-loaded window, so sets are disjoint while
+    enough cores are free (they overlap evenly once the pool oversubscribes)
+  - A small separate set is kept for downloads and S3 uploads (io_pinned
+    functions move their thread there only while they run, so CPU work on
+    the same pool thread, e.g. the Pillow pre-shrink, keeps all CPUs)
+
+ffmpeg children are pinned by running them under "taskset -c <cpus>" (no
+preexec_fn: forking a heavily threaded process and running Python before
+exec can deadlock). ffmpeg's auto thread count follows the affinity mask,
+so "-threads 0" matches the lease size.
+
+Usage:
+    placer = get_placer()
+    with placer.lease(placer.slot_size(concurrency)):
+        run_tracked(affinity_prefix() + cmd)
+"""
+
+import os
+import logging
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# CPU_PINNING: "off" (default) | "on"
+CPU_PINNING = os.getenv('CPU_PINNING', 'off').lower() in ('on', 'true', '1')
+# CPUs reserved for I/O threads ("auto": 1 per 8 CPUs, 0 below 4 CPUs)
+CPU_PINNING_IO_CPUS = os.getenv('CPU_PINNING_IO_CPUS', 'auto').lower()
+
+SYSFS_CPU = '/sys/devices/system/cpu'
+
+_thread_state = threading.local()
+
+
+def _read_sysfs_int(path: str, default: int = 0) -> int:
+    try:
+        with open(path, 'r') as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return default
+
+
+def get_allowed_cpus() -> List[int]:
+    """CPUs this process may run on (cgroup cpuset + inherited affinity)"""
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return list(range(os.cpu_count() or 1))
+
+
+def read_topology(cpus: List[int]) -> List[Dict[str, int]]:
+    """
+    Topology of the given CPUs, ordered package → core → SMT sibling
+
+    Returns:
+        List of dicts with cpu, package, core
+    """
+    topology = []
+    for cpu in cpus:
+        base = f"{SYSFS_CPU}/cpu{cpu}/topology"
+        topology.append({
+            'cpu': cpu,
+            'package': _read_sysfs_int(f"{base}/physical_package_id"),
+            'core': _read_sysfs_int(f"{base}/core_id", cpu)
+        })
+    topology.sort(key=lambda t: (t['package'], t['core'], t['cpu']))
+    return topology
+
+
+class CpuPlacer:
+    """Leases topology-contiguous CPU sets to concurrent ffmpeg processes"""
+
+    def __init__(self, enabled: bool = CPU_PINNING):
+        self.topology = read_topology(get_allowed_cpus())
+        cpus = [t['cpu'] for t in self.topology]
+
+        if CPU_PINNING_IO_CPUS == 'auto':
+            io_count = 0 if len(cpus) < 4 else max(1, len(cpus) // 8)
+        else:
+            io_count = max(0, min(int(CPU_PINNING_IO_CPUS), len(cpus) - 1))
+
+        # I/O set from the end of the order (last package), render set is the rest
+        self.io_cpus = cpus[len(cpus) - io_count:] if io_count else []
+        self.render_cpus = cpus[:len(cpus) - io_count]
+        self.packages = {t['cpu']: t['package'] for t in self.topology}
+        self.enabled = enabled and len(self.render_cpus) > 1
+
+        self._load = {cpu: 0 for cpu in self.render_cpus}
+        self._lock = threading.Lock()
+        self._leases = 0
+
+        if self.enabled:
+            logger.info(
+                f"📌 CPU pinning: {len(self.render_cpus)} render CPUs {self.render_cpus}, "
+                f"I/O CPUs {self.io_cpus or 'shared'}, {len(set(self.packages.values()))} package(s)"
+            )
+
+    def slot_size(self, concurrency: int) -> int:
+        """CPUs per concurrent process (its thread budget)"""
+        return max(1, len(self.render_cpus) // max(1, concurrency))
+
+    def _pick(self, size: int) -> List[int]:
+        """Least-loaded window of `size` consecutive CPUs, preferring one package"""
+        cpus = self.render_cpus
+        size = min(size, len(cpus))
+        best, best_key = None, None
+        for start in range(len(cpus) - size + 1):
+            window = cpus[start:start + size]
+            crosses = len({self.packages[c] for c in window}) > 1
+            key = (crosses, sum(self._load[c] for c in window), start)
+            if best_key is None or key < best_key:
+                best, best_key = window, key
+        return best
+
+    @contextmanager
+    def lease(self, size: int):
+        """Reserve a CPU set for the current thread's ffmpeg children (no-op when disabled)"""
+        if not self.enabled:
+            yield None
+            return
+
+        with self._lock:
+            cpus = self._pick(size)
+            for cpu in cpus:
+                self._load[cpu] += 1
+            self._leases += 1
+
+        previous = getattr(_thread_state, 'cpus', None)
+        _thread_state.cpus = cpus
+        try:
+            yield cpus
+        finally:
+            _thread_state.cpus = previous
+            with self._lock:
+                for cpu in cpus:
+                    self._load[cpu] -= 1
+
+    @contextmanager
+    def io_thread(self):
+        """Run the calling thread (and threads it starts, e.g. S3 transfers) on the I/O set, then restore it"""
+        if not (self.enabled and self.io_cpus):
+            yield
+            return
+
+        try:
+            previous = os.sched_getaffinity(0)  # 0 = calling thread on Linux
+            os.sched_setaffinity(0, self.io_cpus)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not pin I/O thread: {e}")
+            yield
+            return
+
+        try:
+            yield
+        finally:
+            try:
+                os.sched_setaffinity(0, previous)
+            except OSError as e:
+                logger.warning(f"⚠️ Could not restore thread affinity: {e}")
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'enabled': self.enabled,
+            'render_cpus': len(self.render_cpus),
+            'io_cpus': len(self.io_cpus),
+            'packages': len(set(self.packages.values())),
+            'leases': self._leases
+        }
+
+
+def affinity_prefix() -> List[str]:
+    """Command prefix pinning a child to the current thread's lease ([] without a lease)"""
+    cpus = getattr(_thread_state, 'cpus', None)
+    if not cpus:
+        return []
+    return ['taskset', '-c', ','.join(str(cpu) for cpu in cpus)]
+
+
+def io_pinned(func):
+    """Decorator: run func on the I/O CPU set (no-op unless CPU_PINNING=on)"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with get_placer().io_thread():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+_placer: Optional[CpuPlacer] = None
+_placer_lock = threading.Lock()
+
+
+def get_placer() -> CpuPlacer:
+    """Process-wide placer (disabled unless CPU_PINNING=on)"""
+    global _placer
+    with _placer_lock:
+        if _placer is None:
+            _placer = CpuPlacer()
+        return _placer
@@ -0,0 +1,141 @@
+"""
+Source Image Pre-shrink for image_to_video
+AI-generated and stock images arrive at 4K-8K. Handing them to ffmpeg means
+a full-resolution decode (+ yuvj444p frame) before the planner's lanczos
+scale - detail that is never visible: at max zoom one output pixel covers
+1/max_zoom of the frame, so a source larger than
+
+    out_width x max_zoom  by  out_height x max_zoom
+
+adds decode time and RAM only.
+
+Pipeline (Pillow, optional):
+  1. JPEG draft(): the decoder scales in the DCT domain (1/2, 1/4, 1/8) to
+     the smallest size still covering the needed resolution - the full
+     image is never materialized
+  2. Non-JPEG (or still well above the needed size): box reduce + lanczos
+     to the covering size
+  3. EXIF orientation applied, colorspace normalized to RGB (CMYK, palette,
+     alpha flattened on white)
+  4. Written as a compact JPEG q95 intermediate that ffmpeg decodes quickly
+
+Images already close to the needed size (and upright RGB) are left untouched.
+"""
+
+import os
+import time
+import logging
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Pillow is optional: without it ffmpeg decodes the original image
+try:
+    from PIL import Image, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = None
+    ImageOps = None
+    PIL_AVAILABLE = False
+    logger.warning("⚠️ Pillow not installed - img2vid sources will not be pre-shrunk")
+
+# IMAGE_PREPROCESS: "on" (default) | "off"
+IMAGE_PREPROCESS = os.getenv('IMAGE_PREPROCESS', 'on').lower()
+PRESHRINK_MIN_RATIO = 1.25  # Only shrink sources at least 1.25x larger (linear) than needed
+INTERMEDIATE_QUALITY = 95
+
+EXIF_ORIENTATION_TAG = 0x0112
+
+
+def _covering_size(width: int, height: int, needed_width: int, needed_height: int) -> tuple:
+    """Smallest size with the source aspect ratio covering the needed size"""
+    scale = max(needed_width / width, needed_height / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def preprocess_image(
+    image_path: Path,
+    needed_width: int,
+    needed_height: int,
+    output_path: Path
+) -> Optional[Dict[str, Any]]:
+    """
+    Decode an image straight to (about) the needed resolution and normalize it
+
+    Args:
+        image_path: Downloaded source image
+        needed_width, needed_height: Resolution the render can use
+            (output size x max zoom)
+        output_path: Intermediate JPEG path
+
+    Returns:
+        Dict with path, width, height, original_width, original_height,
+        draft_scale, time_s - or None when the original should be used as is
+    """
+    if not PIL_AVAILABLE or IMAGE_PREPROCESS == 'off':
+        return None
+
+    start = time.time()
+    try:
+        with Image.open(image_path) as img:
+            original_width, original_height = img.size
+            orientation = img.getexif().get(EXIF_ORIENTATION_TAG, 1)
+
+            # Orientations 5-8 are rotated 90°: the stored image is transposed
+            if orientation in (5, 6, 7, 8):
+                needed_width, needed_height = needed_height, needed_width
+            target_width, target_height = _covering_size(original_width, original_height, needed_width, needed_height)
+
+            oversized = original_width >= target_width * PRESHRINK_MIN_RATIO
+            needs_normalize = orientation != 1 or img.mode not in ('RGB', 'L')
+            if not oversized and not needs_normalize:
+                return None
+
+            draft_scale = 1
+            if oversized and img.format == 'JPEG':
+                # DCT-domain downscale during decode (keeps >= requested size)
+                img.draft('RGB', (target_width, target_height))
+                draft_scale = max(1, round(original_width / img.size[0]))
+
+            img.load()
+            frame = img
+
+            # Remainder above the needed size (non-JPEG, or between DCT scales):
+            # box-reduce by an integer factor, then lanczos to the covering size
+            if frame.size[0] >= target_width * PRESHRINK_MIN_RATIO:
+                frame = frame.resize((target_width, target_height), Image.LANCZOS, reducing_gap=3.0)
+
+            frame = ImageOps.exif_transpose(frame)
+
+            if frame.mode in ('RGBA', 'LA') or (frame.mode == 'P' and 'transparency' in frame.info):
+                rgba = frame.convert('RGBA')
+                background = Image.new('RGB', rgba.size, (255, 255, 255))
+                background.paste(rgba, mask=rgba.getchannel('A'))
+                frame = background
+            elif frame.mode != 'RGB':
+                frame = frame.convert('RGB')
+
+            frame.save(output_path, 'JPEG', quality=INTERMEDIATE_QUALITY)
+            width, height = frame.size
+
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️ Image preprocessing failed for {Path(image_path).name}: {e} - using original")
+        output_path.unlink(missing_ok=True)
+        return None
+
+    result = {
+        'path': output_path,
+        'width': width,
+        'height': height,
+        'original_width': original_width,
+        'original_height': original_height,
+        'draft_scale': draft_scale,
+        'time_s': round(time.time() - start, 3)
+    }
+    logger.info(
+        f"🗜️ Pre-shrink: {original_width}x{original_height} → {width}x{height} "
+        f"(needed {needed_width}x{needed_height}, draft 1/{draft_scale}, "
+        f"orientation {orientation}, {result['time_s']:.2f}s)"
+    )
+    return result
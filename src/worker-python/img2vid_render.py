@@ -0,0 +1,270 @@
+"""
+Image-to-Video Render Commands
+Builds the zoompan filter chain and FFmpeg command used by image_to_video.
+
+Render paths (IMG2VID_RENDER_PATH):
+  - "single" (default): the still is fed ONCE (no -loop 1). The lanczos
+    upscale runs on that single frame and zoompan generates all output
+    frames from it (d = ceil(frames)).
+  - "loop" (legacy): -loop 1 -framerate N feeds the image repeatedly, so
+    the image decode + lanczos upscale run for every looped input frame.
+
+Both paths produce the same frames: zoompan only ever uses its first input
+frame for a d-frame animation.
+
+Multi-clip packing (IMG2VID_PACK_SIZE): K short clips are rendered by ONE
+ffmpeg process (K inputs, K zoompan branches in a filter_complex, K outputs),
+amortizing process start-up, codec init and graph build over K clips.
+"""
+
+import os
+import math
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+# "single" (default) | "loop"
+IMG2VID_RENDER_PATH = os.getenv('IMG2VID_RENDER_PATH', 'single').lower()
+
+# Multi-clip packing
+# IMG2VID_PACK_SIZE: "auto" (default) | "1" (off) | N (fixed clips per process)
+IMG2VID_PACK_SIZE = os.getenv('IMG2VID_PACK_SIZE', 'auto').lower()
+PACK_MAX_CLIP_DURATION = float(os.getenv('IMG2VID_PACK_MAX_DURATION', '6'))  # Only short clips are packed
+PACK_TARGET_SECONDS = float(os.getenv('IMG2VID_PACK_TARGET_SECONDS', '20'))  # Output seconds per process
+PACK_MAX_CLIPS = 8  # Upper bound on branches per filter graph
+
+# Largest zoom reached by each effect
+MAX_ZOOM = {
+    'zoomin': 1.40,
+    'zoomout': 1.35,
+    'zoompanright': 1.40
+}
+
+
+def get_max_zoom(zoom_type: str) -> float:
+    """Largest zoom reached by a zoom effect (default: zoomin)"""
+    return MAX_ZOOM.get(zoom_type, MAX_ZOOM['zoomin'])
+
+
+def build_zoom_expressions(zoom_type: str, total_frames: float) -> Tuple[str, str, str]:
+    """
+    Build zoompan z/x/y expressions for a zoom effect
+
+    Args:
+        zoom_type: "zoomin", "zoomout" or "zoompanright"
+        total_frames: Animation length in frames (float - no rounding)
+
+    Returns:
+        Tuple of (zoom_formula, x_formula, y_formula)
+    """
+    max_zoom = get_max_zoom(zoom_type)
+
+    # Define zoom effect based on type
+    # CRITICAL: NO trunc() - causes jitter due to rounding
+    # Use continuous float values for smooth sub-pixel motion
+    if zoom_type == "zoomout":
+        # ZOOM OUT: Starts zoomed in, ends normal
+        zoom_start = max_zoom  # 1.35 - slower, smoother zoom
+        zoom_end = 1.0
+        zoom_diff = zoom_start - zoom_end
+        zoom_formula = f"max({zoom_start}-{zoom_diff}*on/{total_frames},{zoom_end})"
+        # Centered - no trunc() for smooth motion
+        x_formula = "iw/2-(iw/zoom/2)"
+        y_formula = "ih/2-(ih/zoom/2)"
+
+    elif zoom_type == "zoompanright":
+        # ZOOM IN + PAN RIGHT
+        # Inicia no canto esquerdo (x=0), termina no canto direito (x=x_max)
+        zoom_start = 1.0
+        zoom_end = max_zoom  # 1.40 - slower zoom for smoother effect
+        zoom_diff = zoom_end - zoom_start
+        zoom_formula = f"min({zoom_start}+{zoom_diff}*on/{total_frames},{zoom_end})"
+
+        # Pan da esquerda para direita
+        # x: 0 → (iw - ow/zoom)
+        # Movimento linear: progresso × distância_máxima
+        # IMPORTANTE: (iw-ow/zoom) é dinâmico, aumenta conforme zoom aumenta
+        # Isso funciona porque começamos em 0 (fixo) e vamos para x_max (dinâmico crescente)
+        x_formula = f"(iw-ow/zoom)*on/{total_frames}"
+
+        # Centralizado verticalmente (mesma fórmula do zoomin/zoomout que funciona sem jitter)
+        y_formula = "ih/2-(ih/zoom/2)"
+
+    else:  # "zoomin" (default)
+        # ZOOM IN: Starts normal, ends zoomed in
+        zoom_start = 1.0
+        zoom_end = max_zoom  # 1.40 - slower zoom for smoother effect
+        zoom_diff = zoom_end - zoom_start
+        zoom_formula = f"min({zoom_start}+{zoom_diff}*on/{total_frames},{zoom_end})"
+        # Centered - no trunc() for smooth motion
+        x_formula = "iw/2-(iw/zoom/2)"
+        y_formula = "ih/2-(ih/zoom/2)"
+
+    return zoom_formula, x_formula, y_formula
+
+
+def build_zoompan_filter(
+    upscale_width: int,
+    upscale_height: int,
+    zoom_type: str,
+    total_frames: float,
+    out_width: int,
+    out_height: int,
+    frame_rate: int,
+    render_path: str = IMG2VID_RENDER_PATH
+) -> str:
+    """
+    Build the upscale → zoompan → downscale filter chain
+
+    Returns:
+        Filter chain string for -vf
+    """
+    zoom_formula, x_formula, y_formula = build_zoom_expressions(zoom_type, total_frames)
+
+    # Single input frame: zoompan must emit every output frame from it
+    duration_frames = math.ceil(total_frames) if render_path == 'single' else total_frames
+
+    # Video filter with zoom effect - Bicubic downscaling for best quality
+    return (
+        f"scale={upscale_width}:{upscale_height}:flags=lanczos,"
+        f"zoompan=z='{zoom_formula}'"
+        f":d={duration_frames}"
+        f":x='{x_formula}'"
+        f":y='{y_formula}'"
+        f":s={out_width}x{out_height}"
+        f":fps={frame_rate},"
+        f"scale={out_width}:{out_height}:flags=bicubic,"  # Final downscale with bicubic for smoothness
+        f"format=nv12"
+    )
+
+
+def build_render_command(
+    image_path: Path,
+    output_path: Path,
+    video_filter: str,
+    frame_rate: int,
+    duracao: float,
+    x264_preset: str,
+    crf: int,
+    render_path: str = IMG2VID_RENDER_PATH
+) -> List[str]:
+    """
+    Build the img2vid FFmpeg command (CPU libx264)
+
+    Args:
+        image_path: Input still image
+        output_path: Output MP4
+        video_filter: Chain from build_zoompan_filter (same render_path)
+        frame_rate: Output fps
+        duracao: Clip duration in seconds
+        x264_preset: libx264 preset
+        crf: libx264 CRF
+        render_path: "single" or "loop"
+
+    Returns:
+        FFmpeg command list
+    """
+    cmd = ['ffmpeg', '-y']
+
+    if render_path == 'loop':
+        cmd.extend(['-framerate', str(frame_rate), '-loop', '1'])
+
+    cmd.extend([
+        '-i', str(image_path),
+        '-vf', video_filter,
+        '-c:v', 'libx264',
+        '-preset', x264_preset,
+        '-crf', str(crf),
+        '-maxrate', '10M',
+        '-bufsize', '20M',
+        '-threads', '0',  # Auto-select optimal thread count
+        '-t', str(duracao),
+        str(output_path)
+    ])
+    return cmd
+
+
+# ============================================
+# Multi-clip packing
+# ============================================
+
+def choose_pack_size(
+    durations: List[float],
+    parallel_slots: int,
+    requested: Optional[int] = None
+) -> int:
+    """
+    Choose K (clips per ffmpeg process) for a batch
+
+    K grows until a process renders ~PACK_TARGET_SECONDS of output (start-up
+    is amortized), but never so large that fewer processes than parallel slots
+    remain (every slot must stay busy).
+
+    Args:
+        durations: Durations of the packable (short) clips
+        parallel_slots: Concurrent ffmpeg processes (BATCH_SIZE)
+        requested: Job-level override (1 = no packing)
+
+    Returns:
+        Pack size K (1 = one clip per process)
+    """
+    if requested is not None:
+        return max(1, min(int(requested), PACK_MAX_CLIPS))
+    if IMG2VID_PACK_SIZE != 'auto':
+        return max(1, min(int(IMG2VID_PACK_SIZE), PACK_MAX_CLIPS))
+    if not durations:
+        return 1
+
+    mean_duration = sum(durations) / len(durations)
+    by_duration = max(1, round(PACK_TARGET_SECONDS / max(mean_duration, 0.1)))
+    by_slots = max(1, len(durations) // max(1, parallel_slots))
+    return max(1, min(by_duration, by_slots, PACK_MAX_CLIPS))
+
+
+def build_packed_render_command(
+    clips: List[Dict[str, Any]],
+    frame_rate: int,
+    x264_preset: str,
+    crf: int,
+    threads_per_output: int,
+    render_path: str = IMG2VID_RENDER_PATH
+) -> List[str]:
+    """
+    Build one FFmpeg command rendering K clips (K inputs → K outputs)
+
+    Args:
+        clips: Dicts with image_path, output_path, video_filter, duracao
+        frame_rate: Output fps
+        x264_preset: libx264 preset
+        crf: libx264 CRF
+        threads_per_output: libx264 threads per output (K encoders share the slot)
+        render_path: "single" or "loop" (must match the filters)
+
+    Returns:
+        FFmpeg command list
+    """
+    cmd = ['ffmpeg', '-y']
+
+    for clip in clips:
+        if render_path == 'loop':
+            cmd.extend(['-framerate', str(frame_rate), '-loop', '1'])
+        cmd.extend(['-i', str(clip['image_path'])])
+
+    filter_complex = ';'.join(
+        f"[{i}:v]{clip['video_filter']}[v{i}]" for i, clip in enumerate(clips)
+    )
+    cmd.extend(['-filter_complex', filter_complex])
+
+    for i, clip in enumerate(clips):
+        cmd.extend([
+            '-map', f'[v{i}]',
+            '-c:v', 'libx264',
+            '-preset', x264_preset,
+            '-crf', str(crf),
+            '-maxrate', '10M',
+            '-bufsize', '20M',
+            '-threads', str(threads_per_output),
+            '-t', str(clip['duracao']),
+            str(clip['output_path'])
+        ])
+
+    return cmd
@@ -0,0 +1,175 @@
+"""
+Longest-Processing-Time-First Scheduler for img2vid batches
+Orders render tasks (one ffmpeg process each) by estimated cost before they
+are submitted to the thread pool, so long clips start first and short clips
+fill the remaining gaps at the end of the batch.
+
+Cost model (seconds of one pool slot):
+
+    task  = PROCESS_S + sum(clip)
+    clip  = working_px * WORKING_NS                        (one lanczos upscale)
+          + frames * out_px * OUTPUT_NS * zoom_weight      (zoompan + libx264)
+          [+ frames * working_px * WORKING_NS]             (loop path only)
+
+working_px comes from upscale_planner (same plan the render uses). Clips
+are rendered on a pool of identical slots, so the predicted makespan is the
+greedy list schedule of the submission order.
+
+The constants are rough defaults for libx264 veryfast on one slot; compare
+"predicted_makespan_s" with "actual_makespan_s" in the batch result and tune
+IMG2VID_COST_* to calibrate.
+"""
+
+import os
+import heapq
+import logging
+from typing import Dict, List, Any, Optional
+
+from img2vid_render import IMG2VID_RENDER_PATH, get_max_zoom
+from upscale_planner import plan_working_resolution
+
+logger = logging.getLogger(__name__)
+
+# "lpt" (default, longest first) | "fifo" (list order)
+IMG2VID_SCHEDULE = os.getenv('IMG2VID_SCHEDULE', 'lpt').lower()
+
+# Cost model constants (per pool slot)
+PROCESS_S = float(os.getenv('IMG2VID_COST_PROCESS_S', '0.35'))      # ffmpeg start-up, codec init, graph build
+WORKING_NS = float(os.getenv('IMG2VID_COST_WORKING_NS', '6'))       # ns per working pixel scaled
+OUTPUT_NS = float(os.getenv('IMG2VID_COST_OUTPUT_NS', '9'))         # ns per output pixel rendered + encoded
+
+# Relative per-frame cost of each zoom effect (pan moves the crop on both axes)
+ZOOM_WEIGHT = {
+    'zoomin': 1.0,
+    'zoomout': 1.0,
+    'zoompanright': 1.1
+}
+
+
+def estimate_clip_cost(
+    duracao: float,
+    frame_rate: int,
+    zoom_type: str,
+    profile: Dict[str, Any],
+    src_width: Optional[int] = None,
+    src_height: Optional[int] = None,
+    render_path: str = IMG2VID_RENDER_PATH
+) -> float:
+    """
+    Estimated slot-seconds to render one clip
+
+    Args:
+        duracao: Clip duration in seconds
+        frame_rate: Output fps
+        zoom_type: "zoomin", "zoomout" or "zoompanright"
+        profile: Render profile (width, height, jitter_tolerance)
+        src_width, src_height: Source image size if known (default: output size,
+            same fallback as the render when metadata is missing)
+        render_path: "single" or "loop"
+
+    Returns:
+        Estimated seconds (without process start-up)
+    """
+    out_width, out_height = profile['width'], profile['height']
+    total_frames = frame_rate * float(duracao)
+
+    plan = plan_working_resolution(
+        src_width or out_width, src_height or out_height,
+        out_width, out_height,
+        max_zoom=get_max_zoom(zoom_type),
+        total_frames=total_frames,
+        tolerance=profile['jitter_tolerance']
+    )
+    working_px = plan['width'] * plan['height']
+    output_px = out_width * out_height
+
+    upscales = total_frames if render_path == 'loop' else 1
+    upscale_s = upscales * working_px * WORKING_NS * 1e-9
+    frames_s = total_frames * output_px * OUTPUT_NS * 1e-9 * ZOOM_WEIGHT.get(zoom_type, 1.0)
+    return upscale_s + frames_s
+
+
+def predict_makespan(costs: List[float], slots: int) -> float:
+    """Makespan of greedy list scheduling (each task takes the first free slot, in order)"""
+    finish_times = [0.0] * max(1, min(slots, len(costs)))
+    for cost in costs:
+        start = heapq.heappop(finish_times)
+        heapq.heappush(finish_times, start + cost)
+    return max(finish_times) if costs else 0.0
+
+
+def schedule_tasks(
+    tasks: List[List[int]],
+    clip_costs: List[float],
+    slots: int,
+    policy: str = IMG2VID_SCHEDULE
+) -> Dict[str, Any]:
+    """
+    Order render tasks for submission
+
+    Args:
+        tasks: Lists of clip indices (one ffmpeg process each)
+        clip_costs: Estimated cost per clip index (estimate_clip_cost)
+        slots: Concurrent pool slots (BATCH_SIZE)
+        policy: "lpt" or "fifo"
+
+    Returns:
+        Dict with tasks (submission order), task_costs (same order), policy,
+        predicted_makespan_s and fifo_makespan_s
+    """
+    task_costs = [PROCESS_S + sum(clip_costs[i] for i in indices) for indices in tasks]
+    fifo_makespan = predict_makespan(task_costs, slots)
+
+    order = list(range(len(tasks)))
+    if policy == 'lpt':
+        # Stable: equal costs keep list order
+        order.sort(key=lambda t: task_costs[t], reverse=True)
+
+    ordered_costs = [task_costs[t] for t in order]
+    predicted = predict_makespan(ordered_costs, slots)
+
+    logger.info(
+        f"🗓️ Schedule ({policy}): {len(tasks)} tasks on {slots} slots, "
+        f"predicted makespan {predicted:.2f}s (list order {fifo_makespan:.2f}s, "
+        f"longest task {max(task_costs) if task_costs else 0:.2f}s)"
+    )
+
+    return {
+        'tasks': [tasks[t] for t in order],
+        'task_costs': ordered_costs,
+        'policy': policy,
+        'predicted_makespan_s': predicted,
+        'fifo_makespan_s': fifo_makespan
+    }
+
+
+def build_schedule_report(
+    schedule: Dict[str, Any],
+    actual_makespan: float,
+    task_times: List[float]
+) -> Dict[str, Any]:
+    """
+    Predicted vs actual timings for cost-model calibration
+
+    Args:
+        schedule: Result of schedule_tasks
+        actual_makespan: Wall time of the render pool
+        task_times: Measured ffmpeg render seconds per task (submission order,
+            excluding downloads and uploads, like the cost model)
+
+    Returns:
+        Report dict for the job result
+    """
+    predicted_work = sum(schedule['task_costs'])
+    actual_work = sum(task_times)
+    return {
+        'policy': schedule['policy'],
+        'tasks': len(schedule['tasks']),
+        'predicted_makespan_s': round(schedule['predicted_makespan_s'], 2),
+        'fifo_makespan_s': round(schedule['fifo_makespan_s'], 2),
+        'actual_makespan_s': round(actual_makespan, 2),
+        'predicted_work_s': round(predicted_work, 2),
+        'actual_work_s': round(actual_work, 2),
+        # > 1: model underestimates - scale IMG2VID_COST_* up by this factor
+        'calibration_ratio': round(actual_work / predicted_work, 3) if predicted_work > 0 else None
+    }
@@ -0,0 +1,393 @@
+"""
+In-process Media Probing
+Replaces per-query ffprobe subprocesses (tens of ms each + JSON parsing) with:
+  1. Header parsers for JPEG/PNG images (dimensions without decoding)
+  2. PyAV (libavformat in-process) for audio/video containers
+  3. ffprobe subprocess fallback for exotic inputs (or when PyAV is missing)
+
+All paths return the same ffprobe-like structure:
+    {
+        'duration': float | None,
+        'format_name': str,
+        'bit_rate': int | None,
+        'size': int,
+        'streams': [{'codec_type', 'codec_name', 'width', 'height', ...}],
+        'source': 'header' | 'pyav' | 'ffprobe'
+    }
+"""
+
+import json
+import hashlib
+import struct
+import logging
+from fractions import Fraction
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from resource_tracker import run_tracked
+
+logger = logging.getLogger(__name__)
+
+# PyAV is optional: worker still runs (ffprobe fallback) without it
+try:
+    import av
+    PYAV_AVAILABLE = True
+except ImportError:
+    av = None
+    PYAV_AVAILABLE = False
+    logger.warning("⚠️ PyAV not installed - media probing will use ffprobe subprocesses")
+
+# JPEG SOF markers carrying frame dimensions (excludes DHT/JPG/DAC: C4, C8, CC)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def _level_from_extradata(codec_name: Optional[str], extradata: Optional[bytes]) -> Optional[int]:
+    """
+    Codec level as ffprobe reports it (level_idc), read from the decoder config
+
+    PyAV's CodecContext has no level, so it is parsed from the extradata:
+      - H.264 avcC: byte 3; Annex B: the byte after profile/constraints in the SPS
+      - HEVC hvcC: general_level_idc (byte 12)
+    """
+    if not extradata:
+        return None
+    data = bytes(extradata)
+    if codec_name == 'h264':
+        if data[0] == 1 and len(data) >= 4:
+            return data[3]
+        start = data.find(b'\x00\x00\x01')
+        while start != -1 and start + 6 < len(data):
+            if data[start + 3] & 0x1F == 7:  # SPS NAL unit
+                return data[start + 6]
+            start = data.find(b'\x00\x00\x01', start + 3)
+    elif codec_name == 'hevc' and data[0] == 1 and len(data) >= 13:
+        return data[12]
+    return None
+
+
+def _fraction_str(value: Optional[Fraction]) -> str:
+    """Format a Fraction like ffprobe ("30000/1001", "0/0" when unknown)"""
+    if not value:
+        return "0/0"
+    return f"{value.numerator}/{value.denominator}"
+
+
+# ============================================
+# Image header parsers
+# ============================================
+
+def _parse_jpeg_header(data: bytes) -> Optional[Dict[str, int]]:
+    """Read width/height from the first SOF segment of a JPEG"""
+    offset = 2  # Skip SOI
+    while offset + 9 < len(data):
+        if data[offset] != 0xFF:
+            offset += 1
+            continue
+        marker = data[offset + 1]
+        if marker == 0xFF:  # Fill byte
+            offset += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:  # Standalone markers
+            offset += 2
+            continue
+        segment_length = struct.unpack('>H', data[offset + 2:offset + 4])[0]
+        if marker in JPEG_SOF_MARKERS:
+            height, width = struct.unpack('>HH', data[offset + 5:offset + 9])
+            components = data[offset + 9] if offset + 9 < len(data) else None
+            return {'width': width, 'height': height, 'components': components}
+        offset += 2 + segment_length
+    return None
+
+
+def _probe_image_header(path: Path) -> Optional[Dict[str, Any]]:
+    """Probe JPEG/PNG dimensions from the file header (no decoding)"""
+    with open(path, 'rb') as f:
+        head = f.read(32)
+        if head[:8] == b'\x89PNG\r\n\x1a\n' and head[12:16] == b'IHDR':
+            width, height = struct.unpack('>II', head[16:24])
+            codec_name, info = 'png', {'width': width, 'height': height}
+        elif head[:2] == b'\xff\xd8':
+            # SOF is usually within the first few KB, but EXIF thumbnails can push it further
+            data = head + f.read(256 * 1024)
+            info = _parse_jpeg_header(data)
+            if info is None:
+                f.seek(0)
+                info = _parse_jpeg_header(f.read())
+            if info is None:
+                return None
+            codec_name = 'mjpeg'
+        else:
+            return None
+
+    return {
+        'duration': None,
+        'format_name': 'image2',
+        'bit_rate': None,
+        'size': path.stat().st_size,
+        'streams': [{
+            'index': 0,
+            'codec_type': 'video',
+            'codec_name': codec_name,
+            'width': info['width'],
+            'height': info['height']
+        }],
+        'source': 'header'
+    }
+
+
+# ============================================
+# PyAV probing
+# ============================================
+
+def _probe_pyav(path: Path) -> Dict[str, Any]:
+    """Probe container/streams in-process with PyAV (no decoding)"""
+    with av.open(str(path)) as container:
+        streams: List[Dict[str, Any]] = []
+        for stream in container.streams:
+            ctx = stream.codec_context
+            info: Dict[str, Any] = {
+                'index': stream.index,
+                'codec_type': stream.type,
+                'codec_name': ctx.name if ctx else None,
+                'profile': getattr(ctx, 'profile', None),
+                'time_base': _fraction_str(stream.time_base),
+                'duration': float(stream.duration * stream.time_base) if stream.duration and stream.time_base else None,
+                'extradata_size': len(ctx.extradata) if ctx is not None and ctx.extradata else 0,
+                # SPS/PPS fingerprint, same "MD5:<hex>" form as ffprobe -show_data_hash
+                'extradata_hash': (
+                    f"MD5:{hashlib.md5(bytes(ctx.extradata)).hexdigest()}"
+                    if ctx is not None and ctx.extradata else None
+                )
+            }
+            if stream.type == 'video':
+                info.update({
+                    'width': ctx.width,
+                    'height': ctx.height,
+                    'pix_fmt': ctx.pix_fmt,
+                    'level': _level_from_extradata(ctx.name, ctx.extradata),
+                    'sample_aspect_ratio': _fraction_str(getattr(ctx, 'sample_aspect_ratio', None)),
+                    'r_frame_rate': _fraction_str(stream.base_rate),
+                    'avg_frame_rate': _fraction_str(stream.average_rate),
+                    'nb_frames': stream.frames or None
+                })
+            elif stream.type == 'audio':
+                info.update({
+                    'sample_rate': ctx.sample_rate,
+                    'channels': ctx.channels,
+                    'channel_layout': ctx.layout.name if ctx.layout else None,
+                    'sample_fmt': ctx.format.name if ctx.format else None
+                })
+            streams.append(info)
+
+        return {
+            'duration': container.duration / av.time_base if container.duration else None,
+            'format_name': container.format.name,
+            'bit_rate': container.bit_rate or None,
+            'size': path.stat().st_size,
+            'streams': streams,
+            'source': 'pyav'
+        }
+
+
+# ============================================
+# ffprobe fallback
+# ============================================
+
+def _probe_ffprobe(path: Path) -> Dict[str, Any]:
+    """Probe with an ffprobe subprocess (exotic inputs / PyAV unavailable)"""
+    cmd = [
+        'ffprobe',
+        '-v', 'quiet',
+        '-print_format', 'json',
+        '-show_format',
+        '-show_streams',
+        '-show_data_hash', 'MD5',  # extradata_hash per stream
+        str(path)
+    ]
+    result = run_tracked(cmd, capture_output=True, text=True, check=True)
+    metadata = json.loads(result.stdout)
+    fmt = metadata.get('format', {})
+
+    streams = []
+    for stream in metadata.get('streams', []):
+        info = dict(stream)
+        if 'duration' in info:
+            info['duration'] = float(info['duration'])
+        for key in ('width', 'height', 'sample_rate', 'channels'):
+            if key in info:
+                info[key] = int(info[key])
+        streams.append(info)
+
+    duration = float(fmt['duration']) if 'duration' in fmt else None
+    bit_rate = int(fmt['bit_rate']) if 'bit_rate' in fmt else None
+
+    return {
+        'duration': duration,
+        'format_name': fmt.get('format_name'),
+        'bit_rate': bit_rate,
+        'size': int(fmt['size']) if 'size' in fmt else path.stat().st_size,
+        'streams': streams,
+        'source': 'ffprobe'
+    }
+
+
+# ============================================
+# Public API
+# ============================================
+
+def probe_media(path: Path) -> Dict[str, Any]:
+    """
+    Probe a media file in-process (header parser → PyAV → ffprobe)
+
+    Args:
+        path: Local media file
+
+    Returns:
+        ffprobe-like dict with duration, format and streams
+
+    Raises:
+        RuntimeError: If no prober could read the file
+    """
+    path = Path(path)
+
+    try:
+        image_info = _probe_image_header(path)
+        if image_info:
+            return image_info
+    except (OSError, struct.error) as e:
+        logger.debug(f"Image header probe failed for {path.name}: {e}")
+
+    if PYAV_AVAILABLE:
+        try:
+            info = _probe_pyav(path)
+            # Exotic/broken inputs: no streams or no duration → let ffprobe try
+            if info['streams'] and info['duration'] is not None:
+                return info
+            logger.info(f"🔍 PyAV probe incomplete for {path.name}, falling back to ffprobe")
+        except Exception as e:
+            logger.info(f"🔍 PyAV cannot probe {path.name} ({e}), falling back to ffprobe")
+
+    try:
+        return _probe_ffprobe(path)
+    except Exception as e:
+        raise RuntimeError(f"Failed to probe media {path}: {getattr(e, 'stderr', None) or e}")
+
+
+def get_media_duration(info: Dict[str, Any]) -> Optional[float]:
+    """
+    Extract duration from probe info with fallbacks
+
+    Methods (same order as the original ffprobe-based get_duration):
+      1. format duration
+      2. first stream duration
+      3. size * 8 / bit_rate
+    """
+    if info.get('duration'):
+        return float(info['duration'])
+
+    streams = info.get('streams') or []
+    if streams and streams[0].get('duration'):
+        return float(streams[0]['duration'])
+
+    if info.get('size') and info.get('bit_rate'):
+        return (int(info['size']) * 8) / int(info['bit_rate'])
+
+    return None
+
+
+def probe_remote_duration(url: str, timeout: float = 15.0) -> Optional[float]:
+    """
+    Duration of a remote media file from its container header
+
+    Reads only what the demuxer needs (HTTP range requests, e.g. the MP4
+    moov box), never the whole body.
+
+    Returns:
+        Duration in seconds, or None if the server/container doesn't allow it
+    """
+    timeout_us = str(int(timeout * 1_000_000))
+
+    if PYAV_AVAILABLE:
+        try:
+            with av.open(url, options={'rw_timeout': timeout_us}, timeout=timeout) as container:
+                if container.duration:
+                    return container.duration / av.time_base
+        except Exception as e:
+            logger.info(f"🔍 PyAV cannot probe remote {url[:60]} ({e}), trying ffprobe")
+
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-rw_timeout', timeout_us,
+        '-show_entries', 'format=duration',
+        '-of', 'csv=p=0',
+        url
+    ]
+    try:
+        result = run_tracked(cmd, check=True, timeout=timeout * 2)
+        return float(result.stdout.strip())
+    except Exception as e:
+        logger.info(f"🔍 Remote probe failed for {url[:60]}: {getattr(e, 'stderr', None) or e}")
+        return None
+
+
+def get_stream(info: Dict[str, Any], codec_type: str) -> Optional[Dict[str, Any]]:
+    """First stream of a given type ('video' or 'audio')"""
+    for stream in info.get('streams', []):
+        if stream.get('codec_type') == codec_type:
+            return stream
+    return None
+
+
+def parse_rate(value: Optional[str]) -> float:
+    """Parse an ffprobe rate string ("30000/1001") to float (0.0 when unknown)"""
+    if not value:
+        return 0.0
+    num, _, den = str(value).partition('/')
+    try:
+        den_f = float(den or 1)
+        return float(num) / den_f if den_f else 0.0
+    except ValueError:
+        return 0.0
+
+
+def probe_packet_times(path: Path) -> List[Tuple[float, bool]]:
+    """
+    (pts seconds, is keyframe) of every packet of the first video stream, in decode order
+
+    PyAV demuxes packets in-process (no decoding); ffprobe packet listing otherwise.
+    """
+    path = Path(path)
+
+    if PYAV_AVAILABLE:
+        try:
+            with av.open(str(path)) as container:
+                stream = container.streams.video[0]
+                return [
+                    (float(packet.pts * packet.time_base), bool(packet.is_keyframe))
+                    for packet in container.demux(stream)
+                    if packet.pts is not None
+                ]
+        except Exception as e:
+            logger.info(f"🔍 PyAV packet scan failed for {path.name} ({e}), using ffprobe")
+
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'packet=pts_time,flags',
+        '-of', 'csv=p=0',
+        str(path)
+    ]
+    result = run_tracked(cmd, check=True)
+
+    packets = []
+    for line in result.stdout.splitlines():
+        parts = line.strip().split(',')
+        if len(parts) >= 2 and parts[0] not in ('', 'N/A'):
+            packets.append((float(parts[0]), 'K' in parts[1]))
+
+    return packets
+
+
+def probe_keyframe_times(path: Path) -> List[float]:
+    """Keyframe timestamps (seconds) of the first video stream"""
+    return sorted(set(pts for pts, keyframe in probe_packet_times(path) if keyframe))
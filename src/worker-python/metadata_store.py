@@ -0,0 +1,318 @@
+"""
+Persistent Derived-Metadata Store
+Caches results derived from input content (probes, loudness stats, generated
+ASS text) so repeated inputs are not re-analyzed on every job:
+  - In-memory LRU in front (per worker process, bounded)
+  - SQLite behind it, on the RunPod network volume when mounted
+    (shared across workers), else local disk
+
+Keys are (kind, version, content_key):
+  - content_key: BLAKE2b of the input bytes, sampled for large media
+    (+ analysis parameters); content_digest() always hashes every byte,
+    for keys whose collisions would serve wrong content (clip cache)
+  - version: per-kind schema version, optionally combined with a hash of the
+    generating module source, so analysis changes invalidate old entries
+
+Usage:
+    store = get_store()
+    info = store.get_or_compute('probe', file_digest(path), lambda: probe_media(path))
+    stats = store.job_stats()
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Store configuration
+# METADATA_STORE: "on" (default, memory + SQLite) | "off" (memory only)
+METADATA_STORE = os.getenv('METADATA_STORE', 'on').lower()
+METADATA_STORE_PATH = os.getenv('METADATA_STORE_PATH', '')
+# Memory level size (entries); SQLite keeps everything else
+METADATA_MEMORY_ENTRIES = int(os.getenv('METADATA_MEMORY_ENTRIES', '2048'))
+NETWORK_VOLUME = Path('/runpod-volume')
+
+# Bump a kind's version when its computation or output format changes
+STORE_VERSIONS = {
+    'probe': '3',
+    'loudness': '1',
+    'ass': '1',
+    'clip_source': '2'
+}
+
+HASH_CHUNK_SIZE = 1024 * 1024  # 1 MB
+FULL_HASH_MAX_BYTES = 16 * 1024 * 1024  # Larger files use sampled fingerprints
+DIGEST_MEMO_ENTRIES = 4096
+
+
+def default_store_path() -> Path:
+    """SQLite file on the network volume if mounted (shared), else /tmp (per worker)"""
+    if METADATA_STORE_PATH:
+        return Path(METADATA_STORE_PATH)
+    if NETWORK_VOLUME.is_dir() and os.access(NETWORK_VOLUME, os.W_OK):
+        return NETWORK_VOLUME / 'api-gpu' / 'metadata.sqlite'
+    return Path('/tmp/api-gpu-metadata.sqlite')
+
+
+# ============================================
+# Content keys
+# ============================================
+
+# (sampled, path, size, mtime_ns) → digest, so a file is hashed once per job (LRU)
+_digest_memo: "OrderedDict[tuple, str]" = OrderedDict()
+_digest_lock = threading.Lock()
+
+
+def file_digest(path: Path) -> str:
+    """
+    BLAKE2b-128 content fingerprint of a file (memoized by path/size/mtime)
+
+    Files up to FULL_HASH_MAX_BYTES are hashed entirely. Larger media is
+    fingerprinted by size + head/middle/tail chunks so the key costs
+    milliseconds instead of a full read of a multi-GB video. Good enough
+    for analysis results (probe, loudness); use content_digest() where a
+    collision would hand out another file's content.
+    """
+    return _digest(Path(path), sampled=True)
+
+
+def content_digest(path: Path) -> str:
+    """BLAKE2b-128 of every byte of a file, streamed (memoized by path/size/mtime)"""
+    return _digest(Path(path), sampled=False)
+
+
+def _digest(path: Path, sampled: bool) -> str:
+    stat = path.stat()
+    memo_key = (sampled, str(path), stat.st_size, stat.st_mtime_ns)
+
+    with _digest_lock:
+        cached = _digest_memo.get(memo_key)
+        if cached:
+            _digest_memo.move_to_end(memo_key)
+    if cached:
+        return cached
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        if not sampled or stat.st_size <= FULL_HASH_MAX_BYTES:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        else:
+            digest.update(str(stat.st_size).encode())
+            for offset in (0, stat.st_size // 2, stat.st_size - HASH_CHUNK_SIZE):
+                f.seek(offset)
+                digest.update(f.read(HASH_CHUNK_SIZE))
+    value = digest.hexdigest()
+
+    with _digest_lock:
+        _digest_memo[memo_key] = value
+        if len(_digest_memo) > DIGEST_MEMO_ENTRIES:
+            _digest_memo.popitem(last=False)
+    return value
+
+
+def params_digest(*parts: Any) -> str:
+    """Stable digest of JSON-serializable parameters (e.g. style dicts)"""
+    payload = json.dumps(parts, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def source_version(module) -> str:
+    """Short hash of a module's source file (auto-invalidates when code changes)"""
+    try:
+        with open(module.__file__, 'rb') as f:
+            return hashlib.blake2b(f.read(), digest_size=6).hexdigest()
+    except (OSError, AttributeError, TypeError):
+        return 'unknown'
+
+
+# ============================================
+# Store
+# ============================================
+
+def _empty_stats() -> Dict[str, float]:
+    return {'hits': 0, 'misses': 0, 'saved_s': 0.0, 'compute_s': 0.0}
+
+
+class MetadataStore:
+    """Two-level (memory LRU + SQLite) cache of derived metadata"""
+
+    def __init__(self, db_path: Optional[Path], max_memory_entries: int = METADATA_MEMORY_ENTRIES):
+        self._memory: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self.max_memory_entries = max_memory_entries
+        self._lock = threading.Lock()
+        self._db = None
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self.db_path = db_path
+
+        if db_path is not None:
+            try:
+                db_path.parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(str(db_path), timeout=5.0, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    " kind TEXT NOT NULL,"
+                    " version TEXT NOT NULL,"
+                    " key TEXT NOT NULL,"
+                    " value TEXT NOT NULL,"
+                    " compute_s REAL NOT NULL,"
+                    " created_at REAL NOT NULL,"
+                    " PRIMARY KEY (kind, version, key))"
+                )
+                self._db.commit()
+                logger.info(f"🗃️ Metadata store: {db_path}")
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Metadata store unavailable ({db_path}): {e} - using memory only")
+                self._db = None
+
+    def _remember(self, full_key: tuple, entry: Dict[str, Any]) -> None:
+        """Insert into the memory level, evicting the least recently used entry (lock held)"""
+        self._memory[full_key] = entry
+        self._memory.move_to_end(full_key)
+        if len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _version(self, kind: str, version: Optional[str]) -> str:
+        base = STORE_VERSIONS.get(kind, '1')
+        return f"{base}:{version}" if version else base
+
+    def _record(self, kind: str, hit: bool, seconds: float) -> None:
+        stats = self._stats.setdefault(kind, _empty_stats())
+        if hit:
+            stats['hits'] += 1
+            stats['saved_s'] += seconds
+        else:
+            stats['misses'] += 1
+            stats['compute_s'] += seconds
+
+    def get(self, kind: str, key: str, version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return {'value', 'compute_s'} or None"""
+        full_key = (kind, self._version(kind, version), key)
+
+        with self._lock:
+            entry = self._memory.get(full_key)
+            if entry is not None:
+                self._memory.move_to_end(full_key)
+                return entry
+
+            if self._db is None:
+                return None
+
+            try:
+                row = self._db.execute(
+                    "SELECT value, compute_s FROM entries WHERE kind = ? AND version = ? AND key = ?",
+                    full_key
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Metadata store read failed: {e}")
+                return None
+
+            if row is None:
+                return None
+
+            entry = {'value': json.loads(row[0]), 'compute_s': row[1]}
+            self._remember(full_key, entry)
+            return entry
+
+    def put(self, kind: str, key: str, value: Any, compute_s: float, version: Optional[str] = None) -> None:
+        full_key = (kind, self._version(kind, version), key)
+
+        with self._lock:
+            self._remember(full_key, {'value': value, 'compute_s': compute_s})
+
+            if self._db is None:
+                return
+
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries (kind, version, key, value, compute_s, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (*full_key, json.dumps(value), compute_s, time.time())
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Metadata store write failed: {e}")
+
+    def get_or_compute(
+        self,
+        kind: str,
+        key: str,
+        compute: Callable[[], Any],
+        version: Optional[str] = None
+    ) -> Any:
+        """
+        Return the cached value for (kind, version, key), computing and storing it on miss
+
+        Args:
+            kind: Entry kind ('probe', 'loudness', 'ass')
+            key: Content key (file_digest / params_digest)
+            compute: Zero-argument function producing a JSON-serializable value
+            version: Extra version component (e.g. source_version(module))
+
+        Returns:
+            Cached or freshly computed value
+        """
+        entry = self.get(kind, key, version)
+        if entry is not None:
+            with self._lock:
+                self._record(kind, True, entry['compute_s'])
+            return entry['value']
+
+        start = time.time()
+        value = compute()
+        compute_s = time.time() - start
+
+        self.put(kind, key, value, compute_s, version)
+        with self._lock:
+            self._record(kind, False, compute_s)
+        return value
+
+    def reset_job_stats(self) -> None:
+        with self._lock:
+            self._stats = {}
+
+    def job_stats(self) -> Dict[str, Any]:
+        """Hit/miss counts and saved seconds per kind since the last reset"""
+        with self._lock:
+            kinds = {
+                kind: {
+                    'hits': s['hits'],
+                    'misses': s['misses'],
+                    'hit_rate': round(s['hits'] / (s['hits'] + s['misses']), 3) if s['hits'] + s['misses'] else 0.0,
+                    'saved_s': round(s['saved_s'], 3),
+                    'compute_s': round(s['compute_s'], 3)
+                }
+                for kind, s in self._stats.items()
+            }
+
+        hits = sum(k['hits'] for k in kinds.values())
+        misses = sum(k['misses'] for k in kinds.values())
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 3) if hits + misses else 0.0,
+            'saved_s': round(sum(k['saved_s'] for k in kinds.values()), 3),
+            'persistent': self._db is not None,
+            'kinds': kinds
+        }
+
+
+_store: Optional[MetadataStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> MetadataStore:
+    """Process-wide store (memory-only when METADATA_STORE=off)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MetadataStore(default_store_path() if METADATA_STORE != 'off' else None)
+        return _store
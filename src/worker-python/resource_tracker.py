@@ -0,0 +1,327 @@
+"""
+Resource Tracker for FFmpeg/FFprobe Children
+Collects per-job resource usage for cost attribution:
+  - CPU seconds (user/system) and peak RSS from wait4() rusage
+  - Bytes read/written from /proc/<pid>/io (read before reaping)
+  - Download/upload bytes recorded by the transfer helpers
+
+Usage:
+    ledger = start_job('img2vid')
+    with resource_stage('render'):
+        run_tracked(cmd, check=True)
+    resources = finish_job()
+"""
+
+import os
+import time
+import logging
+import subprocess
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default stage per tool when caller did not set one
+DEFAULT_STAGES = {
+    'ffmpeg': 'encode',
+    'ffprobe': 'probe'
+}
+
+# Launchers that exec the real tool: name → number of leading args to skip
+WRAPPER_ARGS = {
+    'taskset': 3  # taskset -c <cpus> <cmd...>
+}
+
+# Per-thread stage label (pool threads set their own stage)
+_thread_state = threading.local()
+
+# Active job ledger (RunPod worker processes one job at a time)
+_active_ledger = None
+_active_ledger_lock = threading.Lock()
+
+
+# ============================================
+# Ledger
+# ============================================
+
+def _empty_bucket() -> Dict[str, float]:
+    return {
+        'processes': 0,
+        'wall_s': 0.0,
+        'cpu_user_s': 0.0,
+        'cpu_system_s': 0.0,
+        'peak_rss_bytes': 0,
+        'io_read_bytes': 0,
+        'io_write_bytes': 0,
+        'download_bytes': 0,
+        'upload_bytes': 0
+    }
+
+
+def _format_bucket(bucket: Dict[str, float]) -> Dict[str, Any]:
+    """Convert raw bucket counters to report units (seconds, MB)"""
+    mb = 1024 * 1024
+    return {
+        'processes': bucket['processes'],
+        'wall_s': round(bucket['wall_s'], 3),
+        'cpu_user_s': round(bucket['cpu_user_s'], 3),
+        'cpu_system_s': round(bucket['cpu_system_s'], 3),
+        'cpu_total_s': round(bucket['cpu_user_s'] + bucket['cpu_system_s'], 3),
+        'peak_rss_mb': round(bucket['peak_rss_bytes'] / mb, 1),
+        'io_read_mb': round(bucket['io_read_bytes'] / mb, 2),
+        'io_write_mb': round(bucket['io_write_bytes'] / mb, 2),
+        'download_mb': round(bucket['download_bytes'] / mb, 2),
+        'upload_mb': round(bucket['upload_bytes'] / mb, 2)
+    }
+
+
+class ResourceLedger:
+    """Thread-safe accumulator of child process and transfer usage for one job"""
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._totals = _empty_bucket()
+        self._stages: Dict[str, Dict[str, float]] = {}
+        self._tools: Dict[str, Dict[str, float]] = {}
+
+    def _buckets(self, stage: str, tool: Optional[str]) -> List[Dict[str, float]]:
+        buckets = [self._totals, self._stages.setdefault(stage, _empty_bucket())]
+        if tool:
+            buckets.append(self._tools.setdefault(tool, _empty_bucket()))
+        return buckets
+
+    def record_process(
+        self,
+        tool: str,
+        stage: str,
+        wall_s: float,
+        cpu_user_s: float,
+        cpu_system_s: float,
+        peak_rss_bytes: int,
+        io_read_bytes: int,
+        io_write_bytes: int
+    ) -> None:
+        with self._lock:
+            for bucket in self._buckets(stage, tool):
+                bucket['processes'] += 1
+                bucket['wall_s'] += wall_s
+                bucket['cpu_user_s'] += cpu_user_s
+                bucket['cpu_system_s'] += cpu_system_s
+                # Peak RSS is a max, not a sum (concurrent peaks are reported per process)
+                bucket['peak_rss_bytes'] = max(bucket['peak_rss_bytes'], peak_rss_bytes)
+                bucket['io_read_bytes'] += io_read_bytes
+                bucket['io_write_bytes'] += io_write_bytes
+
+    def record_transfer(self, direction: str, stage: str, num_bytes: int) -> None:
+        """Record download/upload bytes (direction: 'download' or 'upload')"""
+        with self._lock:
+            for bucket in self._buckets(stage, None):
+                bucket[f'{direction}_bytes'] += num_bytes
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'operation': self.operation,
+                'wall_time_s': round(time.time() - self.started_at, 3),
+                'totals': _format_bucket(self._totals),
+                'stages': {name: _format_bucket(b) for name, b in self._stages.items()},
+                'tools': {name: _format_bucket(b) for name, b in self._tools.items()}
+            }
+
+
+def start_job(operation: str) -> ResourceLedger:
+    """Start accounting for a job (replaces any previous ledger)"""
+    global _active_ledger
+    with _active_ledger_lock:
+        _active_ledger = ResourceLedger(operation or 'unknown')
+        return _active_ledger
+
+
+def finish_job() -> Optional[Dict[str, Any]]:
+    """Stop accounting and return the job resource summary"""
+    global _active_ledger
+    with _active_ledger_lock:
+        ledger = _active_ledger
+        _active_ledger = None
+
+    if ledger is None:
+        return None
+
+    summary = ledger.summary()
+    totals = summary['totals']
+    logger.info(
+        f"📊 Resources ({summary['operation']}): {totals['processes']} processes, "
+        f"CPU {totals['cpu_total_s']:.1f}s, peak RSS {totals['peak_rss_mb']:.0f} MB, "
+        f"I/O r/w {totals['io_read_mb']:.1f}/{totals['io_write_mb']:.1f} MB, "
+        f"net down/up {totals['download_mb']:.1f}/{totals['upload_mb']:.1f} MB"
+    )
+    return summary
+
+
+# ============================================
+# Stage labels
+# ============================================
+
+def current_stage() -> Optional[str]:
+    return getattr(_thread_state, 'stage', None)
+
+
+@contextmanager
+def resource_stage(stage: str):
+    """Label all tracked processes/transfers of the current thread with a stage"""
+    previous = current_stage()
+    _thread_state.stage = stage
+    try:
+        yield
+    finally:
+        _thread_state.stage = previous
+
+
+def record_transfer(direction: str, num_bytes: int) -> None:
+    """Record download/upload bytes on the active job (no-op without a job)
+
+    Transfers are always reported under their own stage ('download'/'upload').
+    """
+    ledger = _active_ledger
+    if ledger is None or not num_bytes:
+        return
+    ledger.record_transfer(direction, direction, num_bytes)
+
+
+# ============================================
+# Tracked subprocess execution
+# ============================================
+
+def _read_proc_io(pid: int) -> Dict[str, int]:
+    """
+    Read /proc/<pid>/io counters
+
+    rchar/wchar count all read()/write() bytes (including tmpfs and pipes),
+    which is what matters in a /dev/shm based worker.
+    """
+    counters = {}
+    try:
+        with open(f'/proc/{pid}/io', 'r') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                counters[key.strip()] = int(value.strip())
+    except (OSError, ValueError):
+        pass
+    return counters
+
+
+def _drain(stream, chunks: List) -> None:
+    """Read a pipe to EOF (runs in a thread to avoid pipe deadlocks)"""
+    try:
+        chunks.append(stream.read())
+    finally:
+        stream.close()
+
+
+def run_tracked(
+    cmd: List[str],
+    check: bool = False,
+    timeout: Optional[float] = None,
+    text: bool = True,
+    capture_output: bool = True,
+    stage: Optional[str] = None,
+    **popen_kwargs
+) -> subprocess.CompletedProcess:
+    """
+    Drop-in replacement for subprocess.run() that records child resource usage
+
+    The child is waited with waitid(WNOWAIT) so its /proc/<pid>/io counters can
+    be read before wait4() reaps it and returns the rusage.
+
+    Args:
+        cmd: Command list (cmd[0] is used as the tool name, after a taskset prefix)
+        check: Raise CalledProcessError on non-zero exit
+        timeout: Kill the child after this many seconds (raises TimeoutExpired)
+        text: Decode stdout/stderr as text
+        capture_output: Capture stdout/stderr
+        stage: Stage label (defaults to the thread's stage, then the tool default)
+        **popen_kwargs: Extra subprocess.Popen arguments
+
+    Returns:
+        subprocess.CompletedProcess
+    """
+    tool = Path(cmd[0]).name
+    if tool in WRAPPER_ARGS and len(cmd) > WRAPPER_ARGS[tool]:
+        tool = Path(cmd[WRAPPER_ARGS[tool]]).name
+    stage = stage or current_stage() or DEFAULT_STAGES.get(tool, 'other')
+
+    if capture_output:
+        popen_kwargs.setdefault('stdout', subprocess.PIPE)
+        popen_kwargs.setdefault('stderr', subprocess.PIPE)
+
+    start = time.time()
+    proc = subprocess.Popen(cmd, text=text, **popen_kwargs)
+
+    stdout_chunks: List = []
+    stderr_chunks: List = []
+    readers = []
+    for stream, chunks in ((proc.stdout, stdout_chunks), (proc.stderr, stderr_chunks)):
+        if stream is not None:
+            reader = threading.Thread(target=_drain, args=(stream, chunks), daemon=True)
+            reader.start()
+            readers.append(reader)
+
+    timed_out = threading.Event()
+
+    def _kill_on_timeout():
+        timed_out.set()
+        proc.kill()
+
+    timer = None
+    if timeout:
+        timer = threading.Timer(timeout, _kill_on_timeout)
+        timer.daemon = True
+        timer.start()
+
+    try:
+        # Wait for exit WITHOUT reaping, so /proc/<pid>/io is still readable
+        os.waitid(os.P_PID, proc.pid, os.WEXITED | os.WNOWAIT)
+        io = _read_proc_io(proc.pid)
+        _, status, rusage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+    finally:
+        if timer:
+            timer.cancel()
+
+    for reader in readers:
+        reader.join()
+
+    wall_s = time.time() - start
+    empty = '' if text else b''
+    stdout = stdout_chunks[0] if stdout_chunks else (empty if capture_output else None)
+    stderr = stderr_chunks[0] if stderr_chunks else (empty if capture_output else None)
+
+    ledger = _active_ledger
+    if ledger is not None:
+        ledger.record_process(
+            tool=tool,
+            stage=stage,
+            wall_s=wall_s,
+            cpu_user_s=rusage.ru_utime,
+            cpu_system_s=rusage.ru_stime,
+            peak_rss_bytes=rusage.ru_maxrss * 1024,  # Linux reports KB
+            io_read_bytes=io.get('rchar', 0),
+            io_write_bytes=io.get('wchar', 0)
+        )
+
+    logger.debug(
+        f"{tool} [{stage}] exit={proc.returncode} wall={wall_s:.2f}s "
+        f"cpu={rusage.ru_utime + rusage.ru_stime:.2f}s rss={rusage.ru_maxrss / 1024:.0f}MB"
+    )
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout, output=stdout, stderr=stderr)
+
+    if check and proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, output=stdout, stderr=stderr)
+
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
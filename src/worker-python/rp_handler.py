@@ -1,6 +1,6 @@
 """
 RunPod Serverless Handler for CPU-Optimized Video Processing
-Handles: caption, img2vid (batch), addaudio, concatenate operations
+Handles: caption, img2vid (batch / timeline), addaudio, concatenate operations
 Returns video URLs via HTTP server running on worker
 
 ARCHITECTURE:
@@ -22,6 +22,7 @@ import boto3
 from botocore.exceptions import ClientError
 from pathlib import Path
 from typing import Dict, List, Any, Optional
+from contextlib import contextmanager
 from concurrent.futures import ThreadPoolExecutor
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 import threading
@@ -30,10 +31,58 @@ import multiprocessing
 import psutil
 import math
 import base64
+import shutil
+
+# Import upscale planner (img2vid working resolution)
+from upscale_planner import plan_working_resolution, memory_budget_per_slot
+
+# Import img2vid filter/command builders (single-frame render path)
+from img2vid_render import (
+    get_max_zoom, build_zoompan_filter, build_render_command,
+    choose_pack_size, build_packed_render_command, PACK_MAX_CLIP_DURATION
+)
+
+# Import img2vid scheduler (cost model + longest-first task order)
+from img2vid_scheduler import estimate_clip_cost, schedule_tasks, build_schedule_report
+
+# Import adaptive concurrency controller (img2vid permits follow CPU/RAM/tmpfs pressure)
+from concurrency_controller import ConcurrencyController, get_concurrency_bounds
+
+# Import CPU placement (optional per-process core sets for concurrent ffmpeg)
+from cpu_placement import get_placer, affinity_prefix, io_pinned
+
+# Import source image pre-shrink (Pillow JPEG draft decode, orientation/colorspace normalize)
+from image_preprocess import preprocess_image
 
 # Import caption generator
+import caption_generator
 from caption_generator import generate_ass_from_srt, generate_ass_highlight
 
+# Import resource tracker (per-job CPU/RSS/I/O accounting of ffmpeg children)
+from resource_tracker import run_tracked, record_transfer, start_job, finish_job
+
+# Import segment-parallel encoder (chunked libx264 for long videos on CPU-only workers)
+from segment_encoder import should_use_chunked, encode_segments_parallel, concat_inputs_parallel, pool_plan, smart_trim
+
+# Import in-process media prober (header parser / PyAV, ffprobe only as fallback)
+from media_probe import probe_media, get_stream, get_media_duration, probe_remote_duration
+
+# Import NumPy audio level analysis (volumedetect fallback when NumPy is missing)
+import audio_analysis
+from audio_analysis import analyze_levels, NUMPY_AVAILABLE
+
+# Import derived-metadata store (probe/loudness/ASS cache keyed by content hash)
+from metadata_store import get_store, file_digest, content_digest, params_digest, source_version
+
+# Import normalized-clip cache (cyclic concat: skip download + normalization of reused B-roll)
+from clip_cache import get_clip_cache, clip_key
+from trilha_loop import build_trilha_mix
+
+# Import stream-compatibility analyzer (copy-only concat when inputs share codec parameters)
+from stream_compat import (
+    analyze_concat_compat, analyze_audio_concat_compat, stream_signature, spec_differences, STREAM_COPY_CONCAT
+)
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -100,36 +149,50 @@ def get_container_cpu_quota() -> Optional[int]:
         return None
 
 
-def calculate_optimal_batch_size() -> int:
+def detect_vcpu_count() -> tuple:
     """
-    Calculate optimal BATCH_SIZE based on available CPU resources
+    Detect vCPUs available to this container
 
     Container-aware detection (priority order):
       1. RUNPOD_CPU_COUNT environment variable (official RunPod)
       2. cgroup CPU quota (container limits)
       3. System CPU count (fallback, may be inaccurate in containers)
 
+    Returns:
+        Tuple of (vCPU count, detection method)
+    """
+    # Try to get container CPU quota first (accurate for containers)
+    container_vcpus = get_container_cpu_quota()
+
+    if container_vcpus is not None:
+        # Use container vCPUs (accurate)
+        return container_vcpus, "RunPod/container"
+
+    # Fallback to system detection (may be host CPUs in containers!)
+    cpu_count = multiprocessing.cpu_count()
+    logger.warning(f"⚠️ Using system CPU count (may be inaccurate in containers): {cpu_count}")
+    return cpu_count, "system fallback"
+
+
+def calculate_optimal_batch_size(cpu_count: int = None, detection_method: str = "RunPod/container") -> int:
+    """
+    Calculate optimal BATCH_SIZE based on available CPU resources
+
     Strategy:
       - Zoompan filter is CPU-bound and single-threaded per task
       - Optimal: 1.5x vCPUs (to account for I/O wait time)
       - Min: 2, Max: 16 (avoid excessive thread contention)
 
+    Args:
+        cpu_count: Detected vCPUs (detected here if not provided)
+        detection_method: Label of how cpu_count was detected (for logging)
+
     Returns:
         Optimal batch size for parallel image processing
     """
     try:
-        # Try to get container CPU quota first (accurate for containers)
-        container_vcpus = get_container_cpu_quota()
-
-        if container_vcpus is not None:
-            # Use container vCPUs (accurate)
-            cpu_count = container_vcpus
-            detection_method = "RunPod/container"
-        else:
-            # Fallback to system detection (may be host CPUs in containers!)
-            cpu_count = multiprocessing.cpu_count()
-            detection_method = "system fallback"
-            logger.warning(f"⚠️ Using system CPU count (may be inaccurate in containers): {cpu_count}")
+        if cpu_count is None:
+            cpu_count, detection_method = detect_vcpu_count()
 
         # Formula: 1.5x vCPUs (overlap CPU work with I/O)
         # For 9 vCPUs: 1.5 * 9 = 13.5 → 13
@@ -187,8 +250,24 @@ def get_optimal_work_dir() -> Path:
 
 # Directories - Use RAM cache if available
 WORK_DIR, OUTPUT_DIR = get_optimal_work_dir()
-BATCH_SIZE = calculate_optimal_batch_size()
+VCPU_COUNT, VCPU_DETECTION = detect_vcpu_count()
+BATCH_SIZE = calculate_optimal_batch_size(VCPU_COUNT, VCPU_DETECTION)
+UPSCALE_MEMORY_PER_SLOT = memory_budget_per_slot(BATCH_SIZE)
 HTTP_PORT = int(os.getenv('HTTP_PORT', '8000'))
+STREAMING_HANDLER = os.getenv('STREAMING_HANDLER', 'off').lower() in ('on', 'true', '1')  # Generator handler (per-clip img2vid results)
+
+# addaudio sync strategy: "auto" (default: copy → atempo → retime) | "retime" (always re-encode video)
+ADDAUDIO_SYNC = os.getenv('ADDAUDIO_SYNC', 'auto').lower()
+ADDAUDIO_COPY_TOLERANCE = float(os.getenv('ADDAUDIO_COPY_TOLERANCE', '0.1'))  # seconds of duration mismatch
+ADDAUDIO_ATEMPO_MAX_DEVIATION = float(os.getenv('ADDAUDIO_ATEMPO_MAX_DEVIATION', '0.05'))  # ±5% audio speed
+
+# concat_audio output formats by extension: (codec, encoder args, Content-Type)
+AUDIO_CONCAT_FORMATS = {
+    '.mp3': ('mp3', ['-c:a', 'libmp3lame'], 'audio/mpeg'),
+    '.m4a': ('aac', ['-c:a', 'aac'], 'audio/mp4'),
+    '.aac': ('aac', ['-c:a', 'aac'], 'audio/aac')
+}
+AUDIO_CONCAT_BITRATE = os.getenv('AUDIO_CONCAT_BITRATE', '192k')  # Re-encode pass only
 
 # S3/MinIO Configuration (MUST be provided via job input s3_config)
 # No fallbacks - orchestrator must pass configuration dynamically
@@ -313,6 +392,82 @@ def check_gpu_available() -> bool:
 GPU_AVAILABLE = check_gpu_available()
 
 
+# Render quality tiers
+# - production: final delivery (1920x1080, production encoder presets)
+# - draft: quick preview for editors (540p, ultrafast, reduced upscale, lower fps)
+#   Target: 5-10x faster turnaround than production
+RENDER_PROFILES = {
+    'production': {
+        'width': 1920,
+        'height': 1080,
+        'x264_preset': 'medium',          # caption/addaudio/trilha/concatenate
+        'x264_fast_preset': 'veryfast',   # img2vid + cyclic normalization
+        'nvenc_preset': 'p4',
+        'crf': 23,
+        'jitter_tolerance': 0.25,         # Max zoompan crop step (output px) - quarter pixel
+        'max_fps': None,                  # Keep requested fps
+        'normalize_fps': 30
+    },
+    'draft': {
+        'width': 960,
+        'height': 540,
+        'x264_preset': 'ultrafast',
+        'x264_fast_preset': 'ultrafast',
+        'nvenc_preset': 'p1',
+        'crf': 28,
+        'jitter_tolerance': 1.0,          # Whole-pixel steps: working frame ~out x max zoom
+        'max_fps': 15,
+        'normalize_fps': 15
+    }
+}
+
+
+def get_render_profile(quality: str = 'production') -> Dict[str, Any]:
+    """
+    Get render profile for a quality tier
+
+    Args:
+        quality: "production" (default) or "draft"
+
+    Returns:
+        Render profile dict (resolution, presets, jitter tolerance, fps limits)
+
+    Raises:
+        ValueError: If quality tier is unknown
+    """
+    quality = quality or 'production'
+    if quality not in RENDER_PROFILES:
+        raise ValueError(f"Invalid quality: {quality} (expected one of {list(RENDER_PROFILES.keys())})")
+    return RENDER_PROFILES[quality]
+
+
+def get_draft_filters(quality: str) -> Optional[str]:
+    """Downscale + fps cap filters applied before operation filters in draft mode"""
+    if quality != 'draft':
+        return None
+    profile = get_render_profile(quality)
+    return f"scale={profile['width']}:{profile['height']},fps={profile['max_fps']}"
+
+
+def get_libx264_args(quality: str = 'production') -> List[str]:
+    """libx264 encoder args for a quality tier (shared by single-process and chunked encodes)"""
+    profile = get_render_profile(quality)
+    return [
+        '-c:v', 'libx264',
+        '-preset', profile['x264_preset'],
+        '-crf', str(profile['crf']),
+        '-maxrate', '10M',
+        '-bufsize', '20M'
+    ]
+
+
+def get_draft_metadata(quality: str) -> Optional[Dict[str, str]]:
+    """S3 object metadata flagging draft renders (None for production)"""
+    if quality == 'draft':
+        return {'render-quality': 'draft'}
+    return None
+
+
 def run_ffmpeg_with_fallback(
     input_file: str,
     output_file: str,
@@ -320,7 +475,8 @@ def run_ffmpeg_with_fallback(
     audio_codec: str = 'copy',
     extra_input_args: list = None,
     extra_output_args: list = None,
-    timeout: int = 3600
+    timeout: int = 3600,
+    quality: str = 'production'
 ) -> subprocess.CompletedProcess:
     """
     Run FFmpeg with automatic GPU/CPU fallback.
@@ -335,6 +491,7 @@ def run_ffmpeg_with_fallback(
         extra_input_args: Additional args before input (-i)
         extra_output_args: Additional args before output file
         timeout: Command timeout in seconds
+        quality: Render quality tier ("production" or "draft")
 
     Returns:
         subprocess.CompletedProcess from successful encoder
@@ -342,6 +499,13 @@ def run_ffmpeg_with_fallback(
     Raises:
         RuntimeError: If both GPU and CPU encoding fail
     """
+    profile = get_render_profile(quality)
+
+    # Draft: downscale (and cap fps) before the operation's own filters
+    draft_filters = get_draft_filters(quality)
+    if draft_filters:
+        video_filters = f"{draft_filters},{video_filters}" if video_filters else draft_filters
+
     encoder_configs = [
         {
             'name': 'h264_nvenc',
@@ -349,10 +513,10 @@ def run_ffmpeg_with_fallback(
             'skip': not GPU_AVAILABLE,
             'args': [
                 '-c:v', 'h264_nvenc',
-                '-preset', 'p4',
+                '-preset', profile['nvenc_preset'],
                 '-tune', 'hq',
                 '-rc:v', 'vbr',
-                '-cq:v', '23',
+                '-cq:v', str(profile['crf']),
                 '-b:v', '0',
                 '-maxrate', '10M',
                 '-bufsize', '20M'
@@ -362,13 +526,7 @@ def run_ffmpeg_with_fallback(
             'name': 'libx264',
             'label': '💻 CPU (libx264)',
             'skip': False,
-            'args': [
-                '-c:v', 'libx264',
-                '-preset', 'medium',
-                '-crf', '23',
-                '-maxrate', '10M',
-                '-bufsize', '20M'
-            ]
+            'args': get_libx264_args(quality)
         }
     ]
 
@@ -410,7 +568,7 @@ def run_ffmpeg_with_fallback(
             logger.info(f"🎬 {config['label']} encoding: {Path(output_file).name}")
             logger.debug(f"Command: {' '.join(cmd)}")
 
-            result = subprocess.run(
+            result = run_tracked(
                 cmd,
                 capture_output=True,
                 text=True,
@@ -452,6 +610,59 @@ def run_ffmpeg_with_fallback(
         raise RuntimeError("No encoders available")
 
 
+def encode_video_filter_job(
+    job_id: str,
+    input_path: Path,
+    output_path: Path,
+    video_filters: str,
+    quality: str = 'production',
+    chunked: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Apply a video filter (e.g. ass captions) re-encoding video and copying audio
+
+    Uses segment-parallel libx264 (chunked mode) for long videos on CPU-only
+    workers, otherwise a single FFmpeg process with GPU/CPU fallback.
+
+    Args:
+        job_id: Job identifier (names the chunk work directory)
+        input_path: Source video
+        output_path: Output MP4
+        video_filters: Timeline filter chain applied to the video
+        quality: Render quality tier ("production" or "draft")
+        chunked: Force chunked mode on/off (None = auto)
+
+    Returns:
+        Encode stats ({'chunked': bool, ...})
+    """
+    duration = get_duration(input_path)
+
+    if should_use_chunked(duration, chunked, GPU_AVAILABLE, VCPU_COUNT):
+        draft_filters = get_draft_filters(quality)
+        try:
+            return encode_segments_parallel(
+                input_path=input_path,
+                output_path=output_path,
+                work_dir=WORK_DIR / f"{job_id}_chunks",
+                video_args=get_libx264_args(quality),
+                vcpus=VCPU_COUNT,
+                video_filter=f"{draft_filters},{video_filters}" if draft_filters else video_filters
+            )
+        except (subprocess.CalledProcessError, RuntimeError) as e:
+            stderr = getattr(e, 'stderr', None) or str(e)
+            logger.warning(f"⚠️ Chunked encoding failed, falling back to single process: {stderr[:200]}")
+
+    run_ffmpeg_with_fallback(
+        input_file=str(input_path),
+        output_file=str(output_path),
+        video_filters=video_filters,
+        audio_codec='copy',
+        extra_output_args=['-movflags', '+faststart'],
+        quality=quality
+    )
+    return {'chunked': False}
+
+
 def normalize_url(url: str) -> str:
     """
     Normalize URL to handle UTF-8 characters correctly
@@ -598,6 +809,7 @@ def download_google_drive_file(url: str, output_path: Path) -> None:
 
             file_size = output_path.stat().st_size
             file_size_mb = file_size / (1024 * 1024)
+            record_transfer('download', file_size)
 
             logger.info(f"✅ Google Drive download completed: {output_path.name} ({file_size_mb:.2f} MB)")
 
@@ -701,31 +913,46 @@ http_thread = threading.Thread(target=start_http_server, daemon=True)
 http_thread.start()
 
 
-def upload_to_s3(local_path: Path, bucket: str, s3_key: str) -> str:
+@io_pinned
+def upload_to_s3(
+    local_path: Path,
+    bucket: str,
+    s3_key: str,
+    metadata: Optional[Dict[str, str]] = None,
+    content_type: str = 'video/mp4'
+) -> str:
     """
     Upload file to S3/MinIO and return public URL
     Args:
         local_path: Local file path
         bucket: S3 bucket name
         s3_key: S3 object key (path in bucket)
+        metadata: Optional S3 object metadata (e.g. draft render flag)
+        content_type: Object Content-Type (audio outputs: audio/mpeg, audio/mp4)
     Returns:
         Public URL of uploaded file
     """
     try:
         logger.info(f"📤 Uploading to S3: {bucket}/{s3_key}")
 
+        extra_args = {'ACL': 'public-read', 'ContentType': content_type}
+        if metadata:
+            extra_args['Metadata'] = metadata
+
         # Upload file with public-read ACL
         s3_client.upload_file(
             str(local_path),
             bucket,
             s3_key,
-            ExtraArgs={'ACL': 'public-read', 'ContentType': 'video/mp4'}
+            ExtraArgs=extra_args
         )
 
         # Construct public URL
         public_url = f"{S3_ENDPOINT_URL}/{bucket}/{s3_key}"
 
-        file_size_mb = local_path.stat().st_size / (1024 * 1024)
+        file_size = local_path.stat().st_size
+        record_transfer('upload', file_size)
+        file_size_mb = file_size / (1024 * 1024)
         logger.info(f"✅ S3 upload complete: {s3_key} ({file_size_mb:.2f} MB)")
 
         return public_url
@@ -738,6 +965,36 @@ def upload_to_s3(local_path: Path, bucket: str, s3_key: str) -> str:
         raise
 
 
+def copy_s3_object(bucket: str, source_key: str, s3_key: str) -> str:
+    """
+    Server-side copy of an S3/MinIO object (no download/upload through the worker)
+    Args:
+        bucket: S3 bucket name
+        source_key: Existing object key
+        s3_key: Destination object key
+    Returns:
+        Public URL of the copy
+    """
+    try:
+        logger.info(f"📑 S3 copy: {bucket}/{source_key} → {s3_key}")
+
+        # Metadata and ContentType are copied; the ACL is not, so set it again
+        s3_client.copy_object(
+            Bucket=bucket,
+            Key=s3_key,
+            CopySource={'Bucket': bucket, 'Key': source_key},
+            ACL='public-read',
+            MetadataDirective='COPY'
+        )
+
+        return f"{S3_ENDPOINT_URL}/{bucket}/{s3_key}"
+
+    except ClientError as e:
+        logger.error(f"❌ S3 copy failed: {e}")
+        raise
+
+
+@io_pinned
 def download_file(url: str, output_path: Path) -> None:
     """Download file from URL (optimized for S3/MinIO)"""
     logger.info(f"Downloading {url} to {output_path}")
@@ -766,6 +1023,7 @@ def download_file(url: str, output_path: Path) -> None:
                 s3_client.download_file(bucket, key, str(output_path))
 
                 file_size = output_path.stat().st_size
+                record_transfer('download', file_size)
                 logger.info(f"✅ S3 download completed: {output_path} ({file_size} bytes)")
 
                 if file_size == 0:
@@ -792,6 +1050,7 @@ def download_file(url: str, output_path: Path) -> None:
                     f.write(chunk)
 
         file_size = output_path.stat().st_size
+        record_transfer('download', file_size)
         logger.info(f"✅ HTTP download completed: {output_path} ({file_size} bytes)")
 
         if file_size == 0:
@@ -808,6 +1067,83 @@ def download_file(url: str, output_path: Path) -> None:
         raise
 
 
+def get_remote_version(url: str) -> Optional[str]:
+    """
+    Cheap remote content version of a URL (no body download)
+
+    Used to reuse a remembered content hash for an unchanged source:
+    S3 ETag (configured endpoint), HTTP ETag or Last-Modified + Content-Length.
+    None when the server exposes nothing usable.
+
+    Google Drive links always return None: the file id survives new
+    revisions, and the download endpoint serves no validator without the
+    Drive API, so those clips are always downloaded and keyed by content.
+    """
+    from urllib.parse import urlparse, unquote
+
+    if 'drive.google.com' in url:
+        return None
+
+    try:
+
+        parsed_url = urlparse(url)
+        if s3_client is not None and parsed_url.netloc.lower() == urlparse(S3_ENDPOINT_URL).netloc.lower():
+            path_parts = parsed_url.path.lstrip('/').split('/', 1)
+            if len(path_parts) == 2:
+                head = s3_client.head_object(Bucket=path_parts[0], Key=unquote(path_parts[1]))
+                return f"etag:{head['ETag']}:{head['ContentLength']}"
+
+        from requests.utils import requote_uri
+        response = requests.head(requote_uri(url), timeout=15, allow_redirects=True)
+        response.raise_for_status()
+        if response.headers.get('ETag'):
+            return f"etag:{response.headers['ETag']}"
+        if response.headers.get('Last-Modified') and response.headers.get('Content-Length'):
+            return f"modified:{response.headers['Last-Modified']}:{response.headers['Content-Length']}"
+
+    except (ClientError, requests.exceptions.RequestException) as e:
+        logger.info(f"🔍 No remote version for {url[:60]}: {e}")
+
+    return None
+
+
+def get_remote_duration(url: str, version: Optional[str] = None) -> Optional[float]:
+    """
+    Duration of a remote clip without downloading it
+
+    Remembered duration of this source version first (metadata store), then
+    a header-only remote probe. Google Drive links serve an HTML page to
+    media probes, so they are only known once downloaded.
+    """
+    if version:
+        source = get_store().get('clip_source', params_digest(url, version))
+        if source and source['value'].get('duration'):
+            return source['value']['duration']
+
+    if 'drive.google.com' in url:
+        return None
+
+    from requests.utils import requote_uri
+    return probe_remote_duration(requote_uri(url))
+
+
+def count_cyclic_clips(durations: List[Optional[float]], audio_duration: float) -> Optional[int]:
+    """
+    Number of clips (from the start of the list) a cyclic sequence uses
+
+    Returns:
+        Clip count, or None while an unknown duration decides it
+    """
+    accumulated = 0.0
+    for i, duration in enumerate(durations):
+        if duration is None:
+            return None
+        accumulated += duration
+        if accumulated >= audio_duration:
+            return i + 1
+    return len(durations)
+
+
 def add_caption(
     url_video: str,
     url_srt: str,
@@ -887,7 +1223,7 @@ def add_caption(
             ]
 
         logger.info(f"Running FFmpeg: {' '.join(cmd)}")
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        result = run_tracked(cmd, capture_output=True, text=True, check=True)
 
         if not output_path.exists() or output_path.stat().st_size == 0:
             raise RuntimeError("FFmpeg produced empty output")
@@ -919,28 +1255,15 @@ def add_caption(
 
 
 def get_image_metadata(image_path: Path) -> Optional[Dict[str, int]]:
-    """Get image dimensions using ffprobe"""
+    """Get image dimensions (JPEG/PNG header parse, PyAV/ffprobe fallback)"""
     try:
-        cmd = [
-            'ffprobe',
-            '-v', 'quiet',
-            '-print_format', 'json',
-            '-show_streams',
-            str(image_path)
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        import json
-        metadata = json.loads(result.stdout)
-
-        # Find video stream (images are treated as video by ffprobe)
-        for stream in metadata.get('streams', []):
-            if stream.get('codec_type') == 'video':
-                width = stream.get('width')
-                height = stream.get('height')
-                if width and height:
-                    logger.info(f"Image metadata: {width}x{height}")
-                    return {'width': width, 'height': height}
+        stream = get_stream(probe_media(image_path), 'video')
+        if stream:
+            width = stream.get('width')
+            height = stream.get('height')
+            if width and height:
+                logger.info(f"Image metadata: {width}x{height}")
+                return {'width': width, 'height': height}
 
         logger.warning(f"Could not extract image dimensions from {image_path}")
         return None
@@ -950,107 +1273,178 @@ def get_image_metadata(image_path: Path) -> Optional[Dict[str, int]]:
         return None
 
 
-def image_to_video(
-    image_id: str,
-    image_url: str,
+def plan_img2vid_filter(
+    image_path: Path,
     duracao: float,
-    frame_rate: int = 24,
-    zoom_type: str = "zoomin",
-    worker_id: str = None,
-    path: str = None,
-    video_index: int = None
+    frame_rate: int,
+    zoom_type: str,
+    profile: Dict[str, Any],
+    memory_budget: int
+) -> str:
+    """Plan the working resolution for an image and build its zoompan filter chain"""
+    out_width, out_height = profile['width'], profile['height']
+
+    # Get image metadata for optimal upscaling
+    image_metadata = get_image_metadata(image_path)
+
+    # Use FLOAT for precise animation timing - no rounding to ensure animation completes exactly at video end
+    total_frames = frame_rate * duracao  # e.g., 24 * 3.33 = 79.92 frames (precise)
+    max_zoom = get_max_zoom(zoom_type)
+
+    # Plan working resolution (smooth sub-pixel motion within the per-slot memory budget)
+    # Use actual image dimensions if available, otherwise default to output size
+    src_width = image_metadata['width'] if image_metadata else out_width
+    src_height = image_metadata['height'] if image_metadata else out_height
+    upscale_plan = plan_working_resolution(
+        src_width, src_height,
+        out_width, out_height,
+        max_zoom=max_zoom,
+        total_frames=total_frames,
+        tolerance=profile['jitter_tolerance'],
+        memory_budget=memory_budget
+    )
+    upscale_width = upscale_plan['width']
+    upscale_height = upscale_plan['height']
+    logger.info(
+        f"📐 Upscale plan: {src_width}x{src_height} → {upscale_width}x{upscale_height} "
+        f"(x{upscale_plan['factor']}, step {upscale_plan['step_px']}px, "
+        f"~{upscale_plan['estimated_mb']:.0f} MB, limited by {upscale_plan['limited_by']})"
+    )
+
+    # Video filter with zoom effect (upscale once → zoompan → bicubic downscale)
+    return build_zoompan_filter(
+        upscale_width, upscale_height,
+        zoom_type, total_frames,
+        out_width, out_height,
+        frame_rate
+    )
+
+
+def publish_img2vid_output(
+    output_path: Path,
+    output_filename: str,
+    image_id: str,
+    video_index: Optional[int],
+    path: Optional[str],
+    worker_id: Optional[str],
+    quality: str
 ) -> Dict[str, Any]:
-    """Convert image to video with various zoom effects and upload to S3
+    """Upload a rendered clip to S3 (or expose it via HTTP) and build its result entry"""
+    if not output_path.exists() or output_path.stat().st_size == 0:
+        raise RuntimeError("FFmpeg produced empty output")
 
-    Args:
-        zoom_type: Type of zoom effect - "zoomin", "zoomout", "zoompanright"
-    """
-    logger.info(f"Converting image to video: {image_id}, duration: {duracao}s, fps: {frame_rate}, zoom: {zoom_type}")
+    file_size_mb = output_path.stat().st_size / (1024 * 1024)
+    logger.info(f"✅ Image to video completed: {output_filename} ({file_size_mb:.2f} MB)")
 
-    image_path = WORK_DIR / f"{image_id}_image.jpg"
+    # Upload to S3 if path provided
+    if path:
+        # S3 key: {path}{filename} (path already includes /videos/temp/)
+        s3_key = f"{path}{output_filename}"
+        video_url = upload_to_s3(output_path, S3_BUCKET_NAME, s3_key, get_draft_metadata(quality))
 
-    # Use video_index for filename if provided (e.g., video_1.mp4)
-    if video_index is not None:
-        output_filename = f"video_{video_index}.mp4"
+        # Cleanup local file after S3 upload
+        output_path.unlink(missing_ok=True)
+
+        return {
+            'id': str(video_index) if video_index is not None else image_id,
+            'video_url': video_url,
+            'filename': output_filename,
+            's3_key': s3_key,
+            'draft': quality == 'draft'
+        }
     else:
-        output_filename = f"{image_id}_video.mp4"
+        # Fallback to HTTP URL (legacy mode)
+        if worker_id:
+            video_url = f"https://{worker_id}-{HTTP_PORT}.proxy.runpod.net/{output_filename}"
+        else:
+            video_url = f"http://localhost:{HTTP_PORT}/{output_filename}"
 
-    output_path = OUTPUT_DIR / output_filename
+        return {
+            'id': str(video_index) if video_index is not None else image_id,
+            'video_url': video_url,
+            'filename': output_filename,
+            'draft': quality == 'draft'
+        }
+
+
+def get_img2vid_frame_rate(frame_rate: int, profile: Dict[str, Any]) -> int:
+    """Draft: lower fps is valid for img2vid (zoompan generates frames at output rate)"""
+    if profile['max_fps'] and frame_rate > profile['max_fps']:
+        return profile['max_fps']
+    return frame_rate
+
+
+def get_img2vid_filename(image_id: str, video_index: Optional[int]) -> str:
+    """Use video_index for filename if provided (e.g., video_1.mp4)"""
+    if video_index is not None:
+        return f"video_{video_index}.mp4"
+    return f"{image_id}_video.mp4"
+
+
+def preprocess_img2vid_source(image_path: Path, zoom_type: str, profile: Dict[str, Any]) -> Path:
+    """
+    Pre-shrink the downloaded image to the resolution the render can use
+
+    Returns:
+        Intermediate JPEG path (caller deletes it), or image_path when unchanged
+    """
+    max_zoom = get_max_zoom(zoom_type)
+    result = preprocess_image(
+        image_path,
+        math.ceil(profile['width'] * max_zoom),
+        math.ceil(profile['height'] * max_zoom),
+        image_path.with_name(f"{image_path.stem}_pre.jpg")
+    )
+    return result['path'] if result else image_path
+
+
+# Per-thread ffmpeg render seconds of the current img2vid task (see run_render_timed)
+_render_clock = threading.local()
+# Per-thread upscale memory and CPU thread budgets of the current render slot (see placed_render)
+_render_slot = threading.local()
+
+
+def slot_memory_budget() -> int:
+    """Upscale memory budget of the calling render slot (BATCH_SIZE slots outside a controlled pool)"""
+    return getattr(_render_slot, 'memory_budget', None) or UPSCALE_MEMORY_PER_SLOT
+
+
+def slot_thread_budget() -> int:
+    """Encoder threads of the calling render slot (its CPU lease, else vCPUs / live concurrency)"""
+    return getattr(_render_slot, 'threads', None) or max(1, VCPU_COUNT // BATCH_SIZE)
+
+
+def run_render(cmd: List[str]) -> None:
+    """Run an img2vid ffmpeg render pinned to the thread's CPU lease, adding its time to the render clock"""
+    start = time.time()
+    try:
+        run_tracked(affinity_prefix() + cmd, capture_output=True, text=True, check=True, stage='render')
+    finally:
+        _render_clock.seconds = getattr(_render_clock, 'seconds', 0.0) + time.time() - start
+
+
+def render_image_clip(
+    image_id: str,
+    image_url: str,
+    duracao: float,
+    frame_rate: int,
+    zoom_type: str,
+    output_path: Path,
+    profile: Dict[str, Any]
+) -> None:
+    """Download an image and render its zoom clip to output_path (no upload)"""
+    image_path = WORK_DIR / f"{image_id}_image.jpg"
+    source_path = image_path
 
     try:
         # Download image
         download_file(image_url, image_path)
 
-        # Get image metadata for optimal upscaling
-        image_metadata = get_image_metadata(image_path)
+        # Decode oversized sources straight to the needed size (ffmpeg reads the intermediate)
+        source_path = preprocess_img2vid_source(image_path, zoom_type, profile)
 
-        # Zoom parameters - Optimized upscale (6x) for balanced quality and performance
-        # Use FLOAT for precise animation timing - no rounding to ensure animation completes exactly at video end
-        total_frames = frame_rate * duracao  # e.g., 24 * 3.33 = 79.92 frames (precise)
-        upscale_factor = 6  # Balanced upscale: 6x for good quality and faster processing
-
-        # Use actual image dimensions if available, otherwise default to 1920x1080
-        if image_metadata:
-            upscale_width = image_metadata['width'] * upscale_factor
-            upscale_height = image_metadata['height'] * upscale_factor
-            logger.info(f"Using actual image dimensions: {image_metadata['width']}x{image_metadata['height']} → {upscale_width}x{upscale_height}")
-        else:
-            upscale_width = 1920 * upscale_factor  # 11520px
-            upscale_height = 1080 * upscale_factor  # 6480px
-            logger.info(f"Using default dimensions: 1920x1080 → {upscale_width}x{upscale_height}")
-
-        # Define zoom effect based on type
-        # CRITICAL: NO trunc() - causes jitter due to rounding
-        # Use continuous float values for smooth sub-pixel motion
-        if zoom_type == "zoomout":
-            # ZOOM OUT: Starts zoomed in, ends normal
-            zoom_start = 1.35  # Slower, smoother zoom
-            zoom_end = 1.0
-            zoom_diff = zoom_start - zoom_end
-            zoom_formula = f"max({zoom_start}-{zoom_diff}*on/{total_frames},{zoom_end})"
-            # Centered - no trunc() for smooth motion
-            x_formula = "iw/2-(iw/zoom/2)"
-            y_formula = "ih/2-(ih/zoom/2)"
-
-        elif zoom_type == "zoompanright":
-            # ZOOM IN + PAN RIGHT
-            # Inicia no canto esquerdo (x=0), termina no canto direito (x=x_max)
-            zoom_start = 1.0
-            zoom_end = 1.40  # Slower zoom for smoother effect
-            zoom_diff = zoom_end - zoom_start
-            zoom_formula = f"min({zoom_start}+{zoom_diff}*on/{total_frames},{zoom_end})"
-
-            # Pan da esquerda para direita
-            # x: 0 → (iw - ow/zoom)
-            # Movimento linear: progresso × distância_máxima
-            # IMPORTANTE: (iw-ow/zoom) é dinâmico, aumenta conforme zoom aumenta
-            # Isso funciona porque começamos em 0 (fixo) e vamos para x_max (dinâmico crescente)
-            x_formula = f"(iw-ow/zoom)*on/{total_frames}"
-
-            # Centralizado verticalmente (mesma fórmula do zoomin/zoomout que funciona sem jitter)
-            y_formula = "ih/2-(ih/zoom/2)"
-
-        else:  # "zoomin" (default)
-            # ZOOM IN: Starts normal, ends zoomed in
-            zoom_start = 1.0
-            zoom_end = 1.40  # Slower zoom for smoother effect
-            zoom_diff = zoom_end - zoom_start
-            zoom_formula = f"min({zoom_start}+{zoom_diff}*on/{total_frames},{zoom_end})"
-            # Centered - no trunc() for smooth motion
-            x_formula = "iw/2-(iw/zoom/2)"
-            y_formula = "ih/2-(ih/zoom/2)"
-
-        # Video filter with zoom effect - Bicubic downscaling for best quality
-        video_filter = (
-            f"scale={upscale_width}:{upscale_height}:flags=lanczos,"
-            f"zoompan=z='{zoom_formula}'"
-            f":d={total_frames}"
-            f":x='{x_formula}'"
-            f":y='{y_formula}'"
-            f":s=1920x1080"
-            f":fps={frame_rate},"
-            f"scale=1920:1080:flags=bicubic,"  # Final downscale with bicubic for smoothness
-            f"format=nv12"
+        video_filter = plan_img2vid_filter(
+            source_path, duracao, frame_rate, zoom_type, profile, slot_memory_budget()
         )
 
         # FFmpeg command - ALWAYS use CPU encoding for img2vid
@@ -1058,102 +1452,204 @@ def image_to_video(
         # - libx264 veryfast: ~190 fps, minimal overhead (~0.05s)
         # - NVENC: ~180 fps but with 1.3s initialization overhead
         # - Result: CPU is 2x faster for our use case
-        logger.info("💻 Using CPU encoding (libx264 veryfast) - optimized for short videos")
-        cmd = [
-            'ffmpeg', '-y',
-            '-framerate', str(frame_rate),
-            '-loop', '1',
-            '-i', str(image_path),
-            '-vf', video_filter,
-            '-c:v', 'libx264',
-            '-preset', 'veryfast',  # ~190 fps, minimal overhead
-            '-crf', '23',
-            '-maxrate', '10M',
-            '-bufsize', '20M',
-            '-threads', '0',  # Auto-select optimal thread count
-            '-t', str(duracao),
-            str(output_path)
-        ]
+        logger.info(f"💻 Using CPU encoding (libx264 {profile['x264_fast_preset']}) - optimized for short videos")
+        cmd = build_render_command(
+            source_path,
+            output_path,
+            video_filter,
+            frame_rate,
+            duracao,
+            x264_preset=profile['x264_fast_preset'],  # veryfast: ~190 fps, minimal overhead
+            crf=profile['crf']
+        )
 
         logger.info(f"Running FFmpeg: {' '.join(cmd)}")
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-
-        if not output_path.exists() or output_path.stat().st_size == 0:
-            raise RuntimeError("FFmpeg produced empty output")
-
-        file_size_mb = output_path.stat().st_size / (1024 * 1024)
-        logger.info(f"✅ Image to video completed: {output_filename} ({file_size_mb:.2f} MB)")
-
-        # Upload to S3 if path provided
-        if path:
-            # S3 key: {path}{filename} (path already includes /videos/temp/)
-            s3_key = f"{path}{output_filename}"
-            video_url = upload_to_s3(output_path, S3_BUCKET_NAME, s3_key)
-
-            # Cleanup local file after S3 upload
-            output_path.unlink(missing_ok=True)
-
-            return {
-                'id': str(video_index) if video_index is not None else image_id,
-                'video_url': video_url,
-                'filename': output_filename,
-                's3_key': s3_key
-            }
-        else:
-            # Fallback to HTTP URL (legacy mode)
-            if worker_id:
-                video_url = f"https://{worker_id}-{HTTP_PORT}.proxy.runpod.net/{output_filename}"
-            else:
-                video_url = f"http://localhost:{HTTP_PORT}/{output_filename}"
-
-            return {
-                'id': str(video_index) if video_index is not None else image_id,
-                'video_url': video_url,
-                'filename': output_filename
-            }
+        run_render(cmd)
 
     except subprocess.CalledProcessError as e:
         logger.error(f"FFmpeg error: {e.stderr}")
         raise RuntimeError(f"FFmpeg failed: {e.stderr}")
     finally:
-        # Cleanup input image
+        # Cleanup input image (and pre-shrunk intermediate)
         image_path.unlink(missing_ok=True)
+        source_path.unlink(missing_ok=True)
 
 
-def distribute_zoom_types(zoom_types: List[str], image_count: int) -> List[str]:
-    """
-    Distribute zoom types proportionally and randomly across images
+def image_to_video(
+    image_id: str,
+    image_url: str,
+    duracao: float,
+    frame_rate: int = 24,
+    zoom_type: str = "zoomin",
+    worker_id: str = None,
+    path: str = None,
+    video_index: int = None,
+    quality: str = 'production'
+) -> Dict[str, Any]:
+    """Convert image to video with various zoom effects and upload to S3
 
     Args:
-        zoom_types: List of zoom types to distribute (e.g., ["zoomin", "zoomout", "zoompanright"])
-        image_count: Total number of images
+        zoom_type: Type of zoom effect - "zoomin", "zoomout", "zoompanright"
+        quality: Render quality tier - "production" (1080p) or "draft" (540p preview)
+    """
+    profile = get_render_profile(quality)
+    frame_rate = get_img2vid_frame_rate(frame_rate, profile)
 
-    Returns:
-        List of zoom types, one per image, distributed proportionally and shuffled
+    logger.info(f"Converting image to video: {image_id}, duration: {duracao}s, fps: {frame_rate}, zoom: {zoom_type}, quality: {quality}")
 
-    Example:
-        distribute_zoom_types(["zoomin", "zoomout"], 10)
-        -> ["zoomin", "zoomout", "zoomin", "zoomout", ...] (shuffled)
+    output_filename = get_img2vid_filename(image_id, video_index)
+    output_path = OUTPUT_DIR / output_filename
 
-        distribute_zoom_types(["zoomin", "zoomout", "zoompanright"], 10)
-        -> 3-4 zoomin, 3-4 zoomout, 3-4 zoompanright (shuffled)
-    """
-    if not zoom_types or image_count == 0:
-        return ["zoomin"] * image_count  # Default fallback
+    render_image_clip(image_id, image_url, duracao, frame_rate, zoom_type, output_path, profile)
 
-    # Calculate proportional distribution
-    types_count = len(zoom_types)
-    base_count = image_count // types_count  # Base count per type
-    remainder = image_count % types_count    # Extra images to distribute
+    return publish_img2vid_output(
+        output_path, output_filename, image_id, video_index, path, worker_id, quality
+    )
 
-    # Build distribution list
-    distribution = []
-    for i, zoom_type in enumerate(zoom_types):
-        # Each type gets base_count + 1 extra if remainder available
-        count = base_count + (1 if i < remainder else 0)
-        distribution.extend([zoom_type] * count)
 
-    # Shuffle to randomize order (proportional but random)
+def render_image_clips_packed(
+    clips: List[Dict[str, Any]],
+    frame_rate: int,
+    profile: Dict[str, Any]
+) -> None:
+    """Render K images with ONE ffmpeg process (K zoompan branches → K outputs, no upload)
+
+    Falls back to one process per clip if the packed render fails.
+
+    Args:
+        clips: Dicts with image_id, image_url, duracao, zoom_type, output_path
+        frame_rate: Video frame rate
+        profile: Render profile
+    """
+    pack_size = len(clips)
+    logger.info(f"📦 Packed render: {pack_size} clips in one ffmpeg process ({[c['output_path'].name for c in clips]})")
+
+    # K working frames are alive at once: split the slot memory budget between branches
+    memory_budget = slot_memory_budget() // pack_size
+    # K libx264 encoders share the slot's threads (1 each once renders outnumber vCPUs)
+    threads_per_output = max(1, slot_thread_budget() // pack_size)
+
+    render_items = []
+    downloaded = []
+    try:
+        for clip in clips:
+            image_path = WORK_DIR / f"{clip['image_id']}_image.jpg"
+            downloaded.append(image_path)
+            download_file(clip['image_url'], image_path)
+            source_path = preprocess_img2vid_source(image_path, clip['zoom_type'], profile)
+            render_items.append({
+                'image_path': source_path,
+                'output_path': clip['output_path'],
+                'duracao': clip['duracao']
+            })
+
+        for item, clip in zip(render_items, clips):
+            item['video_filter'] = plan_img2vid_filter(
+                item['image_path'], clip['duracao'], frame_rate, clip['zoom_type'], profile, memory_budget
+            )
+
+        cmd = build_packed_render_command(
+            render_items,
+            frame_rate,
+            x264_preset=profile['x264_fast_preset'],
+            crf=profile['crf'],
+            threads_per_output=threads_per_output
+        )
+
+        logger.info(f"Running FFmpeg: {' '.join(cmd)}")
+        try:
+            run_render(cmd)
+            return
+        except subprocess.CalledProcessError as e:
+            logger.warning(f"⚠️ Packed render failed, rendering clips individually: {e.stderr[-500:] if e.stderr else e}")
+
+    finally:
+        # Cleanup input images (and pre-shrunk intermediates)
+        for image_path in downloaded:
+            image_path.unlink(missing_ok=True)
+        for item in render_items:
+            item['image_path'].unlink(missing_ok=True)
+
+    for clip in clips:
+        render_image_clip(
+            clip['image_id'], clip['image_url'], clip['duracao'], frame_rate,
+            clip['zoom_type'], clip['output_path'], profile
+        )
+
+
+def images_to_videos_packed(
+    clips: List[Dict[str, Any]],
+    frame_rate: int = 24,
+    worker_id: str = None,
+    path: str = None,
+    quality: str = 'production'
+) -> List[Dict[str, Any]]:
+    """Render K images with ONE ffmpeg process and upload each clip
+
+    Output files, S3 keys and result entries are identical to image_to_video.
+
+    Args:
+        clips: Dicts with image_id, image_url, duracao, zoom_type, video_index
+        frame_rate: Video frame rate
+        worker_id: Worker identifier
+        path: S3 path for uploads
+        quality: Render quality tier - "production" or "draft"
+
+    Returns:
+        Result entries in clip order
+    """
+    profile = get_render_profile(quality)
+    frame_rate = get_img2vid_frame_rate(frame_rate, profile)
+
+    for clip in clips:
+        clip['output_filename'] = get_img2vid_filename(clip['image_id'], clip['video_index'])
+        clip['output_path'] = OUTPUT_DIR / clip['output_filename']
+
+    render_image_clips_packed(clips, frame_rate, profile)
+
+    return [
+        publish_img2vid_output(
+            clip['output_path'], clip['output_filename'], clip['image_id'],
+            clip['video_index'], path, worker_id, quality
+        )
+        for clip in clips
+    ]
+
+
+def distribute_zoom_types(zoom_types: List[str], image_count: int) -> List[str]:
+    """
+    Distribute zoom types proportionally and randomly across images
+
+    Args:
+        zoom_types: List of zoom types to distribute (e.g., ["zoomin", "zoomout", "zoompanright"])
+        image_count: Total number of images
+
+    Returns:
+        List of zoom types, one per image, distributed proportionally and shuffled
+
+    Example:
+        distribute_zoom_types(["zoomin", "zoomout"], 10)
+        -> ["zoomin", "zoomout", "zoomin", "zoomout", ...] (shuffled)
+
+        distribute_zoom_types(["zoomin", "zoomout", "zoompanright"], 10)
+        -> 3-4 zoomin, 3-4 zoomout, 3-4 zoompanright (shuffled)
+    """
+    if not zoom_types or image_count == 0:
+        return ["zoomin"] * image_count  # Default fallback
+
+    # Calculate proportional distribution
+    types_count = len(zoom_types)
+    base_count = image_count // types_count  # Base count per type
+    remainder = image_count % types_count    # Extra images to distribute
+
+    # Build distribution list
+    distribution = []
+    for i, zoom_type in enumerate(zoom_types):
+        # Each type gets base_count + 1 extra if remainder available
+        count = base_count + (1 if i < remainder else 0)
+        distribution.extend([zoom_type] * count)
+
+    # Shuffle to randomize order (proportional but random)
     random.shuffle(distribution)
 
     logger.info(f"📊 Zoom distribution: {dict(zip(*[distribution, [distribution.count(t) for t in set(distribution)]]))} for {image_count} images")
@@ -1161,31 +1657,176 @@ def distribute_zoom_types(zoom_types: List[str], image_count: int) -> List[str]:
     return distribution
 
 
-def process_img2vid_batch(
+IMG2VID_COPY_WORKERS = 4  # Parallel S3 server-side copies for duplicate clips
+
+
+def find_duplicate_renders(images: List[Dict], zoom_distribution: List[str]) -> Dict[int, int]:
+    """
+    Map each duplicate image index to the first index rendering the same clip
+
+    Two clips are identical when image URL, duration and zoom match (fps is
+    shared by the whole batch).
+
+    Returns:
+        Dict of duplicate index → primary index (empty when all clips are unique)
+    """
+    primaries: Dict[tuple, int] = {}
+    duplicates: Dict[int, int] = {}
+    for i, img in enumerate(images):
+        key = (normalize_url(img['image_url']), float(img['duracao']), zoom_distribution[i])
+        if key in primaries:
+            duplicates[i] = primaries[key]
+        else:
+            primaries[key] = i
+
+    if duplicates:
+        logger.info(f"♻️ Dedupe: {len(duplicates)} duplicate clips → {len(images) - len(duplicates)} renders")
+    return duplicates
+
+
+def publish_img2vid_duplicate(
+    primary: Dict[str, Any],
+    image_id: str,
+    video_index: Optional[int],
+    path: Optional[str],
+    worker_id: Optional[str],
+    quality: str
+) -> Dict[str, Any]:
+    """Produce a duplicate clip from an already published one (S3 server-side copy)"""
+    output_filename = get_img2vid_filename(image_id, video_index)
+
+    if path:
+        s3_key = f"{path}{output_filename}"
+        video_url = copy_s3_object(S3_BUCKET_NAME, primary['s3_key'], s3_key)
+        return {
+            'id': str(video_index) if video_index is not None else image_id,
+            'video_url': video_url,
+            'filename': output_filename,
+            's3_key': s3_key,
+            'draft': quality == 'draft'
+        }
+
+    # HTTP mode: the primary file stays in OUTPUT_DIR
+    shutil.copyfile(OUTPUT_DIR / primary['filename'], OUTPUT_DIR / output_filename)
+    if worker_id:
+        video_url = f"https://{worker_id}-{HTTP_PORT}.proxy.runpod.net/{output_filename}"
+    else:
+        video_url = f"http://localhost:{HTTP_PORT}/{output_filename}"
+    return {
+        'id': str(video_index) if video_index is not None else image_id,
+        'video_url': video_url,
+        'filename': output_filename,
+        'draft': quality == 'draft'
+    }
+
+
+def plan_img2vid_tasks(images: List[Dict], pack_size: Optional[int] = None) -> tuple:
+    """
+    Group image indices into render tasks (one ffmpeg process each)
+
+    Short clips are packed K per process; long clips keep one process each.
+
+    Returns:
+        Tuple of (tasks as lists of image indices, pack size K)
+    """
+    short_indices = [i for i, img in enumerate(images) if float(img['duracao']) <= PACK_MAX_CLIP_DURATION]
+    k = choose_pack_size([float(images[i]['duracao']) for i in short_indices], BATCH_SIZE, pack_size)
+
+    if k <= 1:
+        return [[i] for i in range(len(images))], 1
+
+    packed = set(short_indices)
+    tasks = [short_indices[j:j + k] for j in range(0, len(short_indices), k)]
+    tasks += [[i] for i in range(len(images)) if i not in packed]
+    logger.info(f"📦 Multi-clip mode: {len(short_indices)} short clips packed {k} per process → {len(tasks)} ffmpeg processes")
+    return tasks, k
+
+
+def schedule_img2vid_tasks(
+    tasks: List[List[int]],
+    images: List[Dict],
+    zoom_distribution: List[str],
+    frame_rate: int,
+    profile: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Estimate per-clip render cost and order tasks longest-first
+
+    Source size is taken from the image entry (width/height) when the caller
+    knows it, otherwise the output size is assumed.
+    """
+    clip_costs = [
+        estimate_clip_cost(
+            img['duracao'], frame_rate, zoom_distribution[i], profile,
+            img.get('width'), img.get('height')
+        )
+        for i, img in enumerate(images)
+    ]
+    return schedule_tasks(tasks, clip_costs, BATCH_SIZE)
+
+
+def create_img2vid_controller() -> ConcurrencyController:
+    """Permit gate for img2vid render tasks (starts at BATCH_SIZE)"""
+    min_permits, max_permits = get_concurrency_bounds(BATCH_SIZE)
+    return ConcurrencyController(BATCH_SIZE, min_permits, max_permits, VCPU_COUNT, WORK_DIR)
+
+
+@contextmanager
+def placed_render(controller: ConcurrencyController):
+    """Lease a CPU set sized to the current concurrency (no-op unless CPU_PINNING=on)
+
+    The slot's upscale memory budget is sized for the controller's upper
+    bound, so all concurrent renders together stay within the planner's share.
+    Its thread budget is the leased CPU count, or vCPUs / the live permit
+    limit without pinning (packed renders split it between their encoders).
+
+    Downloads and uploads of the task move to the I/O CPU set only while
+    they run (io_pinned); the Pillow pre-shrink keeps all CPUs.
+    """
+    placer = get_placer()
+    _render_slot.memory_budget = memory_budget_per_slot(controller.max_permits)
+    try:
+        with placer.lease(placer.slot_size(controller.limit)) as cpus:
+            _render_slot.threads = len(cpus) if cpus else max(1, VCPU_COUNT // max(1, controller.limit))
+            yield cpus
+    finally:
+        _render_slot.memory_budget = None
+        _render_slot.threads = None
+
+
+def run_render_timed(func, *args):
+    """Call func(*args), return (result, seconds spent in its ffmpeg renders)
+
+    Downloads, pre-shrink and uploads are excluded, so the time is comparable
+    with the scheduler's render cost model.
+    """
+    _render_clock.seconds = 0.0
+    result = func(*args)
+    return result, _render_clock.seconds
+
+
+def iter_img2vid_batch(
     images: List[Dict],
     frame_rate: int = 24,
     zoom_types: List[str] = None,
     worker_id: str = None,
     path: str = None,
-    start_index: int = 0
-) -> Dict[str, Any]:
-    """Process images to videos with continuous parallel execution (optimized)
-
-    Uses a constant thread pool that keeps all workers busy continuously,
-    rather than processing in sequential batches. This maximizes hardware
-    utilization and eliminates idle time between batches.
+    start_index: int = 0,
+    quality: str = 'production',
+    pack_size: Optional[int] = None,
+    fail_fast: bool = True
+):
+    """Process images to videos, yielding each clip as soon as it is uploaded
+
+    Same rendering as process_img2vid_batch (continuous pool, packing, LPT order,
+    dedupe). Events, in completion order:
+        {"type": "clip", "index", "id", "video", "completed", "total"}
+        {"type": "failure", "index", "id", "error", "completed", "total"}  (fail_fast=False)
+        {"type": "summary", ...batch result..., "failures": [...]}  (always last)
 
     Args:
-        images: List of image dictionaries
-        frame_rate: Video frame rate (default: 24)
-        zoom_types: List of zoom types to distribute (e.g., ["zoomin", "zoomout"])
-        worker_id: Worker identifier
-        path: S3 path for uploads
-        start_index: Global start index for multi-worker scenarios (default: 0)
-
-    Performance improvement:
-        - Old: Sequential batches (waits for slowest image in each batch)
-        - New: Continuous parallel pool (no idle time, ~30% faster)
+        fail_fast: Raise on the first failed clip (True) or report it and keep
+            rendering the rest (False)
     """
     total = len(images)
     logger.info(f"🚀 Processing {total} images with {BATCH_SIZE} parallel workers (continuous pool), fps: {frame_rate}, start_index: {start_index}")
@@ -1201,15 +1842,32 @@ def process_img2vid_batch(
         zoom_distribution = ["zoomin"] * total  # Default
         logger.info(f"🎬 Using default zoom: zoomin for all {total} images")
 
-    # Use continuous thread pool (not sequential batches)
-    # This keeps all workers busy continuously without waiting for batch completion
-    results = [None] * total  # Pre-allocate to preserve order
+    # Render identical (image, duration, zoom) clips once, copy the rest
+    duplicates = find_duplicate_renders(images, zoom_distribution)
+    render_indices = [i for i in range(total) if i not in duplicates]
+    render_images = [images[i] for i in render_indices]
+    render_zooms = [zoom_distribution[i] for i in render_indices]
+
+    # Group short clips into packs of K (long clips keep one process each)
+    tasks, k = plan_img2vid_tasks(render_images, pack_size)
 
-    with ThreadPoolExecutor(max_workers=BATCH_SIZE) as executor:
-        # Submit ALL images at once - ThreadPoolExecutor handles queuing
-        future_to_index = {
-            executor.submit(
-                image_to_video,
+    # Longest tasks first (results are still stored by image index)
+    profile = get_render_profile(quality)
+    schedule = schedule_img2vid_tasks(
+        tasks, render_images, render_zooms, get_img2vid_frame_rate(frame_rate, profile), profile
+    )
+    tasks = [[render_indices[j] for j in indices] for indices in schedule['tasks']]
+    task_times = [0.0] * len(tasks)
+
+    def _render_task(indices: List[int]) -> List[Dict[str, Any]]:
+        with placed_render(controller):
+            return _render_clips(indices)
+
+    def _render_clips(indices: List[int]) -> List[Dict[str, Any]]:
+        if len(indices) == 1:
+            i = indices[0]
+            img = images[i]
+            return [image_to_video(
                 img['id'],
                 img['image_url'],
                 img['duracao'],
@@ -1217,108 +1875,442 @@ def process_img2vid_batch(
                 zoom_distribution[i],  # Assign zoom type from distribution
                 worker_id,
                 path,
-                start_index + i + 1  # video_index with global offset
-            ): i
-            for i, img in enumerate(images)
+                start_index + i + 1,  # video_index with global offset
+                quality
+            )]
+        return images_to_videos_packed(
+            [
+                {
+                    'image_id': images[i]['id'],
+                    'image_url': images[i]['image_url'],
+                    'duracao': images[i]['duracao'],
+                    'zoom_type': zoom_distribution[i],
+                    'video_index': start_index + i + 1
+                }
+                for i in indices
+            ],
+            frame_rate, worker_id, path, quality
+        )
+
+    # Use continuous thread pool (not sequential batches)
+    # This keeps all workers busy continuously without waiting for batch completion
+    results = [None] * total  # Pre-allocate to preserve order
+    failures = []
+    completed = 0
+
+    # Duplicates of each rendered clip (copied as soon as their primary is uploaded)
+    copies_of: Dict[int, List[int]] = {}
+    for i, primary in duplicates.items():
+        copies_of.setdefault(primary, []).append(i)
+
+    # Pool sized for the controller's upper bound; the controller gates how many render at once
+    controller = create_img2vid_controller()
+
+    start_render = time.time()
+    # Duplicate copies get their own small I/O pool: queued behind renders they'd wait for the whole batch
+    with controller, ThreadPoolExecutor(max_workers=controller.max_permits) as executor, \
+            ThreadPoolExecutor(max_workers=IMG2VID_COPY_WORKERS) as copy_executor:
+        # Submit ALL tasks at once in schedule order - ThreadPoolExecutor handles queuing
+        pending = {
+            executor.submit(controller.run, run_render_timed, _render_task, indices): ('render', t)
+            for t, indices in enumerate(tasks)
         }
 
-        logger.info(f"📋 Submitted all {total} tasks to thread pool")
+        logger.info(f"📋 Submitted all {len(tasks)} tasks to thread pool")
 
         # Process results as they complete (most efficient)
-        completed = 0
-        from concurrent.futures import as_completed
+        from concurrent.futures import wait, FIRST_COMPLETED
 
-        for future in as_completed(future_to_index):
-            index = future_to_index[future]
-            img = images[index]
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
 
-            try:
-                result = future.result()
-                results[index] = result  # Store in correct position
-                completed += 1
+            for future in done:
+                kind, ref = pending.pop(future)
+                indices = tasks[ref] if kind == 'render' else [ref]
 
-                # Log progress every 5 images or at key milestones
-                if completed % 5 == 0 or completed == total or completed == 1:
-                    progress_pct = (completed / total) * 100
-                    logger.info(f"✅ Progress: {completed}/{total} ({progress_pct:.0f}%) - Latest: {img['id']} → {result['filename']}")
+                try:
+                    if kind == 'render':
+                        task_results, task_times[ref] = future.result()
+                    else:
+                        task_results = [future.result()]
+                except Exception as e:
+                    ids = ', '.join(f"{i} ({images[i]['id']})" for i in indices)
+                    logger.error(f"❌ Failed to process image(s) {ids}: {e}")
+                    if fail_fast:
+                        raise
+
+                    # A failed render also fails its duplicates
+                    for index in indices + [d for i in indices for d in copies_of.get(i, [])]:
+                        completed += 1
+                        failures.append({'index': index, 'id': images[index]['id'], 'error': str(e)})
+                        yield {
+                            'type': 'failure',
+                            'index': index,
+                            'id': images[index]['id'],
+                            'error': str(e),
+                            'completed': completed,
+                            'total': total
+                        }
+                    continue
 
-            except Exception as e:
-                logger.error(f"❌ Failed to process image {index} ({img['id']}): {e}")
-                raise
+                for index, result in zip(indices, task_results):
+                    results[index] = result  # Store in correct position
+                    completed += 1
+
+                    # Server-side copies for duplicates of this clip
+                    for dup in copies_of.get(index, []):
+                        pending[copy_executor.submit(
+                            publish_img2vid_duplicate, result, images[dup]['id'],
+                            start_index + dup + 1, path, worker_id, quality
+                        )] = ('copy', dup)
+
+                    # Log progress every 5 images or at key milestones
+                    if completed % 5 == 0 or completed == total or completed == 1:
+                        progress_pct = (completed / total) * 100
+                        logger.info(f"✅ Progress: {completed}/{total} ({progress_pct:.0f}%) - Latest: {images[index]['id']} → {result['filename']}")
+
+                    yield {
+                        'type': 'clip',
+                        'index': index,
+                        'id': images[index]['id'],
+                        'video': result,
+                        'completed': completed,
+                        'total': total
+                    }
+
+    schedule_report = build_schedule_report(schedule, time.time() - start_render, task_times)
+
+    if duplicates:
+        logger.info(f"♻️ {len(duplicates)} duplicate clips copied ({len(duplicates)} renders saved)")
+
+    if failures:
+        logger.warning(f"⚠️ {len(failures)}/{total} images failed, {total - len(failures)} processed")
+    else:
+        logger.info(f"🎉 All {total} images processed successfully with continuous parallel pool")
+    logger.info(
+        f"🗓️ Makespan: predicted {schedule_report['predicted_makespan_s']}s, "
+        f"actual {schedule_report['actual_makespan_s']}s (calibration x{schedule_report['calibration_ratio']})"
+    )
 
-    logger.info(f"🎉 All {total} images processed successfully with continuous parallel pool")
+    # Failed clips are reported in "failures" only, so consumers never see null videos
+    videos = [r for r in results if r is not None]
 
-    return {
-        "message": "Images converted to videos successfully",
+    yield {
+        "type": "summary",
+        "message": "Images converted to videos successfully" if not failures else f"{len(failures)} of {total} images failed",
         "total": total,
-        "processed": len([r for r in results if r is not None]),
-        "videos": results
+        "processed": len(videos),
+        "videos": videos,
+        "failures": failures,
+        "pack_size": k,
+        "ffmpeg_processes": len(tasks),
+        "schedule": schedule_report,
+        "concurrency": controller.report(),
+        "cpu_placement": get_placer().report(),
+        "renders": len(render_indices),
+        "renders_saved": len(duplicates),
+        "quality": quality,
+        "draft": quality == 'draft'
     }
 
 
-def get_duration(file_path: Path) -> float:
-    """Get duration of media file using ffprobe with multiple fallback methods"""
+def process_img2vid_batch(
+    images: List[Dict],
+    frame_rate: int = 24,
+    zoom_types: List[str] = None,
+    worker_id: str = None,
+    path: str = None,
+    start_index: int = 0,
+    quality: str = 'production',
+    pack_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """Process images to videos with continuous parallel execution (optimized)
+
+    Uses a constant thread pool that keeps all workers busy continuously,
+    rather than processing in sequential batches. This maximizes hardware
+    utilization and eliminates idle time between batches.
+
+    Args:
+        images: List of image dictionaries
+        frame_rate: Video frame rate (default: 24)
+        zoom_types: List of zoom types to distribute (e.g., ["zoomin", "zoomout"])
+        worker_id: Worker identifier
+        path: S3 path for uploads
+        start_index: Global start index for multi-worker scenarios (default: 0)
+        quality: Render quality tier - "production" or "draft"
+        pack_size: Clips per ffmpeg process for short clips (None = auto, 1 = off)
+
+    Performance improvement:
+        - Old: Sequential batches (waits for slowest image in each batch)
+        - New: Continuous parallel pool (no idle time, ~30% faster)
+        - Short clips are packed K per ffmpeg process (start-up amortized)
+        - Tasks are submitted longest-first (LPT) so long clips never start last
+    """
+    summary = None
+    for event in iter_img2vid_batch(
+        images, frame_rate, zoom_types, worker_id, path, start_index, quality, pack_size, fail_fast=True
+    ):
+        if event['type'] == 'summary':
+            summary = event
+
+    summary.pop('type')
+    summary.pop('failures')
+    return summary
+
+
+def process_img2vid_timeline(
+    images: List[Dict],
+    path: str,
+    output_filename: str,
+    frame_rate: int = 24,
+    zoom_types: List[str] = None,
+    url_audio: str = None,
+    worker_id: str = None,
+    quality: str = 'production',
+    pack_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """Render images straight into ONE final video (no temp uploads, no second encode)
+
+    Segments are rendered in parallel with identical libx264 settings, so they
+    join with stream-copy concat. Optionally muxes an audio track.
+
+    Args:
+        images: List of image dictionaries (id, image_url, duracao)
+        path: S3 path for the final video
+        output_filename: Final video filename
+        frame_rate: Video frame rate (default: 24)
+        zoom_types: List of zoom types to distribute
+        url_audio: Optional audio URL muxed into the final video
+        worker_id: Worker identifier
+        quality: Render quality tier - "production" or "draft"
+        pack_size: Clips per ffmpeg process for short clips (None = auto, 1 = off)
+    """
+    profile = get_render_profile(quality)
+    frame_rate = get_img2vid_frame_rate(frame_rate, profile)
+    job_id = str(uuid.uuid4())
+    total = len(images)
+    logger.info(f"🎞️ Timeline render: {total} images → {output_filename} ({BATCH_SIZE} parallel workers, fps: {frame_rate})")
+
+    # Distribute zoom types proportionally and randomly
+    if zoom_types and len(zoom_types) > 0:
+        zoom_distribution = distribute_zoom_types(zoom_types, total)
+    else:
+        zoom_distribution = ["zoomin"] * total
+
+    # Frame-exact segment durations from cumulative boundaries (no drift over N clips)
+    segments = []
+    elapsed = 0.0
+    frames_done = 0
+    for i, img in enumerate(images):
+        elapsed += float(img['duracao'])
+        segment_frames = max(1, round(elapsed * frame_rate) - frames_done)
+        frames_done += segment_frames
+        segments.append({
+            'image_id': img['id'],
+            'image_url': img['image_url'],
+            'duracao': segment_frames / frame_rate,
+            'zoom_type': zoom_distribution[i],
+            'width': img.get('width'),
+            'height': img.get('height'),
+            'output_path': WORK_DIR / f"{job_id}_seg_{i:04d}.mp4"
+        })
+    total_duration = frames_done / frame_rate
+
+    # Identical segments are rendered once and listed repeatedly in the concat list
+    duplicates = find_duplicate_renders(segments, [seg['zoom_type'] for seg in segments])
+    for i, primary in duplicates.items():
+        segments[i]['output_path'] = segments[primary]['output_path']
+    render_indices = [i for i in range(total) if i not in duplicates]
+    render_segments = [segments[i] for i in render_indices]
+
+    concat_list_path = WORK_DIR / f"{job_id}_timeline.txt"
+    audio_path = WORK_DIR / f"{job_id}_audio.mp3" if url_audio else None
+    output_path = OUTPUT_DIR / output_filename
+
     try:
+        tasks, k = plan_img2vid_tasks(render_segments, pack_size)
+        schedule = schedule_img2vid_tasks(
+            tasks, render_segments, [seg['zoom_type'] for seg in render_segments], frame_rate, profile
+        )
+        tasks = [[render_indices[j] for j in indices] for indices in schedule['tasks']]
+        task_times = [0.0] * len(tasks)
+
+        def _render_task(indices: List[int]) -> None:
+            with placed_render(controller):
+                _render_clips(indices)
+
+        def _render_clips(indices: List[int]) -> None:
+            if len(indices) == 1:
+                seg = segments[indices[0]]
+                render_image_clip(
+                    seg['image_id'], seg['image_url'], seg['duracao'], frame_rate,
+                    seg['zoom_type'], seg['output_path'], profile
+                )
+            else:
+                render_image_clips_packed([segments[i] for i in indices], frame_rate, profile)
+
+        controller = create_img2vid_controller()
+
+        start_render = time.time()
+        with controller, ThreadPoolExecutor(max_workers=controller.max_permits + 1) as executor:
+            audio_future = executor.submit(download_file, url_audio, audio_path) if url_audio else None
+            future_to_task = {
+                executor.submit(controller.run, run_render_timed, _render_task, indices): t
+                for t, indices in enumerate(tasks)
+            }
+
+            completed = 0
+            from concurrent.futures import as_completed
+            for future in as_completed(future_to_task):
+                _, task_times[future_to_task[future]] = future.result()
+                completed += 1
+                if completed % 10 == 0 or completed == len(tasks):
+                    logger.info(f"✅ Render progress: {completed}/{len(tasks)} tasks")
+
+            if audio_future:
+                audio_future.result()
+
+        render_time = time.time() - start_render
+        schedule_report = build_schedule_report(schedule, render_time, task_times)
+        logger.info(f"✅ {len(render_indices)} segments rendered in {render_time:.2f}s ({len(tasks)} ffmpeg processes)")
+
+        # Join with stream copy (all segments share encoder settings, size and fps)
+        with open(concat_list_path, 'w', encoding='utf-8') as f:
+            for seg in segments:
+                abs_path = str(seg['output_path'].absolute()).replace('\\', '/')
+                f.write(f"file '{abs_path}'\n")
+
+        start_concat = time.time()
         cmd = [
-            'ffprobe',
-            '-v', 'quiet',
-            '-print_format', 'json',
-            '-show_format',
-            '-show_streams',
-            str(file_path)
+            'ffmpeg', '-y',
+            '-f', 'concat',
+            '-safe', '0',
+            '-i', str(concat_list_path)
         ]
+        if audio_path:
+            cmd.extend([
+                '-i', str(audio_path),
+                '-map', '0:v:0',
+                '-map', '1:a:0',
+                '-c:v', 'copy',              # No re-encoding!
+                '-c:a', 'aac',
+                '-b:a', '192k',
+                '-t', f"{total_duration:.6f}"  # Video timeline defines the length
+            ])
+        else:
+            cmd.extend(['-c:v', 'copy'])
+        cmd.extend([
+            '-movflags', '+faststart',
+            str(output_path)
+        ])
 
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        import json
-        metadata = json.loads(result.stdout)
+        logger.info(f"Running FFmpeg: {' '.join(cmd)}")
+        run_tracked(cmd, capture_output=True, text=True, check=True, stage='concat')
+        concat_time = time.time() - start_concat
 
-        # Try multiple methods to get duration
-        duration = None
+        if not output_path.exists() or output_path.stat().st_size == 0:
+            raise RuntimeError("FFmpeg produced empty output")
 
-        # Method 1: format.duration (most reliable for most files)
-        if 'format' in metadata and 'duration' in metadata['format']:
-            duration = float(metadata['format']['duration'])
-            logger.info(f"Duration from format.duration: {duration:.2f}s")
+        file_size_mb = output_path.stat().st_size / (1024 * 1024)
+        logger.info(f"✅ Timeline video: {output_filename} ({file_size_mb:.2f} MB, {total_duration:.2f}s, concat {concat_time:.2f}s)")
 
-        # Method 2: streams[0].duration (fallback for some audio files from Google Drive)
-        elif 'streams' in metadata and len(metadata['streams']) > 0:
-            if 'duration' in metadata['streams'][0]:
-                duration = float(metadata['streams'][0]['duration'])
-                logger.info(f"Duration from streams[0].duration: {duration:.2f}s")
+        # Upload to S3
+        if not path.endswith('/'):
+            path = path + '/'
+        s3_key = f"{path}{output_filename}"
+        video_url = upload_to_s3(output_path, S3_BUCKET_NAME, s3_key, get_draft_metadata(quality))
 
-        # Method 3: Calculate from bitrate and size (last resort)
-        if duration is None and 'format' in metadata:
-            if 'size' in metadata['format'] and 'bit_rate' in metadata['format']:
-                size_bytes = int(metadata['format']['size'])
-                bit_rate = int(metadata['format']['bit_rate'])
-                duration = (size_bytes * 8) / bit_rate
-                logger.info(f"Duration calculated from size/bitrate: {duration:.2f}s")
+        # Cleanup local file after S3 upload
+        output_path.unlink(missing_ok=True)
+
+        return {
+            'video_url': video_url,
+            'filename': output_filename,
+            's3_key': s3_key,
+            'total': total,
+            'duration': round(total_duration, 3),
+            'audio': bool(url_audio),
+            'pack_size': k,
+            'ffmpeg_processes': len(tasks) + 1,
+            'schedule': schedule_report,
+            'concurrency': controller.report(),
+            'cpu_placement': get_placer().report(),
+            'renders': len(render_indices),
+            'renders_saved': len(duplicates),
+            'render_time': round(render_time, 2),
+            'concat_time': round(concat_time, 2),
+            'quality': quality,
+            'draft': quality == 'draft'
+        }
+
+    except subprocess.CalledProcessError as e:
+        logger.error(f"FFmpeg error: {e.stderr}")
+        raise RuntimeError(f"FFmpeg failed: {e.stderr}")
+    finally:
+        for seg in segments:
+            seg['output_path'].unlink(missing_ok=True)
+        concat_list_path.unlink(missing_ok=True)
+        if audio_path:
+            audio_path.unlink(missing_ok=True)
+
+
+def probe_cached(file_path: Path) -> Dict[str, Any]:
+    """Full probe_media() result, cached in the metadata store by content hash"""
+    return get_store().get_or_compute(
+        'probe', file_digest(file_path), lambda: probe_media(file_path)
+    )
+
+
+def get_duration(file_path: Path) -> float:
+    """Get duration of media file (in-process probe with multiple fallback methods)"""
+    try:
+        metadata = probe_cached(file_path)
+
+        # format.duration → streams[0].duration → size/bitrate
+        duration = get_media_duration(metadata)
 
         if duration is None:
             # Dump metadata for debugging
-            logger.error(f"No duration found in metadata. Full metadata: {json.dumps(metadata, indent=2)}")
+            logger.error(f"No duration found in metadata. Full metadata: {metadata}")
             raise RuntimeError("No duration information available in media file metadata")
 
-        logger.info(f"✓ Duration of {file_path.name}: {duration:.2f}s")
+        logger.info(f"✓ Duration of {file_path.name}: {duration:.2f}s ({metadata['source']})")
         return duration
 
-    except subprocess.CalledProcessError as e:
-        logger.error(f"FFprobe command failed for {file_path}: {e.stderr}")
-        raise RuntimeError(f"FFprobe failed: {e.stderr}")
     except Exception as e:
         logger.error(f"Failed to get duration for {file_path}: {e}")
         raise RuntimeError(f"Failed to get media duration: {e}")
 
 
-def analyze_audio_volume(file_path: Path) -> float:
-    """Analyze audio volume using FFmpeg volumedetect and return mean volume in dB"""
+def analyze_audio_volume(file_path: Path, duration: float = None) -> float:
+    """Analyze audio volume and return mean volume in dB
+
+    Uses the NumPy engine (audio-only mono PCM pipe) when available,
+    FFmpeg volumedetect otherwise.
+    """
+    if NUMPY_AVAILABLE:
+        try:
+            key = params_digest(
+                file_digest(file_path),
+                audio_analysis.ANALYSIS_SAMPLE_RATE,
+                audio_analysis.ANALYSIS_WINDOWS,
+                audio_analysis.ANALYSIS_WINDOW_SECONDS
+            )
+            levels = get_store().get_or_compute(
+                'loudness', key, lambda: analyze_levels(file_path, duration),
+                version=source_version(audio_analysis)
+            )
+            return levels['mean_db']
+        except Exception as e:
+            logger.warning(f"NumPy audio analysis failed, falling back to volumedetect: {e}")
+
     try:
         cmd = [
-            'ffmpeg', '-i', str(file_path),
+            'ffmpeg', '-vn', '-i', str(file_path),
             '-af', 'volumedetect',
             '-f', 'null', '-'
         ]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+        result = run_tracked(cmd, capture_output=True, text=True, check=False, stage='analyze')
         output = result.stdout + result.stderr
 
         # Extract mean_volume from output
@@ -1335,6 +2327,52 @@ def analyze_audio_volume(file_path: Path) -> float:
         return -20.0  # Default fallback
 
 
+def analyze_trilha_volumes(
+    video_path: Path,
+    trilha_path: Path,
+    video_duration: float = None,
+    trilha_duration: float = None
+) -> tuple:
+    """Analyze video audio and trilha concurrently, returns (video_mean_db, trilha_mean_db)"""
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        video_future = executor.submit(analyze_audio_volume, video_path, video_duration)
+        trilha_future = executor.submit(analyze_audio_volume, trilha_path, trilha_duration)
+        video_mean_db = video_future.result()
+        trilha_mean_db = trilha_future.result()
+
+    logger.info(f"⏱️ Audio analysis: {time.time() - start:.2f}s")
+    return video_mean_db, trilha_mean_db
+
+
+# Video codecs that can be stream-copied into the MP4 output unchanged
+MP4_COPY_VIDEO_CODECS = {'h264', 'hevc', 'av1', 'vp9', 'mpeg4'}
+# TRILHA_VIDEO_COPY: "on" (default, audio-only remix) | "off" (always re-encode video)
+TRILHA_VIDEO_COPY = os.getenv('TRILHA_VIDEO_COPY', 'on').lower() in ('on', 'true', '1')
+
+
+def video_copy_config(video_path: Path, allowed: bool = True) -> Dict[str, Any]:
+    """
+    Encoder config that keeps the video stream as is (only the audio graph runs)
+
+    Used as the first entry of the trilha encoder lists: skipped when the
+    video codec can't go into MP4 unchanged, and a failed copy falls
+    through to the re-encoding configs.
+    """
+    stream = get_stream(probe_cached(video_path), 'video')
+    codec = stream.get('codec_name') if stream else None
+    skip = not (TRILHA_VIDEO_COPY and allowed and codec in MP4_COPY_VIDEO_CODECS)
+    if allowed and TRILHA_VIDEO_COPY and skip:
+        logger.info(f"🎞️ Video codec {codec} can't be stream-copied to MP4 - re-encoding")
+    return {
+        'name': 'copy',
+        'label': '📋 Video stream copy',
+        'skip': skip,
+        'hwaccel': [],
+        'video_args': ['-c:v', 'copy']
+    }
+
+
 def add_trilha_sonora(
     url_video: str,
     trilha_sonora_url: str,
@@ -1354,6 +2392,7 @@ def add_trilha_sonora(
     video_path = WORK_DIR / f"{job_id}_video.mp4"
     trilha_path = WORK_DIR / f"{job_id}_trilha.mp3"
     output_path = OUTPUT_DIR / output_filename
+    loop_files: List[Path] = []  # Crossfaded loop units (TRILHA_CROSSFADE)
 
     try:
         # Download video and soundtrack
@@ -1377,8 +2416,9 @@ def add_trilha_sonora(
         # Analyze volumes and calculate optimal reduction
         if volume_reduction_db is None:
             logger.info("🔊 Analyzing audio levels for automatic normalization...")
-            video_mean_db = analyze_audio_volume(video_path)
-            trilha_mean_db = analyze_audio_volume(trilha_path)
+            video_mean_db, trilha_mean_db = analyze_trilha_volumes(
+                video_path, trilha_path, video_duration, trilha_duration
+            )
 
             # Calculate reduction needed to make trilha 20dB below video
             # Formula: reduction = trilha_current - (video_current - 20)
@@ -1402,18 +2442,17 @@ def add_trilha_sonora(
         logger.info(f"🔁 Trilha will be looped {loops_needed} times to match video duration")
 
         # Build FFmpeg filter complex:
-        # 1. Loop the soundtrack audio (aloop filter)
+        # 1. Loop the soundtrack audio (-stream_loop, or aloop filter)
         # 2. Reduce soundtrack volume
         # 3. Mix original video audio with looped/reduced soundtrack
         # 4. Cut to video duration
-        filter_complex = (
-            f"[1:a]aloop=loop={loops_needed}:size=2e+09[loop];"  # Loop soundtrack (size=2e+09 for safety)
-            f"[loop]volume=-{volume_reduction_db}dB[reduced];"   # Reduce volume
-            f"[0:a][reduced]amix=inputs=2:duration=first[aout]"  # Mix original + reduced soundtrack
+        trilha_input, filter_complex, loop_files, loop_mode = build_trilha_mix(
+            trilha_path, trilha_duration, loops_needed, volume_reduction_db
         )
 
-        # FFmpeg command with automatic GPU/CPU fallback
+        # FFmpeg command: audio-only remix (video copied), then automatic GPU/CPU fallback
         encoder_configs = [
+            video_copy_config(video_path),
             {
                 'name': 'h264_nvenc',
                 'label': '🎮 GPU (NVENC)',
@@ -1452,7 +2491,9 @@ def add_trilha_sonora(
                 cmd.extend(config['hwaccel'])
                 cmd.extend([
                     '-i', str(video_path),     # Input 0: video with original audio
-                    '-i', str(trilha_path),    # Input 1: trilha sonora
+                ])
+                cmd.extend(trilha_input)       # Input 1: trilha sonora (looped)
+                cmd.extend([
                     '-filter_complex', filter_complex,
                     '-map', '0:v',             # Map video
                     '-map', '[aout]'           # Map mixed audio
@@ -1466,7 +2507,7 @@ def add_trilha_sonora(
                     str(output_path)
                 ])
 
-                result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+                result = run_tracked(cmd, capture_output=True, text=True, check=True)
                 logger.info(f"✅ {config['label']} trilha sonora encoding successful")
                 encoder_used = config['name']
                 break  # Success - exit loop
@@ -1475,6 +2516,11 @@ def add_trilha_sonora(
                 last_error = e
                 stderr_lower = e.stderr.lower()
 
+                # Container/codec rejected the copied stream: re-encode instead
+                if config['name'] == 'copy':
+                    logger.warning(f"⚠️ {config['label']} failed, re-encoding video: {e.stderr[-200:]}")
+                    continue
+
                 # Check if it's a GPU-specific error
                 if config['name'] == 'h264_nvenc' and any(
                     err in stderr_lower for err in [
@@ -1516,6 +2562,7 @@ def add_trilha_sonora(
             'video_duration': video_duration,
             'trilha_duration': trilha_duration,
             'loops_applied': loops_needed,
+            'loop_mode': loop_mode,
             'volume_reduction_db': round(volume_reduction_db, 2),
             'gpu_accelerated': encoder_used == 'h264_nvenc',
             'encoder': encoder_used
@@ -1545,6 +2592,8 @@ def add_trilha_sonora(
         # Cleanup input files
         video_path.unlink(missing_ok=True)
         trilha_path.unlink(missing_ok=True)
+        for loop_file in loop_files:
+            loop_file.unlink(missing_ok=True)
 
 
 def add_trilha_sonora_gpu(
@@ -1553,20 +2602,26 @@ def add_trilha_sonora_gpu(
     path: str,
     output_filename: str,
     volume_reduction_db: float = None,
-    worker_id: str = None
+    worker_id: str = None,
+    quality: str = 'production'
 ) -> Dict[str, Any]:
     """Add background music (trilha sonora) to video with GPU-accelerated encoding (NVENC)
 
     Automatically normalizes trilha volume to be 20dB below video audio for optimal mixing.
     Uses h264_nvenc for 3-4x faster encoding compared to CPU version.
+    Only the audio changes, so the video stream is copied whenever the codec
+    fits in MP4 (encoder="copy"); encoding is the fallback.
     If volume_reduction_db is provided, uses that value instead of auto-calculation.
+    quality="draft" renders a 540p/15fps ultrafast preview.
     """
+    profile = get_render_profile(quality)
     job_id = str(uuid.uuid4())
     logger.info(f"Starting GPU trilha sonora job: {job_id}")
 
     video_path = WORK_DIR / f"{job_id}_video.mp4"
     trilha_path = WORK_DIR / f"{job_id}_trilha.mp3"
     output_path = OUTPUT_DIR / output_filename
+    loop_files: List[Path] = []  # Crossfaded loop units (TRILHA_CROSSFADE)
 
     try:
         # Download video and soundtrack
@@ -1590,8 +2645,9 @@ def add_trilha_sonora_gpu(
         # Analyze volumes and calculate optimal reduction
         if volume_reduction_db is None:
             logger.info("🔊 Analyzing audio levels for automatic normalization...")
-            video_mean_db = analyze_audio_volume(video_path)
-            trilha_mean_db = analyze_audio_volume(trilha_path)
+            video_mean_db, trilha_mean_db = analyze_trilha_volumes(
+                video_path, trilha_path, video_duration, trilha_duration
+            )
 
             # Calculate reduction needed to make trilha 20dB below video
             target_offset = 20.0
@@ -1613,22 +2669,30 @@ def add_trilha_sonora_gpu(
         logger.info(f"🔁 Trilha will be looped {loops_needed} times to match video duration")
 
         # Build FFmpeg filter complex (same audio processing for both encoders)
-        filter_complex = (
-            f"[1:a]aloop=loop={loops_needed}:size=2e+09[loop];"
-            f"[loop]volume=-{volume_reduction_db}dB[reduced];"
-            f"[0:a][reduced]amix=inputs=2:duration=first[aout]"
+        trilha_input, filter_complex, loop_files, loop_mode = build_trilha_mix(
+            trilha_path, trilha_duration, loops_needed, volume_reduction_db
         )
 
-        # FFmpeg command with automatic GPU/CPU fallback
+        # Draft: CPU-side downscale + fps cap (incompatible with CUDA frames output)
+        if quality == 'draft':
+            draft_args = ['-vf', f"scale={profile['width']}:{profile['height']},fps={profile['max_fps']}"]
+            nvenc_hwaccel = []
+        else:
+            draft_args = []
+            nvenc_hwaccel = ['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda']
+
+        # FFmpeg command: audio-only remix (video copied, not for draft downscale),
+        # then automatic GPU/CPU fallback
         encoder_configs = [
+            video_copy_config(video_path, allowed=quality != 'draft'),
             {
                 'name': 'h264_nvenc',
                 'label': '🎮 GPU (NVENC)',
                 'skip': not GPU_AVAILABLE,
-                'hwaccel': ['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda'],
-                'video_args': [
-                    '-c:v', 'h264_nvenc', '-preset', 'p4', '-tune', 'hq',
-                    '-rc', 'vbr', '-cq', '23', '-b:v', '5M',
+                'hwaccel': nvenc_hwaccel,
+                'video_args': draft_args + [
+                    '-c:v', 'h264_nvenc', '-preset', profile['nvenc_preset'], '-tune', 'hq',
+                    '-rc', 'vbr', '-cq', str(profile['crf']), '-b:v', '5M',
                     '-maxrate', '10M', '-bufsize', '20M', '-profile:v', 'high'
                 ]
             },
@@ -1637,8 +2701,8 @@ def add_trilha_sonora_gpu(
                 'label': '💻 CPU (libx264)',
                 'skip': False,
                 'hwaccel': [],
-                'video_args': [
-                    '-c:v', 'libx264', '-preset', 'medium', '-crf', '23',
+                'video_args': draft_args + [
+                    '-c:v', 'libx264', '-preset', profile['x264_preset'], '-crf', str(profile['crf']),
                     '-maxrate', '10M', '-bufsize', '20M'
                 ]
             }
@@ -1659,7 +2723,9 @@ def add_trilha_sonora_gpu(
                 cmd.extend(config['hwaccel'])  # Add hwaccel args (empty for CPU)
                 cmd.extend([
                     '-i', str(video_path),     # Input 0: video
-                    '-i', str(trilha_path),    # Input 1: trilha sonora
+                ])
+                cmd.extend(trilha_input)       # Input 1: trilha sonora (looped)
+                cmd.extend([
                     '-filter_complex', filter_complex,
                     '-map', '0:v',             # Map video
                     '-map', '[aout]'           # Map mixed audio
@@ -1673,7 +2739,7 @@ def add_trilha_sonora_gpu(
                     str(output_path)
                 ])
 
-                result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+                result = run_tracked(cmd, capture_output=True, text=True, check=True)
                 logger.info(f"✅ {config['label']} trilha sonora encoding successful")
                 encoder_used = config['name']
                 break  # Success - exit loop
@@ -1682,6 +2748,11 @@ def add_trilha_sonora_gpu(
                 last_error = e
                 stderr_lower = e.stderr.lower()
 
+                # Container/codec rejected the copied stream: re-encode instead
+                if config['name'] == 'copy':
+                    logger.warning(f"⚠️ {config['label']} failed, re-encoding video: {e.stderr[-200:]}")
+                    continue
+
                 # Check if it's a GPU-specific error
                 if config['name'] == 'h264_nvenc' and any(
                     err in stderr_lower for err in [
@@ -1712,7 +2783,7 @@ def add_trilha_sonora_gpu(
 
         # Upload to S3
         s3_key = f"{path}{output_filename}"
-        video_url = upload_to_s3(output_path, S3_BUCKET_NAME, s3_key)
+        video_url = upload_to_s3(output_path, S3_BUCKET_NAME, s3_key, get_draft_metadata(quality))
 
         # Cleanup local files
         output_path.unlink(missing_ok=True)
@@ -1724,9 +2795,11 @@ def add_trilha_sonora_gpu(
             'video_duration': video_duration,
             'trilha_duration': trilha_duration,
             'loops_applied': loops_needed,
+            'loop_mode': loop_mode,
             'volume_reduction_db': round(volume_reduction_db, 2),
             'gpu_accelerated': encoder_used == 'h264_nvenc',
-            'encoder': encoder_used
+            'encoder': encoder_used,
+            'draft': quality == 'draft'
         }
 
         # Add audio analysis info if auto-normalization was used
@@ -1753,6 +2826,35 @@ def add_trilha_sonora_gpu(
         # Cleanup input files
         video_path.unlink(missing_ok=True)
         trilha_path.unlink(missing_ok=True)
+        for loop_file in loop_files:
+            loop_file.unlink(missing_ok=True)
+
+
+# Seconds of video retime encode per second of video: seed guesses, used until
+# this process has measured a retime (serverless workers often never do)
+RETIME_COST_PER_SECOND = {'gpu': 0.1, 'cpu': 0.6}
+_measured_retime_cost: Dict[str, float] = {}
+
+
+def choose_audio_sync(video_duration: float, audio_duration: float, mode: str = ADDAUDIO_SYNC) -> Dict[str, Any]:
+    """
+    Cheapest correct way to fit the audio to the video
+
+    - copy: durations match within ADDAUDIO_COPY_TOLERANCE → video stream copied
+    - atempo: audio speed change within ±ADDAUDIO_ATEMPO_MAX_DEVIATION → video copied,
+      audio time-stretched (pitch preserved) to the video duration
+    - retime: video re-encoded with setpts to the audio duration
+
+    Returns:
+        Dict with strategy and atempo (audio speed factor, None unless atempo)
+    """
+    if mode != 'retime':
+        if abs(video_duration - audio_duration) <= ADDAUDIO_COPY_TOLERANCE:
+            return {'strategy': 'copy', 'atempo': None}
+        atempo = audio_duration / video_duration
+        if abs(atempo - 1) <= ADDAUDIO_ATEMPO_MAX_DEVIATION:
+            return {'strategy': 'atempo', 'atempo': atempo}
+    return {'strategy': 'retime', 'atempo': None}
 
 
 def add_audio(
@@ -1760,9 +2862,13 @@ def add_audio(
     url_audio: str,
     path: str,
     output_filename: str,
-    worker_id: str = None
+    worker_id: str = None,
+    chunked: Optional[bool] = None
 ) -> Dict[str, Any]:
-    """Add audio to video and upload to S3"""
+    """Add audio to video and upload to S3
+
+    chunked: Segment-parallel libx264 retime on/off (None = auto for long videos on CPU)
+    """
     video_id = str(uuid.uuid4())
     logger.info(f"Starting audio job: {video_id}")
 
@@ -1787,85 +2893,134 @@ def add_audio(
 
         logger.info(f"Speed adjustment: {speed_factor:.3f}x (pts={pts_multiplier:.6f})")
 
-        # FFmpeg with automatic GPU/CPU fallback
-        # Note: CPU decode → CPU filter (setpts) → GPU/CPU encode
-        # We don't use -hwaccel cuda because setpts filter is CPU-only
-        encoder_configs = [
-            {'name': 'h264_nvenc', 'label': '🎮 GPU (NVENC)', 'skip': not GPU_AVAILABLE},
-            {'name': 'libx264', 'label': '💻 CPU (libx264)', 'skip': False}
-        ]
-
-        last_error = None
-        for config in encoder_configs:
-            if config['skip']:
-                logger.info(f"⏭️ Skipping {config['label']} (not available)")
-                continue
+        sync = choose_audio_sync(video_duration, audio_duration)
+        start_encode = time.time()
 
-            if config['name'] == 'h264_nvenc':
-                cmd = [
-                    'ffmpeg', '-y',
-                    '-i', str(video_path),
-                    '-i', str(audio_path),
-                    '-filter_complex', f'[0:v]setpts={pts_multiplier:.6f}*PTS[vout]',
-                    '-map', '[vout]',
-                    '-map', '1:a',
-                    '-c:v', 'h264_nvenc',
-                    '-preset', 'p4',
-                    '-tune', 'hq',
-                    '-rc:v', 'vbr',
-                    '-cq:v', '23',
-                    '-b:v', '0',
-                    '-maxrate', '10M',
-                    '-bufsize', '20M',
-                    '-c:a', 'aac',
-                    '-b:a', '192k',
-                    '-shortest',
-                    '-movflags', '+faststart',
-                    str(output_path)
-                ]
-            else:  # libx264
-                cmd = [
-                    'ffmpeg', '-y',
-                    '-i', str(video_path),
-                    '-i', str(audio_path),
-                    '-filter_complex', f'[0:v]setpts={pts_multiplier:.6f}*PTS[vout]',
-                    '-map', '[vout]',
-                    '-map', '1:a',
-                    '-c:v', 'libx264',
-                    '-preset', 'medium',
-                    '-crf', '23',
-                    '-maxrate', '10M',
-                    '-bufsize', '20M',
-                    '-c:a', 'aac',
-                    '-b:a', '192k',
-                    '-shortest',
-                    '-movflags', '+faststart',
-                    str(output_path)
-                ]
+        # Copy / atempo: video stream is copied, only the audio is encoded
+        if sync['strategy'] != 'retime':
+            audio_filter = ['-filter:a', f"atempo={sync['atempo']:.6f}"] if sync['atempo'] else []
+            cmd = [
+                'ffmpeg', '-y',
+                '-i', str(video_path),
+                '-i', str(audio_path),
+                '-map', '0:v:0',
+                '-map', '1:a:0',
+                '-c:v', 'copy'
+            ] + audio_filter + [
+                '-c:a', 'aac',
+                '-b:a', '192k',
+                '-shortest',
+                '-movflags', '+faststart',
+                str(output_path)
+            ]
+            try:
+                audio_label = f", audio {sync['atempo']:.4f}x" if sync['atempo'] else ''
+                logger.info(f"📋 Video stream copy ({sync['strategy']}{audio_label})")
+                run_tracked(cmd, capture_output=True, text=True, check=True, timeout=3600)
+            except subprocess.CalledProcessError as e:
+                logger.warning(f"⚠️ Stream-copy {sync['strategy']} failed, retiming video: {e.stderr[-200:]}")
+                sync = {'strategy': 'retime', 'atempo': None}
+                start_encode = time.time()
 
+        # Chunked mode: retime keyframe-aligned segments in parallel, encode audio once
+        encode_stats = {'chunked': False}
+        if sync['strategy'] == 'retime' and should_use_chunked(video_duration, chunked, GPU_AVAILABLE, VCPU_COUNT):
             try:
-                logger.info(f"🎬 {config['label']} encoding")
-                logger.debug(f"Command: {' '.join(cmd)}")
-                result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=3600)
-                logger.info(f"✅ {config['label']} encoding successful")
-                break
+                encode_stats = encode_segments_parallel(
+                    input_path=video_path,
+                    output_path=output_path,
+                    work_dir=WORK_DIR / f"{video_id}_chunks",
+                    video_args=get_libx264_args(),
+                    vcpus=VCPU_COUNT,
+                    pts_factor=pts_multiplier,
+                    audio_path=audio_path,
+                    audio_args=['-c:a', 'aac', '-b:a', '192k'],
+                    extra_output_args=['-shortest']
+                )
+            except (subprocess.CalledProcessError, RuntimeError) as e:
+                stderr = getattr(e, 'stderr', None) or str(e)
+                logger.warning(f"⚠️ Chunked encoding failed, falling back to single process: {stderr[:200]}")
+
+        if sync['strategy'] == 'retime' and not encode_stats['chunked']:
+            # FFmpeg with automatic GPU/CPU fallback
+            # Note: CPU decode → CPU filter (setpts) → GPU/CPU encode
+            # We don't use -hwaccel cuda because setpts filter is CPU-only
+            encoder_configs = [
+                {'name': 'h264_nvenc', 'label': '🎮 GPU (NVENC)', 'skip': not GPU_AVAILABLE},
+                {'name': 'libx264', 'label': '💻 CPU (libx264)', 'skip': False}
+            ]
+
+            last_error = None
+            for config in encoder_configs:
+                if config['skip']:
+                    logger.info(f"⏭️ Skipping {config['label']} (not available)")
+                    continue
 
-            except subprocess.CalledProcessError as e:
                 if config['name'] == 'h264_nvenc':
-                    stderr_lower = e.stderr.lower()
-                    if any(err in stderr_lower for err in ['no capable devices', 'unsupported device', 'nvenc']):
-                        logger.warning(f"⚠️ {config['label']} failed (GPU issue)")
-                        logger.warning(f"Error: {e.stderr[:200]}")
-                        logger.info("🔄 Falling back to CPU encoding...")
-                        last_error = e
-                        continue
-                logger.error(f"❌ {config['label']} encoding failed")
-                raise RuntimeError(f"FFmpeg {config['name']} failed: {e.stderr}")
-        else:
-            if last_error:
-                raise RuntimeError(f"All encoding attempts failed. Last error: {last_error.stderr}")
+                    cmd = [
+                        'ffmpeg', '-y',
+                        '-i', str(video_path),
+                        '-i', str(audio_path),
+                        '-filter_complex', f'[0:v]setpts={pts_multiplier:.6f}*PTS[vout]',
+                        '-map', '[vout]',
+                        '-map', '1:a',
+                        '-c:v', 'h264_nvenc',
+                        '-preset', 'p4',
+                        '-tune', 'hq',
+                        '-rc:v', 'vbr',
+                        '-cq:v', '23',
+                        '-b:v', '0',
+                        '-maxrate', '10M',
+                        '-bufsize', '20M',
+                        '-c:a', 'aac',
+                        '-b:a', '192k',
+                        '-shortest',
+                        '-movflags', '+faststart',
+                        str(output_path)
+                    ]
+                else:  # libx264
+                    cmd = [
+                        'ffmpeg', '-y',
+                        '-i', str(video_path),
+                        '-i', str(audio_path),
+                        '-filter_complex', f'[0:v]setpts={pts_multiplier:.6f}*PTS[vout]',
+                        '-map', '[vout]',
+                        '-map', '1:a',
+                        '-c:v', 'libx264',
+                        '-preset', 'medium',
+                        '-crf', '23',
+                        '-maxrate', '10M',
+                        '-bufsize', '20M',
+                        '-c:a', 'aac',
+                        '-b:a', '192k',
+                        '-shortest',
+                        '-movflags', '+faststart',
+                        str(output_path)
+                    ]
+
+                try:
+                    logger.info(f"🎬 {config['label']} encoding")
+                    logger.debug(f"Command: {' '.join(cmd)}")
+                    result = run_tracked(cmd, capture_output=True, text=True, check=True, timeout=3600)
+                    logger.info(f"✅ {config['label']} encoding successful")
+                    break
+
+                except subprocess.CalledProcessError as e:
+                    if config['name'] == 'h264_nvenc':
+                        stderr_lower = e.stderr.lower()
+                        if any(err in stderr_lower for err in ['no capable devices', 'unsupported device', 'nvenc']):
+                            logger.warning(f"⚠️ {config['label']} failed (GPU issue)")
+                            logger.warning(f"Error: {e.stderr[:200]}")
+                            logger.info("🔄 Falling back to CPU encoding...")
+                            last_error = e
+                            continue
+                    logger.error(f"❌ {config['label']} encoding failed")
+                    raise RuntimeError(f"FFmpeg {config['name']} failed: {e.stderr}")
             else:
-                raise RuntimeError("No encoders available")
+                if last_error:
+                    raise RuntimeError(f"All encoding attempts failed. Last error: {last_error.stderr}")
+                else:
+                    raise RuntimeError("No encoders available")
 
         if not output_path.exists() or output_path.stat().st_size == 0:
             raise RuntimeError("FFmpeg produced empty output")
@@ -1873,6 +3028,29 @@ def add_audio(
         file_size_mb = output_path.stat().st_size / (1024 * 1024)
         logger.info(f"✅ Audio added: {output_filename} ({file_size_mb:.2f} MB)")
 
+        # Time saved vs a video retime: an estimate, from this process's measured
+        # retime speed if it has done one, else the seed rate
+        encode_time = time.time() - start_encode
+        rate_key = 'gpu' if GPU_AVAILABLE else 'cpu'
+        if sync['strategy'] == 'retime':
+            measured = encode_time / video_duration
+            previous = _measured_retime_cost.get(rate_key)
+            _measured_retime_cost[rate_key] = measured if previous is None else 0.7 * previous + 0.3 * measured
+        rate_source = 'measured' if rate_key in _measured_retime_cost else 'seed'
+        retime_estimate = _measured_retime_cost.get(rate_key, RETIME_COST_PER_SECOND[rate_key]) * video_duration
+        sync.update({
+            'encode_time_s': round(encode_time, 2),
+            'retime_estimate_s': round(retime_estimate, 2),
+            'time_saved_estimate_s': (
+                round(max(0.0, retime_estimate - encode_time), 2) if sync['strategy'] != 'retime' else 0.0
+            ),
+            'retime_rate_source': rate_source
+        })
+        logger.info(
+            f"⏱️ Sync {sync['strategy']}: {encode_time:.2f}s "
+            f"(retime ≈ {retime_estimate:.2f}s from {rate_source} rate, saved ≈ {sync['time_saved_estimate_s']:.2f}s)"
+        )
+
         # Upload to S3
         # S3 key: {path}{filename} (path already includes /videos/)
         s3_key = f"{path}{output_filename}"
@@ -1884,8 +3062,11 @@ def add_audio(
         return {
             'video_url': video_url,
             'filename': output_filename,
-            'speed_factor': round(speed_factor, 3),
-            's3_key': s3_key
+            # Video speed actually applied (copy/atempo keep the video as is; audio factor in sync.atempo)
+            'speed_factor': round(speed_factor, 3) if sync['strategy'] == 'retime' else 1.0,
+            's3_key': s3_key,
+            'encode': encode_stats,
+            'sync': sync
         }
 
     except subprocess.CalledProcessError as e:
@@ -1901,15 +3082,20 @@ def concatenate_videos(
     video_urls: List[Dict[str, str]],
     path: str,
     output_filename: str,
-    worker_id: str = None
+    worker_id: str = None,
+    chunked: Optional[bool] = None
 ) -> Dict[str, Any]:
     """Concatenate multiple videos into one and upload to S3
 
+    Inputs with identical stream parameters are joined with -c copy; otherwise
+    they are re-encoded (chunked or single process).
+
     Args:
         video_urls: List of video dictionaries with 'video_url' key
         path: S3 path for upload
         output_filename: Output filename
         worker_id: Worker identifier (optional)
+        chunked: Encode inputs in parallel + stream-copy join (None = auto for long videos on CPU)
     """
     job_id = str(uuid.uuid4())
     logger.info(f"Starting concatenate job: {job_id} ({len(video_urls)} videos)")
@@ -1938,82 +3124,124 @@ def concatenate_videos(
 
         logger.info(f"Generated concat list with {len(input_files)} files")
 
-        # FFmpeg concat command with automatic GPU/CPU fallback
-        # Use concat demuxer with re-encoding
-        # This works when videos have different specs
-        encoder_configs = [
-            {
-                'name': 'h264_nvenc',
-                'label': '🎮 GPU (NVENC)',
-                'skip': not GPU_AVAILABLE,
-                'args': [
-                    '-c:v', 'h264_nvenc', '-preset', 'p4', '-tune', 'hq',
-                    '-rc:v', 'vbr', '-cq:v', '23', '-b:v', '0',
-                    '-maxrate', '10M', '-bufsize', '20M'
-                ]
-            },
-            {
-                'name': 'libx264',
-                'label': '💻 CPU (libx264)',
-                'skip': False,
-                'args': [
-                    '-c:v', 'libx264', '-preset', 'medium', '-crf', '23',
-                    '-maxrate', '10M', '-bufsize', '20M'
-                ]
-            }
-        ]
-
-        last_error = None
-        for config in encoder_configs:
-            if config['skip']:
-                logger.info(f"⏭️ Skipping {config['label']} (not available)")
-                continue
-
-            try:
-                logger.info(f"🎬 {config['label']} concatenation: {output_filename}")
-
-                cmd = [
-                    'ffmpeg', '-y',
-                    '-f', 'concat',
-                    '-safe', '0',
-                    '-i', str(concat_list_path)
-                ]
-                cmd.extend(config['args'])
-                cmd.extend([
-                    '-c:a', 'aac',
-                    '-b:a', '192k',
-                    '-movflags', '+faststart',
-                    str(output_path)
-                ])
-
-                result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-                logger.info(f"✅ {config['label']} concatenation successful")
-                break  # Success - exit loop
-
-            except subprocess.CalledProcessError as e:
-                last_error = e
-                stderr_lower = e.stderr.lower()
+        # Copy path: identical codec parameters (incl. SPS/PPS) → join without re-encoding
+        concat_path = 'reencode'
+        compat = None
+        if STREAM_COPY_CONCAT:
+            compat = analyze_concat_compat([probe_cached(input_file) for input_file in input_files])
+            if compat['compatible']:
+                try:
+                    logger.info(f"📋 Stream-copy concatenation: {output_filename}")
+                    cmd = [
+                        'ffmpeg', '-y',
+                        '-f', 'concat',
+                        '-safe', '0',
+                        '-i', str(concat_list_path),
+                        '-c', 'copy',
+                        '-movflags', '+faststart',
+                        str(output_path)
+                    ]
+                    run_tracked(cmd, capture_output=True, text=True, check=True, stage='concat')
+                    concat_path = 'copy'
+                except subprocess.CalledProcessError as e:
+                    logger.warning(f"⚠️ Stream-copy concatenation failed, re-encoding: {e.stderr[-200:]}")
+
+        # Chunked mode: encode each input in parallel, join with stream copy
+        encode_stats = {'chunked': False}
+        if concat_path != 'copy' and chunked is not False:
+            total_duration = sum(get_duration(input_file) for input_file in input_files)
+            if should_use_chunked(total_duration, chunked, GPU_AVAILABLE, VCPU_COUNT):
+                try:
+                    encode_stats = concat_inputs_parallel(
+                        input_paths=input_files,
+                        output_path=output_path,
+                        work_dir=WORK_DIR / f"{job_id}_chunks",
+                        video_args=get_libx264_args(),
+                        vcpus=VCPU_COUNT
+                    )
+                except (subprocess.CalledProcessError, RuntimeError) as e:
+                    stderr = getattr(e, 'stderr', None) or str(e)
+                    logger.warning(f"⚠️ Chunked concatenation failed, falling back to single process: {stderr[:200]}")
+
+        if encode_stats['chunked']:
+            concat_path = 'chunked'
+        elif concat_path != 'copy':
+            # FFmpeg concat command with automatic GPU/CPU fallback
+            # Use concat demuxer with re-encoding
+            # This works when videos have different specs
+            encoder_configs = [
+                {
+                    'name': 'h264_nvenc',
+                    'label': '🎮 GPU (NVENC)',
+                    'skip': not GPU_AVAILABLE,
+                    'args': [
+                        '-c:v', 'h264_nvenc', '-preset', 'p4', '-tune', 'hq',
+                        '-rc:v', 'vbr', '-cq:v', '23', '-b:v', '0',
+                        '-maxrate', '10M', '-bufsize', '20M'
+                    ]
+                },
+                {
+                    'name': 'libx264',
+                    'label': '💻 CPU (libx264)',
+                    'skip': False,
+                    'args': [
+                        '-c:v', 'libx264', '-preset', 'medium', '-crf', '23',
+                        '-maxrate', '10M', '-bufsize', '20M'
+                    ]
+                }
+            ]
 
-                # Check if it's a GPU-specific error
-                if config['name'] == 'h264_nvenc' and any(
-                    err in stderr_lower for err in [
-                        'no capable devices',
-                        'unsupported device',
-                        'nvenc',
-                        'cannot load',
-                        'driver'
+            last_error = None
+            for config in encoder_configs:
+                if config['skip']:
+                    logger.info(f"⏭️ Skipping {config['label']} (not available)")
+                    continue
+
+                try:
+                    logger.info(f"🎬 {config['label']} concatenation: {output_filename}")
+
+                    cmd = [
+                        'ffmpeg', '-y',
+                        '-f', 'concat',
+                        '-safe', '0',
+                        '-i', str(concat_list_path)
                     ]
-                ):
-                    logger.warning(f"⚠️ {config['label']} failed (GPU issue)")
-                    logger.info("🔄 Falling back to CPU encoding...")
-                    continue  # Try next encoder
-                else:
-                    # Non-GPU error or last encoder failed
-                    logger.error(f"FFmpeg {config['name']} failed: {e.stderr}")
-                    raise RuntimeError(f"FFmpeg {config['name']} failed: {e.stderr}")
-        else:
-            # Loop completed without break - all encoders failed
-            raise RuntimeError(f"All encoding attempts failed: {last_error.stderr if last_error else 'Unknown error'}")
+                    cmd.extend(config['args'])
+                    cmd.extend([
+                        '-c:a', 'aac',
+                        '-b:a', '192k',
+                        '-movflags', '+faststart',
+                        str(output_path)
+                    ])
+
+                    result = run_tracked(cmd, capture_output=True, text=True, check=True)
+                    logger.info(f"✅ {config['label']} concatenation successful")
+                    break  # Success - exit loop
+
+                except subprocess.CalledProcessError as e:
+                    last_error = e
+                    stderr_lower = e.stderr.lower()
+
+                    # Check if it's a GPU-specific error
+                    if config['name'] == 'h264_nvenc' and any(
+                        err in stderr_lower for err in [
+                            'no capable devices',
+                            'unsupported device',
+                            'nvenc',
+                            'cannot load',
+                            'driver'
+                        ]
+                    ):
+                        logger.warning(f"⚠️ {config['label']} failed (GPU issue)")
+                        logger.info("🔄 Falling back to CPU encoding...")
+                        continue  # Try next encoder
+                    else:
+                        # Non-GPU error or last encoder failed
+                        logger.error(f"FFmpeg {config['name']} failed: {e.stderr}")
+                        raise RuntimeError(f"FFmpeg {config['name']} failed: {e.stderr}")
+            else:
+                # Loop completed without break - all encoders failed
+                raise RuntimeError(f"All encoding attempts failed: {last_error.stderr if last_error else 'Unknown error'}")
 
         if not output_path.exists() or output_path.stat().st_size == 0:
             raise RuntimeError("FFmpeg produced empty output")
@@ -2036,7 +3264,10 @@ def concatenate_videos(
             'video_url': video_url,
             'filename': output_filename,
             's3_key': s3_key,
-            'video_count': len(video_urls)
+            'video_count': len(video_urls),
+            'encode': encode_stats,
+            'concat_path': concat_path,
+            'mismatched_inputs': compat['differences'] if compat else None
         }
 
     except subprocess.CalledProcessError as e:
@@ -2049,18 +3280,173 @@ def concatenate_videos(
         concat_list_path.unlink(missing_ok=True)
 
 
+def concat_audio_files(input_files: List[Path], output_path: Path, codec: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Join audio files: concat demuxer stream copy when codec parameters match,
+    otherwise ONE decode → resample → encode pass over all inputs
+
+    Args:
+        input_files: Local audio files, in order
+        output_path: Output file (suffix replaced when codec is None)
+        codec: Output codec ('mp3' | 'aac'), None = keep the inputs' codec
+            (MP3/AAC, else MP3)
+
+    Returns:
+        Dict with path, codec, concat_path ('copy' | 'reencode'),
+        mismatched_inputs (index → differing keys) and time_s
+    """
+    start = time.time()
+    compat = analyze_audio_concat_compat([probe_cached(input_file) for input_file in input_files])
+    reference = compat['reference']['audio'] or {}
+
+    if codec is None:
+        codec = reference.get('codec_name') if reference.get('codec_name') in ('mp3', 'aac') else 'mp3'
+        output_path = output_path.with_suffix('.mp3' if codec == 'mp3' else '.m4a')
+    _, encoder_args, _ = AUDIO_CONCAT_FORMATS[output_path.suffix.lower()]
+
+    concat_path = 'reencode'
+    if STREAM_COPY_CONCAT and compat['compatible'] and reference.get('codec_name') == codec:
+        concat_list_path = output_path.with_name(f"{output_path.stem}_concat_list.txt")
+        with open(concat_list_path, 'w', encoding='utf-8') as f:
+            for input_file in input_files:
+                abs_path = str(input_file.absolute()).replace('\\', '/')
+                f.write(f"file '{abs_path}'\n")
+        try:
+            logger.info(f"📋 Stream-copy audio concatenation: {len(input_files)} files ({codec})")
+            cmd = [
+                'ffmpeg', '-y',
+                '-f', 'concat',
+                '-safe', '0',
+                '-i', str(concat_list_path),
+                '-map', '0:a',
+                '-c', 'copy',
+                str(output_path)
+            ]
+            run_tracked(cmd, capture_output=True, text=True, check=True, stage='concat')
+            concat_path = 'copy'
+        except subprocess.CalledProcessError as e:
+            logger.warning(f"⚠️ Stream-copy audio concatenation failed, re-encoding: {e.stderr[-200:]}")
+        finally:
+            concat_list_path.unlink(missing_ok=True)
+
+    if concat_path != 'copy':
+        # Mismatched rates/layouts: every input is resampled to the reference
+        # format inside one filter graph, then encoded once
+        sample_rate = reference.get('sample_rate') or 44100
+        channels = min(reference.get('channels') or 2, 2)
+        layout = 'stereo' if channels == 2 else 'mono'
+        logger.info(
+            f"🎚️ Re-encoding audio concatenation: {len(input_files)} files → "
+            f"{codec} {sample_rate} Hz {layout} ({AUDIO_CONCAT_BITRATE})"
+        )
+        branches = ''.join(
+            f"[{i}:a:0]aresample={sample_rate},aformat=sample_fmts=fltp:channel_layouts={layout}[a{i}];"
+            for i in range(len(input_files))
+        )
+        joined = ''.join(f"[a{i}]" for i in range(len(input_files)))
+        cmd = ['ffmpeg', '-y']
+        for input_file in input_files:
+            cmd.extend(['-i', str(input_file)])
+        cmd.extend([
+            '-filter_complex', f"{branches}{joined}concat=n={len(input_files)}:v=0:a=1[aout]",
+            '-map', '[aout]'
+        ])
+        cmd.extend(encoder_args)
+        cmd.extend(['-b:a', AUDIO_CONCAT_BITRATE, str(output_path)])
+        run_tracked(cmd, capture_output=True, text=True, check=True, stage='concat')
+
+    if not output_path.exists() or output_path.stat().st_size == 0:
+        raise RuntimeError("FFmpeg produced empty output")
+
+    elapsed = time.time() - start
+    logger.info(f"✅ Audio concatenated ({concat_path}): {output_path.name} in {elapsed:.2f}s")
+    return {
+        'path': output_path,
+        'codec': codec,
+        'concat_path': concat_path,
+        'mismatched_inputs': compat['differences'],
+        'time_s': round(elapsed, 2)
+    }
+
+
+def concatenate_audios(
+    audio_urls: List[str],
+    path: str,
+    output_filename: str,
+    worker_id: str = None
+) -> Dict[str, Any]:
+    """Concatenate multiple audio files (MP3/AAC narration) into one and upload to S3
+
+    Args:
+        audio_urls: Audio URLs, in order
+        path: S3 path for upload
+        output_filename: Output filename (.mp3, .m4a or .aac - sets the output codec)
+        worker_id: Worker identifier (optional)
+    """
+    suffix = Path(output_filename).suffix.lower()
+    if suffix not in AUDIO_CONCAT_FORMATS:
+        raise ValueError(f"Unsupported audio output format: {output_filename} (use {', '.join(AUDIO_CONCAT_FORMATS)})")
+    codec, _, content_type = AUDIO_CONCAT_FORMATS[suffix]
+
+    job_id = str(uuid.uuid4())
+    logger.info(f"Starting audio concatenate job: {job_id} ({len(audio_urls)} audios)")
+
+    input_files = [WORK_DIR / f"{job_id}_audio_{i}" for i in range(len(audio_urls))]
+    output_path = OUTPUT_DIR / output_filename
+
+    try:
+        # Download all audios (small files, I/O bound)
+        with ThreadPoolExecutor(max_workers=max(1, min(len(audio_urls), 8))) as executor:
+            list(executor.map(download_file, audio_urls, input_files))
+
+        concat = concat_audio_files(input_files, output_path, codec)
+        total_duration = get_duration(output_path)
+
+        # Upload to S3
+        if not path.endswith('/'):
+            path = path + '/'
+        s3_key = f"{path}{output_filename}"
+        audio_url = upload_to_s3(output_path, S3_BUCKET_NAME, s3_key, content_type=content_type)
+
+        return {
+            'audio_url': audio_url,
+            'filename': output_filename,
+            's3_key': s3_key,
+            'audio_count': len(audio_urls),
+            'total_duration': total_duration,
+            'codec': concat['codec'],
+            'concat_path': concat['concat_path'],
+            'mismatched_inputs': concat['mismatched_inputs'],
+            'concat_time_s': concat['time_s']
+        }
+
+    except subprocess.CalledProcessError as e:
+        logger.error(f"FFmpeg error: {e.stderr}")
+        raise RuntimeError(f"FFmpeg failed: {e.stderr}")
+    finally:
+        for input_file in input_files:
+            input_file.unlink(missing_ok=True)
+        output_path.unlink(missing_ok=True)
+
+
 def concatenate_videos_cyclic(
     video_urls: List[str],
-    audio_url: str,
+    audio_url: Optional[str],
     path: str,
     output_filename: str,
     normalize: bool = True,
-    worker_id: str = None
+    worker_id: str = None,
+    quality: str = 'production',
+    audio_urls: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     Concatenate videos from URLs cyclically to match audio duration
     Optimized for CPU performance using concat demuxer with -c copy
 
+    The audio duration and remote clip durations are read first, so only the
+    clips the sequence uses are downloaded (in order, normalized while the
+    next one downloads).
+
     Supports:
     - Google Drive URLs (all formats)
     - S3/MinIO URLs
@@ -2073,13 +3459,22 @@ def concatenate_videos_cyclic(
         output_filename: Output filename (e.g., "video_final.mp4")
         normalize: Normalize videos to same spec (enables -c copy, default: True)
         worker_id: Worker identifier (optional)
+        quality: Render quality tier - "production" (1080p30) or "draft" (540p15, ultrafast)
+        audio_urls: Audio parts joined here (concat_audio) instead of audio_url
 
     Returns:
         Dict with video_url, filename, s3_key, cycle_count
     """
     job_id = str(uuid.uuid4())
     logger.info(f"Starting cyclic concatenation job: {job_id}")
-    logger.info(f"Videos: {len(video_urls)}, Normalize: {normalize}")
+    logger.info(f"Videos: {len(video_urls)}, Normalize: {normalize}, Quality: {quality}")
+
+    # Normalization target (same spec for normalize + trim so -c copy concat stays valid)
+    profile = get_render_profile(quality)
+    norm_w, norm_h = profile['width'], profile['height']
+    norm_fps = profile['normalize_fps']
+    norm_preset = profile['x264_fast_preset']
+    vf_scale_pad = f"scale={norm_w}:{norm_h}:force_original_aspect_ratio=decrease,pad={norm_w}:{norm_h}:(ow-iw)/2:(oh-ih)/2:black"
 
     # Working directories
     work_dir = WORK_DIR / job_id
@@ -2093,14 +3488,69 @@ def concatenate_videos_cyclic(
     input_files: List[Path] = []
     normalized_files: List[Path] = []
     trimmed_files: List[Path] = []
+    audio_parts = [work_dir / f"audio_part_{i}" for i in range(len(audio_urls or []))]
+    audio_concat = None
 
     try:
-        # Step 1: Download videos from URLs
-        logger.info(f"📥 Downloading {len(video_urls)} videos from URLs...")
-        start_download = time.time()
+        # Step 1: Download audio first - its duration bounds which clips are used
+        if audio_parts:
+            # Narration parts: joined in the worker, no upload/download round-trip
+            logger.info(f"📥 Downloading {len(audio_parts)} audio parts")
+            with ThreadPoolExecutor(max_workers=max(1, min(len(audio_parts), 8))) as executor:
+                list(executor.map(download_file, audio_urls, audio_parts))
+            audio_concat = concat_audio_files(audio_parts, audio_path)
+            audio_path = audio_concat.pop('path')
+        else:
+            logger.info(f"📥 Downloading audio: {audio_url}")
+            download_file(audio_url, audio_path)
+
+        # Get audio duration (in-process probe)
+        audio_duration = get_duration(audio_path)
+        logger.info(f"🎵 Audio duration: {audio_duration:.2f}s")
+
+        # Step 2: Plan from remote clip durations (container headers / remembered sources, no download)
+        start_plan = time.time()
+        with ThreadPoolExecutor(max_workers=max(1, min(len(video_urls), 8))) as executor:
+            remote_versions = list(executor.map(get_remote_version, video_urls))
+            remote_durations = list(executor.map(get_remote_duration, video_urls, remote_versions))
+        planned = count_cyclic_clips(remote_durations, audio_duration)
+        plan_time = time.time() - start_plan
+        logger.info(
+            f"🗺️ Plan: {sum(d is not None for d in remote_durations)}/{len(video_urls)} remote durations, "
+            f"{planned if planned is not None else '?'} clips needed ({plan_time:.2f}s)"
+        )
+
+        # Normalized clips of previous jobs: a validated URL → content hash
+        # skips the download, a known content hash skips the normalization
+        clip_cache = get_clip_cache()
+        clip_cache.reset_job_stats()
+        use_clip_cache = normalize and clip_cache.enabled
+        clip_spec = {
+            'width': norm_w, 'height': norm_h, 'fps': norm_fps, 'preset': norm_preset,
+            'profile': 'high', 'level': '4.0', 'pix_fmt': 'yuv420p', 'vf': vf_scale_pad
+        }
+        cached: Dict[int, Path] = {}
+        source_digests: Dict[int, str] = {}
 
-        for i, video_url in enumerate(video_urls):
+        def fetch_clip(i: int) -> Path:
+            """Cached normalized clip or downloaded source of clip i (path to probe)"""
+            video_url = video_urls[i]
             video_path = work_dir / f"video_{i}.mp4"
+            input_files.append(video_path)
+            cached_path = work_dir / f"normalized_{i}.mp4"
+            source_key = params_digest(video_url, remote_versions[i]) if remote_versions[i] else None
+            looked_up = None
+
+            if use_clip_cache and source_key:
+                source = get_store().get('clip_source', source_key)
+                if source:
+                    looked_up = clip_key(source['value']['digest'], clip_spec)
+                    if clip_cache.fetch(looked_up, cached_path, s3_client, S3_BUCKET_NAME):
+                        normalized_files.append(cached_path)
+                        cached[i] = cached_path
+                        clip_cache.record_download_skipped()
+                        logger.info(f"  ♻️ Video {i}: normalized clip cached (download skipped)")
+                        return cached_path
 
             # Detect and handle Google Drive URLs
             if 'drive.google.com' in video_url:
@@ -2111,85 +3561,132 @@ def concatenate_videos_cyclic(
                 logger.info(f"  📥 Video {i}: {video_url[:50]}...")
                 download_file(video_url, video_path)
 
-            input_files.append(video_path)
             file_size_mb = video_path.stat().st_size / (1024*1024)
             logger.info(f"  ✓ Video {i}: {file_size_mb:.2f} MB")
 
-        download_time = time.time() - start_download
-        logger.info(f"✅ Download complete: {download_time:.2f}s ({len(video_urls)} videos)")
-
-        # Step 2: Download audio and get duration
-        logger.info(f"📥 Downloading audio: {audio_url}")
-        download_file(audio_url, audio_path)
-
-        # Get audio duration using ffprobe
-        probe_cmd = [
-            'ffprobe', '-v', 'error',
-            '-show_entries', 'format=duration',
-            '-of', 'default=noprint_wrappers=1:nokey=1',
-            str(audio_path)
-        ]
-        result = subprocess.run(probe_cmd, capture_output=True, text=True, check=True)
-        audio_duration = float(result.stdout.strip())
-        logger.info(f"🎵 Audio duration: {audio_duration:.2f}s")
-
-        # Step 3: Get video durations with millisecond precision
-        video_durations = []
-        for video_path in input_files:
-            probe_cmd = [
-                'ffprobe', '-v', 'error',
-                '-show_entries', 'format=duration',
-                '-of', 'default=noprint_wrappers=1:nokey=1',
-                str(video_path)
+            # Remember content hash + duration of this source version for later plans/jobs
+            # (full hash: a sampled fingerprint collision would serve another clip)
+            source_digests[i] = content_digest(video_path)
+            if source_key:
+                get_store().put('clip_source', source_key, {
+                    'digest': source_digests[i],
+                    'duration': get_duration(video_path)
+                }, 0.0)
+
+            if use_clip_cache:
+                key = clip_key(source_digests[i], clip_spec)
+                if key != looked_up and clip_cache.fetch(key, cached_path, s3_client, S3_BUCKET_NAME):
+                    normalized_files.append(cached_path)
+                    cached[i] = cached_path
+                    logger.info(f"  ♻️ Video {i}: normalized clip cached (normalization skipped)")
+                    return cached_path
+
+            return video_path
+
+        def normalize_input(i: int, threads: int) -> Path:
+            # Scale to target maintaining aspect ratio, add black bars if needed
+            # force_original_aspect_ratio=decrease: fits inside norm_w x norm_h
+            # pad: adds black bars to reach exact norm_w x norm_h
+            normalized_path = work_dir / f"normalized_{i}.mp4"
+            cmd = [
+                'ffmpeg', '-y',
+                '-i', str(input_files[i]),
+                '-vf', vf_scale_pad,  # Scale + Pad without distortion
+                '-r', str(norm_fps),  # Force 30fps (15fps draft)
+                '-c:v', 'libx264',
+                '-preset', norm_preset,
+                '-profile:v', 'high',
+                '-level', '4.0',
+                '-pix_fmt', 'yuv420p',
+                '-an',                # REMOVE AUDIO - only MP3 audio will be used
+                '-threads', str(threads),  # Fair share of the vCPUs among concurrent normalizations
+                '-movflags', '+faststart',
+                str(normalized_path)
             ]
-            result = subprocess.run(probe_cmd, capture_output=True, text=True, check=True)
-            duration = float(result.stdout.strip())
-            video_durations.append(duration)
-            logger.info(f"  ✓ Video {input_files.index(video_path)}: {duration:.3f}s")
-
-        total_cycle_duration = sum(video_durations)
-        logger.info(f"🔄 Total cycle duration: {total_cycle_duration:.3f}s")
-        logger.info(f"🎵 Audio duration: {audio_duration:.3f}s")
-
-        # Step 4: Normalize videos (if enabled)
-        files_to_concat = input_files
+            run_tracked(cmd, capture_output=True, text=True, check=True, stage='normalize')
+            normalized_files.append(normalized_path)
+            logger.info(f"  ✓ Normalized video {i}: {normalized_path.stat().st_size / (1024*1024):.2f} MB (video only, no audio)")
+            return normalized_path
+
+        def remux_input(i: int) -> Path:
+            # Already at the target spec: drop audio with stream copy
+            remuxed_path = work_dir / f"remuxed_{i}.mp4"
+            cmd = [
+                'ffmpeg', '-y',
+                '-i', str(input_files[i]),
+                '-map', '0:v:0',
+                '-c:v', 'copy',
+                '-an',
+                '-movflags', '+faststart',
+                str(remuxed_path)
+            ]
+            run_tracked(cmd, capture_output=True, text=True, check=True, stage='normalize')
+            normalized_files.append(remuxed_path)
+            logger.info(f"  ✓ Video {i} already matches the target spec (stream copy, no audio)")
+            return remuxed_path
+
+        def prepare_input(i: int) -> Path:
+            if i in cached:
+                return cached[i]
+            if i in copied:
+                return remux_input(i)
+            normalized_path = normalize_input(i, threads)
+            if use_clip_cache and i in source_digests:
+                clip_cache.store(clip_key(source_digests[i], clip_spec), normalized_path, s3_client, S3_BUCKET_NAME)
+            return normalized_path
+
+        # Inputs already matching the normalize output spec are only remuxed
+        target_spec = {
+            'codec_name': 'h264',
+            'profile': 'High',
+            'level': 40,
+            'pix_fmt': 'yuv420p',
+            'width': norm_w,
+            'height': norm_h,
+            'r_frame_rate': f"{norm_fps}/1",
+            'sample_aspect_ratio': '1:1'
+        }
+        normalize_stats = None
+        copied = set()
 
+        # Step 3: Fetch clips in plan order; each one is normalized in the pool while the next downloads.
+        # Actual durations replace the remote ones, so the plan is re-checked after every clip.
         if normalize:
-            logger.info(f"⚙️ Normalizing {len(input_files)} videos to 1080p@30fps, H.264 High (VIDEO ONLY - removing audio)...")
-            start_normalize = time.time()
-
-            for i, video_path in enumerate(input_files):
-                normalized_path = work_dir / f"normalized_{i}.mp4"
+            logger.info(f"⚙️ Normalizing to {norm_w}x{norm_h}@{norm_fps}fps, H.264 High (VIDEO ONLY - removing audio)...")
+        start_fetch = time.time()
+        video_durations: List[float] = []
+        prepared = []
+
+        # Bounded pool: N libx264 processes x few threads, results keep input order
+        workers, threads = pool_plan(planned or len(video_urls), VCPU_COUNT)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for i in range(len(video_urls)):
+                needed = count_cyclic_clips(video_durations + remote_durations[i:], audio_duration)
+                if needed is not None and i >= needed:
+                    break
+
+                clip_path = fetch_clip(i)
+                video_durations.append(get_duration(clip_path))
+                logger.info(f"  ✓ Video {i}: {video_durations[i]:.3f}s")
 
-                # Scale to 1080p maintaining aspect ratio, add black bars if needed
-                # force_original_aspect_ratio=decrease: fits inside 1920x1080
-                # pad: adds black bars to reach exact 1920x1080
-                vf_scale_pad = "scale=1920:1080:force_original_aspect_ratio=decrease,pad=1920:1080:(ow-iw)/2:(oh-ih)/2:black"
-
-                cmd = [
-                    'ffmpeg', '-y',
-                    '-i', str(video_path),
-                    '-vf', vf_scale_pad,  # Scale + Pad for 1080p without distortion
-                    '-r', '30',           # Force 30fps
-                    '-c:v', 'libx264',
-                    '-preset', 'veryfast',
-                    '-profile:v', 'high',
-                    '-level', '4.0',
-                    '-pix_fmt', 'yuv420p',
-                    '-an',                # REMOVE AUDIO - only MP3 audio will be used
-                    '-movflags', '+faststart',
-                    str(normalized_path)
-                ]
+                if normalize:
+                    if STREAM_COPY_CONCAT and i not in cached and not spec_differences(probe_cached(clip_path), target_spec):
+                        copied.add(i)
+                    prepared.append(executor.submit(prepare_input, i))
 
-                subprocess.run(cmd, capture_output=True, text=True, check=True)
-                normalized_files.append(normalized_path)
-                logger.info(f"  ✓ Normalized video {i}: {normalized_path.stat().st_size / (1024*1024):.2f} MB (video only, no audio)")
+            files_to_concat = [future.result() for future in prepared] if normalize else input_files
 
-            normalize_time = time.time() - start_normalize
-            logger.info(f"✅ Normalization complete: {normalize_time:.2f}s")
+        normalize_time = time.time() - start_fetch
+        logger.info(
+            f"✅ Fetched {len(input_files)}/{len(video_urls)} clips{' and normalized' if normalize else ''}: "
+            f"{normalize_time:.2f}s ({workers} parallel × {threads} threads, "
+            f"{len(cached)} cached, {len(copied)} stream-copied)"
+        )
 
-            # Use normalized files for concatenation
-            files_to_concat = normalized_files
+        total_cycle_duration = sum(video_durations)
+        all_fetched = len(input_files) == len(video_urls)
+        logger.info(f"🔄 Total cycle duration: {total_cycle_duration:.3f}s{'' if all_fetched else ' (clips used)'}")
+        logger.info(f"🎵 Audio duration: {audio_duration:.3f}s")
 
         # Step 5: Calculate EXACT video sequence to match audio duration
         logger.info(f"🔢 Calculating exact video sequence to match audio duration...")
@@ -2224,10 +3721,30 @@ def concatenate_videos_cyclic(
         logger.info(f"✅ Sequence calculated: {segment_count} segments, total duration: {accumulated_duration:.3f}s")
 
         # Step 6: Create trimmed version of partial video (if needed)
+        trim_stats = None
+        copied_paths = {files_to_concat[i] for i in copied}
         for idx, (video_path, duration_to_use, is_partial) in enumerate(video_sequence):
             if is_partial:
                 logger.info(f"✂️ Trimming last segment to {duration_to_use:.3f}s for exact match...")
                 trimmed_path = work_dir / f"trimmed_last.mp4"
+                start_trim = time.time()
+
+                # Smart-cut: normalized files have known encoder settings, so only
+                # the GOP containing the cut is re-encoded
+                if normalize and video_path not in copied_paths:
+                    trim_stats = smart_trim(video_path, trimmed_path, duration_to_use, [
+                        '-r', str(norm_fps),
+                        '-c:v', 'libx264',
+                        '-preset', norm_preset,
+                        '-profile:v', 'high',
+                        '-level', '4.0',
+                        '-pix_fmt', 'yuv420p'
+                    ], work_dir)
+                if trim_stats:
+                    trim_stats['mode'] = 'smart_cut'
+                    trimmed_files.append(trimmed_path)
+                    video_sequence[idx] = (trimmed_path, duration_to_use, False)
+                    continue
 
                 # Use re-encode for frame-accurate trim (veryfast is still fast)
                 # IMPORTANT: Must match normalize specs if normalize=true
@@ -2240,15 +3757,14 @@ def concatenate_videos_cyclic(
                 # Match normalization specs if enabled
                 if normalize:
                     # Same scale+pad as normalize to maintain aspect ratio
-                    vf_scale_pad = "scale=1920:1080:force_original_aspect_ratio=decrease,pad=1920:1080:(ow-iw)/2:(oh-ih)/2:black"
                     cmd.extend([
-                        '-vf', vf_scale_pad,  # Scale + Pad for 1080p without distortion
-                        '-r', '30',           # Force 30fps (same as normalize)
+                        '-vf', vf_scale_pad,  # Scale + Pad without distortion
+                        '-r', str(norm_fps),  # Same fps as normalize
                     ])
 
                 cmd.extend([
                     '-c:v', 'libx264',
-                    '-preset', 'veryfast',
+                    '-preset', norm_preset,
                     '-profile:v', 'high',
                     '-level', '4.0',
                     '-pix_fmt', 'yuv420p',
@@ -2271,23 +3787,55 @@ def concatenate_videos_cyclic(
                     str(trimmed_path)
                 ])
 
-                subprocess.run(cmd, capture_output=True, text=True, check=True)
+                run_tracked(cmd, capture_output=True, text=True, check=True, stage='trim')
                 trimmed_files.append(trimmed_path)
 
                 # Verify trimmed duration
-                probe_cmd = [
-                    'ffprobe', '-v', 'error',
-                    '-show_entries', 'format=duration',
-                    '-of', 'default=noprint_wrappers=1:nokey=1',
-                    str(trimmed_path)
-                ]
-                result = subprocess.run(probe_cmd, capture_output=True, text=True, check=True)
-                actual_duration = float(result.stdout.strip())
+                actual_duration = get_duration(trimmed_path)
                 logger.info(f"  ✓ Trimmed video: requested {duration_to_use:.3f}s, actual {actual_duration:.3f}s")
+                trim_stats = {
+                    'mode': 'reencode',
+                    'encoded_s': round(duration_to_use, 3),
+                    'duration': actual_duration,
+                    'error_ms': round(abs(actual_duration - duration_to_use) * 1000, 1),
+                    'time_s': round(time.time() - start_trim, 2)
+                }
 
                 # Update sequence to use trimmed file
                 video_sequence[idx] = (trimmed_path, duration_to_use, False)
 
+        # Step 6b: Stream-copied inputs must share SPS/PPS with the encoded files
+        # (normalized inputs / trimmed tail), otherwise normalize them after all
+        if copied:
+            encoded = trimmed_files + [files_to_concat[i] for i in range(len(files_to_concat)) if i not in copied]
+            used = list(dict.fromkeys(video_path for video_path, _, _ in video_sequence))
+            compat = analyze_concat_compat([probe_cached(video_path) for video_path in used], include_audio=False)
+            if not compat['compatible']:
+                reference = stream_signature(probe_cached(encoded[0]), include_audio=False) if encoded else None
+                redo = [
+                    i for i in sorted(copied)
+                    if reference is None or stream_signature(probe_cached(files_to_concat[i]), include_audio=False) != reference
+                ]
+                workers, threads = pool_plan(len(redo), VCPU_COUNT)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    normalized_paths = list(executor.map(lambda i: normalize_input(i, threads), redo))
+                replaced = {}
+                for i, normalized_path in zip(redo, normalized_paths):
+                    replaced[files_to_concat[i]] = normalized_path
+                    files_to_concat[i] = normalized_path
+                    copied.discard(i)
+                video_sequence = [(replaced.get(p, p), d, partial) for p, d, partial in video_sequence]
+                logger.info(f"🧬 {len(replaced)} stream-copied inputs differ from the encoded ones → normalized")
+
+        if normalize:
+            normalize_stats = {
+                'path': 'copy' if len(copied) == len(input_files) else 'mixed' if copied else 'normalize',
+                'normalized': len(input_files) - len(copied) - len(cached),
+                'copied': len(copied),
+                'cached': len(cached),
+                'time_s': round(normalize_time, 2)
+            }
+
         # Step 7: Generate concat list with exact sequence
         logger.info(f"📝 Generating concat list with {len(video_sequence)} segments...")
 
@@ -2316,7 +3864,7 @@ def concatenate_videos_cyclic(
         ]
 
         logger.info(f"Running FFmpeg: {' '.join(cmd)}")
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        result = run_tracked(cmd, capture_output=True, text=True, check=True, stage='concat')
 
         concat_time = time.time() - start_concat
         logger.info(f"✅ Concatenation complete: {concat_time:.2f}s")
@@ -2328,14 +3876,7 @@ def concatenate_videos_cyclic(
         logger.info(f"✅ Final video: {output_filename} ({file_size_mb:.2f} MB)")
 
         # Step 9: Verify final video duration matches audio
-        probe_cmd = [
-            'ffprobe', '-v', 'error',
-            '-show_entries', 'format=duration',
-            '-of', 'default=noprint_wrappers=1:nokey=1',
-            str(output_path)
-        ]
-        result = subprocess.run(probe_cmd, capture_output=True, text=True, check=True)
-        final_video_duration = float(result.stdout.strip())
+        final_video_duration = get_duration(output_path)
         duration_diff = abs(final_video_duration - audio_duration)
 
         logger.info(f"🔍 Duration verification:")
@@ -2352,14 +3893,14 @@ def concatenate_videos_cyclic(
         s3_key = f"{path}{output_filename}"
 
         logger.info(f"📤 Uploading to S3: {s3_key}")
-        video_url = upload_to_s3(output_path, S3_BUCKET_NAME, s3_key)
+        video_url = upload_to_s3(output_path, S3_BUCKET_NAME, s3_key, get_draft_metadata(quality))
 
         # Cleanup local file after S3 upload
         output_path.unlink(missing_ok=True)
 
-        # Calculate cycles (for stats)
-        full_cycles = int(accumulated_duration // total_cycle_duration)
-        partial_cycle = (accumulated_duration % total_cycle_duration) > 0.001
+        # Calculate cycles (for stats) - a plan that skipped clips never completes a cycle
+        full_cycles = int(accumulated_duration // total_cycle_duration) if all_fetched else 0
+        partial_cycle = (accumulated_duration % total_cycle_duration) > 0.001 if all_fetched else True
 
         return {
             'video_url': video_url,
@@ -2370,7 +3911,19 @@ def concatenate_videos_cyclic(
             'partial_cycle': partial_cycle,
             'video_duration': final_video_duration,
             'audio_duration': audio_duration,
-            'duration_diff_ms': round(duration_diff * 1000, 1)
+            'duration_diff_ms': round(duration_diff * 1000, 1),
+            'normalize': normalize_stats,
+            'trim': trim_stats,
+            'clip_cache': clip_cache.job_stats() if use_clip_cache else None,
+            'plan': {
+                'clips_total': len(video_urls),
+                'clips_used': len(input_files),
+                'remote_durations': sum(d is not None for d in remote_durations),
+                'planned_clips': planned,
+                'plan_time_s': round(plan_time, 2)
+            },
+            'audio_concat': audio_concat,
+            'draft': quality == 'draft'
         }
 
     except subprocess.CalledProcessError as e:
@@ -2378,7 +3931,7 @@ def concatenate_videos_cyclic(
         raise RuntimeError(f"FFmpeg failed: {e.stderr}")
     finally:
         # Cleanup all temporary files
-        for file in input_files + normalized_files + trimmed_files:
+        for file in input_files + normalized_files + trimmed_files + audio_parts:
             file.unlink(missing_ok=True)
         concat_list_path.unlink(missing_ok=True)
         if audio_path.exists():
@@ -2391,13 +3944,28 @@ def concatenate_videos_cyclic(
             pass
 
 
+def generate_ass_cached(generator, source_path: Path, ass_path: Path, style: Dict[str, Any]) -> None:
+    """Generate ASS via caption_generator, reusing stored ASS text for identical input + style"""
+    key = params_digest(generator.__name__, file_digest(source_path), style)
+
+    def _generate() -> str:
+        generator(source_path, ass_path, style)
+        return ass_path.read_text(encoding='utf-8')
+
+    ass_text = get_store().get_or_compute('ass', key, _generate, version=source_version(caption_generator))
+    if not ass_path.exists():
+        ass_path.write_text(ass_text, encoding='utf-8')
+
+
 def add_caption_segments(
     url_video: str,
     url_srt: str,
     path: str,
     output_filename: str,
     style: Dict[str, Any],
-    worker_id: str = None
+    worker_id: str = None,
+    quality: str = 'production',
+    chunked: Optional[bool] = None
 ) -> Dict[str, Any]:
     """
     Add segments caption with custom styling to video and upload to S3
@@ -2409,6 +3977,8 @@ def add_caption_segments(
         output_filename: Output filename
         style: Style configuration dict
         worker_id: Worker identifier (optional)
+        quality: Render quality tier - "production" or "draft"
+        chunked: Segment-parallel encoding on/off (None = auto for long videos on CPU)
     """
     video_id = str(uuid.uuid4())
     logger.info(f"Starting caption segments job: {video_id}")
@@ -2425,18 +3995,19 @@ def add_caption_segments(
 
         # Generate ASS file from SRT with custom styling
         logger.info(f"Generating ASS from SRT with custom style")
-        generate_ass_from_srt(srt_path, ass_path, style)
+        generate_ass_cached(generate_ass_from_srt, srt_path, ass_path, style)
 
         # Normalize ASS path for FFmpeg (escape colons)
         normalized_ass = str(ass_path).replace('\\', '/').replace(':', '\\:')
 
-        # FFmpeg with automatic GPU/CPU fallback
-        run_ffmpeg_with_fallback(
-            input_file=str(video_path),
-            output_file=str(output_path),
-            video_filters=f"ass='{normalized_ass}'",
-            audio_codec='copy',
-            extra_output_args=['-movflags', '+faststart']
+        # FFmpeg with automatic GPU/CPU fallback (chunked libx264 for long videos on CPU)
+        encode_stats = encode_video_filter_job(
+            video_id,
+            video_path,
+            output_path,
+            f"ass='{normalized_ass}'",
+            quality=quality,
+            chunked=chunked
         )
 
         if not output_path.exists() or output_path.stat().st_size == 0:
@@ -2447,7 +4018,7 @@ def add_caption_segments(
 
         # Upload to S3
         s3_key = f"{path}{output_filename}"
-        video_url = upload_to_s3(output_path, S3_BUCKET_NAME, s3_key)
+        video_url = upload_to_s3(output_path, S3_BUCKET_NAME, s3_key, get_draft_metadata(quality))
 
         # Cleanup local file after S3 upload
         output_path.unlink(missing_ok=True)
@@ -2455,7 +4026,9 @@ def add_caption_segments(
         return {
             'video_url': video_url,
             'filename': output_filename,
-            's3_key': s3_key
+            's3_key': s3_key,
+            'draft': quality == 'draft',
+            'encode': encode_stats
         }
 
     except subprocess.CalledProcessError as e:
@@ -2474,7 +4047,9 @@ def add_caption_highlight(
     path: str,
     output_filename: str,
     style: Dict[str, Any],
-    worker_id: str = None
+    worker_id: str = None,
+    quality: str = 'production',
+    chunked: Optional[bool] = None
 ) -> Dict[str, Any]:
     """
     Add highlight caption (word-level) to video and upload to S3
@@ -2486,6 +4061,8 @@ def add_caption_highlight(
         output_filename: Output filename
         style: Style configuration dict
         worker_id: Worker identifier (optional)
+        quality: Render quality tier - "production" or "draft"
+        chunked: Segment-parallel encoding on/off (None = auto for long videos on CPU)
     """
     video_id = str(uuid.uuid4())
     logger.info(f"Starting caption highlight job: {video_id}")
@@ -2502,18 +4079,19 @@ def add_caption_highlight(
 
         # Generate ASS file with highlight from JSON
         logger.info(f"Generating highlight ASS from JSON")
-        generate_ass_highlight(json_path, ass_path, style)
+        generate_ass_cached(generate_ass_highlight, json_path, ass_path, style)
 
         # Normalize ASS path for FFmpeg (escape colons)
         normalized_ass = str(ass_path).replace('\\', '/').replace(':', '\\:')
 
-        # FFmpeg with automatic GPU/CPU fallback
-        run_ffmpeg_with_fallback(
-            input_file=str(video_path),
-            output_file=str(output_path),
-            video_filters=f"ass='{normalized_ass}'",
-            audio_codec='copy',
-            extra_output_args=['-movflags', '+faststart']
+        # FFmpeg with automatic GPU/CPU fallback (chunked libx264 for long videos on CPU)
+        encode_stats = encode_video_filter_job(
+            video_id,
+            video_path,
+            output_path,
+            f"ass='{normalized_ass}'",
+            quality=quality,
+            chunked=chunked
         )
 
         if not output_path.exists() or output_path.stat().st_size == 0:
@@ -2524,7 +4102,7 @@ def add_caption_highlight(
 
         # Upload to S3
         s3_key = f"{path}{output_filename}"
-        video_url = upload_to_s3(output_path, S3_BUCKET_NAME, s3_key)
+        video_url = upload_to_s3(output_path, S3_BUCKET_NAME, s3_key, get_draft_metadata(quality))
 
         # Cleanup local file after S3 upload
         output_path.unlink(missing_ok=True)
@@ -2532,7 +4110,9 @@ def add_caption_highlight(
         return {
             'video_url': video_url,
             'filename': output_filename,
-            's3_key': s3_key
+            's3_key': s3_key,
+            'draft': quality == 'draft',
+            'encode': encode_stats
         }
 
     except subprocess.CalledProcessError as e:
@@ -2545,22 +4125,13 @@ def add_caption_highlight(
         ass_path.unlink(missing_ok=True)
 
 
-def handler(job: Dict) -> Dict[str, Any]:
-    """
-    RunPod handler function
-    Receives job input and routes to appropriate operation
+def configure_job_s3(job_input: Dict) -> Optional[Dict[str, Any]]:
     """
-    job_input = job.get('input', {})
-    operation = job_input.get('operation')
-
-    # Get worker ID - RunPod provides this via RUNPOD_POD_ID env var
-    worker_id = os.getenv('RUNPOD_POD_ID')
-
-    logger.info(f"🚀 Job started: {operation}")
-    logger.info(f"📥 Input: {job_input}")
-    logger.info(f"🆔 Worker ID: {worker_id}")
+    Apply the orchestrator-provided S3 config (or keep the environment config)
 
-    # S3 config is REQUIRED - orchestrator must always provide it
+    Returns:
+        Error result if no S3 config is available, else None
+    """
     s3_config = job_input.get('s3_config')
     if not s3_config:
         # Check if we have S3 config from environment (legacy mode)
@@ -2577,8 +4148,140 @@ def handler(job: Dict) -> Dict[str, Any]:
     else:
         logger.info("🔧 Reconfiguring S3 client with orchestrator-provided credentials")
         reconfigure_s3(s3_config)
+    return None
+
+
+def parse_img2vid_input(job_input: Dict) -> Dict[str, Any]:
+    """Validate img2vid job input and return process_img2vid_batch arguments"""
+    images = job_input.get('images', [])
+    frame_rate = job_input.get('frame_rate', 24)  # Default 24 fps
+    path = job_input.get('path')
+    zoom_types = job_input.get('zoom_types', ['zoomin'])  # Default: zoomin only
+    start_index = job_input.get('start_index', 0)  # Global start index for multi-worker
+    pack_size = job_input.get('pack_size')  # Clips per ffmpeg process (None = auto, 1 = off)
+
+    if not images or not path:
+        raise ValueError("Missing required fields: images, path")
+
+    # Normalize all image URLs
+    for img in images:
+        if 'image_url' in img:
+            img['image_url'] = normalize_url(img['image_url'])
+
+    logger.info(f"📤 S3 upload: bucket={S3_BUCKET_NAME}, path={path}, zoom_types={zoom_types}, start_index={start_index}")
+    return {
+        'images': images,
+        'frame_rate': frame_rate,
+        'zoom_types': zoom_types,
+        'path': path,
+        'start_index': start_index,
+        'pack_size': pack_size
+    }
+
+
+def stream_handler(job: Dict):
+    """
+    RunPod generator handler (STREAMING_HANDLER=on)
+
+    img2vid yields every clip as soon as its upload completes, then a final
+    summary with per-clip failures (a failed clip no longer discards the
+    finished ones). Other operations yield their single result.
+    """
+    job_input = job.get('input', {})
+    operation = job_input.get('operation')
+
+    if operation != 'img2vid':
+        yield handler(job)
+        return
+
+    start_job(operation)
+    get_store().reset_job_stats()
+    get_clip_cache().trim()  # Give tmpfs back to this job's WORK_DIR if it filled up
+    worker_id = os.getenv('RUNPOD_POD_ID')
+    logger.info(f"🚀 Job started: {operation} (streaming)")
+
+    summary = None
+    try:
+        config_error = configure_job_s3(job_input)
+        if config_error:
+            yield config_error
+            return
+
+        quality = job_input.get('quality') or 'production'
+        get_render_profile(quality)  # Validate early
+
+        img2vid_args = parse_img2vid_input(job_input)
+        for event in iter_img2vid_batch(worker_id=worker_id, quality=quality, fail_fast=False, **img2vid_args):
+            if event['type'] == 'summary':
+                summary = event
+            else:
+                yield event
+    finally:
+        resources = finish_job()
+
+    summary['success'] = not summary['failures']
+    if resources:
+        summary['resources'] = resources
+    summary['metadata_cache'] = get_store().job_stats()
+    yield summary
+
+
+def handler(job: Dict) -> Dict[str, Any]:
+    """
+    RunPod handler function
+    Routes the job and attaches per-job resource accounting ('resources' block:
+    CPU seconds, peak RSS, I/O and transfer bytes per stage and per tool)
+    and metadata store hit rates ('metadata_cache' block)
+    """
+    operation = job.get('input', {}).get('operation')
+    start_job(operation)
+    get_store().reset_job_stats()
+    get_clip_cache().trim()  # Give tmpfs back to this job's WORK_DIR if it filled up
+
+    try:
+        result = route_operation(job)
+    finally:
+        resources = finish_job()
+
+    if isinstance(result, dict) and result.get('success'):
+        if resources:
+            result['resources'] = resources
+        result['metadata_cache'] = get_store().job_stats()
+
+    return result
+
+
+def route_operation(job: Dict) -> Dict[str, Any]:
+    """
+    Receives job input and routes to appropriate operation
+    """
+    job_input = job.get('input', {})
+    operation = job_input.get('operation')
+
+    # Get worker ID - RunPod provides this via RUNPOD_POD_ID env var
+    worker_id = os.getenv('RUNPOD_POD_ID')
+
+    logger.info(f"🚀 Job started: {operation}")
+    logger.info(f"📥 Input: {job_input}")
+    logger.info(f"🆔 Worker ID: {worker_id}")
+
+    # S3 config is REQUIRED - orchestrator must always provide it
+    config_error = configure_job_s3(job_input)
+    if config_error:
+        return config_error
 
     try:
+        # Render quality tier: "production" (default) or "draft" (fast preview)
+        # Applies to img2vid, caption_segments, caption_highlight, trilhasonora, concat_video_audio
+        quality = job_input.get('quality') or 'production'
+        get_render_profile(quality)  # Validate early
+        if quality == 'draft':
+            logger.info("📝 Draft render requested (540p, ultrafast, reduced upscale/fps)")
+
+        # Segment-parallel libx264 encoding: true/false, omitted = auto (long videos on CPU-only workers)
+        # Applies to caption_segments, caption_highlight, addaudio, concatenate
+        chunked = job_input.get('chunked')
+
         if operation == 'caption':
             url_video = normalize_url(job_input.get('url_video'))
             url_srt = normalize_url(job_input.get('url_srt'))
@@ -2606,26 +4309,42 @@ def handler(job: Dict) -> Dict[str, Any]:
             }
 
         elif operation == 'img2vid':
+            img2vid_args = parse_img2vid_input(job_input)
+            result = process_img2vid_batch(worker_id=worker_id, quality=quality, **img2vid_args)
+
+            return {
+                "success": True,
+                **result
+            }
+
+        elif operation == 'img2vid_timeline':
             images = job_input.get('images', [])
             frame_rate = job_input.get('frame_rate', 24)  # Default 24 fps
             path = job_input.get('path')
+            output_filename = job_input.get('output_filename')
             zoom_types = job_input.get('zoom_types', ['zoomin'])  # Default: zoomin only
-            start_index = job_input.get('start_index', 0)  # Global start index for multi-worker
+            url_audio = job_input.get('url_audio')
+            pack_size = job_input.get('pack_size')
 
-            if not images or not path:
-                raise ValueError("Missing required fields: images, path")
+            if not images or not path or not output_filename:
+                raise ValueError("Missing required fields: images, path, output_filename")
 
             # Normalize all image URLs
             for img in images:
                 if 'image_url' in img:
                     img['image_url'] = normalize_url(img['image_url'])
+            if url_audio:
+                url_audio = normalize_url(url_audio)
 
-            logger.info(f"📤 S3 upload: bucket={S3_BUCKET_NAME}, path={path}, zoom_types={zoom_types}, start_index={start_index}")
-            result = process_img2vid_batch(images, frame_rate, zoom_types, worker_id, path, start_index)
+            logger.info(f"📤 S3 upload: bucket={S3_BUCKET_NAME}, path={path}, filename={output_filename}, zoom_types={zoom_types}")
+            result = process_img2vid_timeline(
+                images, path, output_filename, frame_rate, zoom_types, url_audio, worker_id, quality, pack_size
+            )
 
             return {
                 "success": True,
-                **result
+                **result,
+                "message": f"{result['total']} images rendered to one video and uploaded to S3 successfully"
             }
 
         elif operation == 'addaudio':
@@ -2638,13 +4357,15 @@ def handler(job: Dict) -> Dict[str, Any]:
                 raise ValueError("Missing required fields: url_video, url_audio, path, output_filename")
 
             logger.info(f"📤 S3 upload: bucket={S3_BUCKET_NAME}, path={path}, filename={output_filename}")
-            result = add_audio(url_video, url_audio, path, output_filename, worker_id)
+            result = add_audio(url_video, url_audio, path, output_filename, worker_id, chunked)
             return {
                 "success": True,
                 "video_url": result['video_url'],
                 "filename": result['filename'],
                 "speed_factor": result['speed_factor'],
                 "s3_key": result['s3_key'],
+                "encode": result['encode'],
+                "sync": result['sync'],
                 "message": "Audio added and uploaded to S3 successfully"
             }
 
@@ -2661,12 +4382,14 @@ def handler(job: Dict) -> Dict[str, Any]:
             logger.info(f"📤 S3 upload with segments styling: bucket={S3_BUCKET_NAME}, path={path}, filename={output_filename}")
             logger.info(f"🎨 Style: {style}")
 
-            result = add_caption_segments(url_video, url_srt, path, output_filename, style, worker_id)
+            result = add_caption_segments(url_video, url_srt, path, output_filename, style, worker_id, quality, chunked)
             return {
                 "success": True,
                 "video_url": result['video_url'],
                 "filename": result['filename'],
                 "s3_key": result['s3_key'],
+                "draft": result['draft'],
+                "encode": result['encode'],
                 "message": "Caption segments added and uploaded to S3 successfully"
             }
 
@@ -2683,12 +4406,14 @@ def handler(job: Dict) -> Dict[str, Any]:
             logger.info(f"📤 S3 upload with highlight styling: bucket={S3_BUCKET_NAME}, path={path}, filename={output_filename}")
             logger.info(f"🎨 Style: {style}")
 
-            result = add_caption_highlight(url_video, url_words_json, path, output_filename, style, worker_id)
+            result = add_caption_highlight(url_video, url_words_json, path, output_filename, style, worker_id, quality, chunked)
             return {
                 "success": True,
                 "video_url": result['video_url'],
                 "filename": result['filename'],
                 "s3_key": result['s3_key'],
+                "draft": result['draft'],
+                "encode": result['encode'],
                 "message": "Caption highlight added and uploaded to S3 successfully"
             }
 
@@ -2706,31 +4431,75 @@ def handler(job: Dict) -> Dict[str, Any]:
             logger.info(f"📤 S3 upload: bucket={S3_BUCKET_NAME}, path={path}, filename={output_filename}")
             logger.info(f"🎬 Concatenating {len(video_urls)} videos")
 
-            result = concatenate_videos(video_urls, path, output_filename, worker_id)
+            result = concatenate_videos(video_urls, path, output_filename, worker_id, chunked)
             return {
                 "success": True,
                 "video_url": result['video_url'],
                 "filename": result['filename'],
                 "s3_key": result['s3_key'],
                 "video_count": result['video_count'],
+                "encode": result['encode'],
+                "concat_path": result['concat_path'],
+                "mismatched_inputs": result['mismatched_inputs'],
                 "message": f"{result['video_count']} videos concatenated and uploaded to S3 successfully"
             }
 
+        elif operation == 'concat_audio':
+            audio_urls = job_input.get('audio_urls', [])
+            path = job_input.get('path')
+            output_filename = job_input.get('output_filename') or 'audio_concatenated.mp3'
+
+            if not audio_urls or not path:
+                raise ValueError("Missing required fields: audio_urls, path")
+
+            if len(audio_urls) < 2:
+                raise ValueError("At least 2 audio files are required for concatenation")
+
+            # Same item shape as /vps/audio/concatenate ({"audio_url": ...}); plain strings accepted too
+            audio_urls = [
+                normalize_url(item['audio_url'] if isinstance(item, dict) else item)
+                for item in audio_urls
+            ]
+
+            logger.info(f"📤 S3 upload: bucket={S3_BUCKET_NAME}, path={path}, filename={output_filename}")
+            logger.info(f"🎵 Concatenating {len(audio_urls)} audios")
+
+            result = concatenate_audios(audio_urls, path, output_filename, worker_id)
+            return {
+                "success": True,
+                "audio_url": result['audio_url'],
+                "filename": result['filename'],
+                "s3_key": result['s3_key'],
+                "audio_count": result['audio_count'],
+                "total_duration": result['total_duration'],
+                "codec": result['codec'],
+                "concat_path": result['concat_path'],
+                "mismatched_inputs": result['mismatched_inputs'],
+                "concat_time_s": result['concat_time_s'],
+                "message": f"{result['audio_count']} audio files concatenated ({result['concat_path']}) and uploaded to S3 successfully"
+            }
+
         elif operation == 'concat_video_audio':
             video_urls = job_input.get('video_urls', [])
             audio_url = job_input.get('audio_url')
+            # Optional: narration parts to join first (same as concat_audio, without the S3 round-trip)
+            audio_urls = [
+                normalize_url(item['audio_url'] if isinstance(item, dict) else item)
+                for item in job_input.get('audio_urls') or []
+            ]
             path = job_input.get('path')
             output_filename = job_input.get('output_filename')
             normalize = job_input.get('normalize', True)
 
-            if not video_urls or not audio_url or not path or not output_filename:
-                raise ValueError("Missing required fields: video_urls, audio_url, path, output_filename")
+            if not video_urls or not (audio_url or audio_urls) or not path or not output_filename:
+                raise ValueError("Missing required fields: video_urls, audio_url (or audio_urls), path, output_filename")
 
             if len(video_urls) < 1:
                 raise ValueError("At least 1 video URL is required")
 
             # Normalize audio URL
-            audio_url = normalize_url(audio_url)
+            if audio_url:
+                audio_url = normalize_url(audio_url)
 
             # Normalize video URLs (convert Google Drive URLs if needed)
             normalized_video_urls = []
@@ -2747,7 +4516,10 @@ def handler(job: Dict) -> Dict[str, Any]:
             logger.info(f"📤 S3 upload: bucket={S3_BUCKET_NAME}, path={path}, filename={output_filename}")
             logger.info(f"🔁 Cyclic concatenation: {len(normalized_video_urls)} videos, normalize={normalize}")
 
-            result = concatenate_videos_cyclic(normalized_video_urls, audio_url, path, output_filename, normalize, worker_id)
+            result = concatenate_videos_cyclic(
+                normalized_video_urls, audio_url, path, output_filename, normalize, worker_id, quality,
+                audio_urls=audio_urls or None
+            )
 
             # Build descriptive message
             cycle_info = f"{result['full_cycles']} full cycles"
@@ -2765,6 +4537,12 @@ def handler(job: Dict) -> Dict[str, Any]:
                 "video_duration": result['video_duration'],
                 "audio_duration": result['audio_duration'],
                 "duration_diff_ms": result['duration_diff_ms'],
+                "normalize": result['normalize'],
+                "trim": result['trim'],
+                "clip_cache": result['clip_cache'],
+                "plan": result['plan'],
+                "audio_concat": result['audio_concat'],
+                "draft": result['draft'],
                 "message": f"Cyclic concatenation complete: {cycle_info}, {result['total_segments']} segments, sync precision: {result['duration_diff_ms']}ms"
             }
 
@@ -2802,7 +4580,7 @@ def handler(job: Dict) -> Dict[str, Any]:
             else:
                 logger.info(f"🎵 Auto-normalizing trilha to -20dB below video")
 
-            result = add_trilha_sonora_gpu(url_video, trilha_sonora, path, output_filename, volume_reduction_db, worker_id)
+            result = add_trilha_sonora_gpu(url_video, trilha_sonora, path, output_filename, volume_reduction_db, worker_id, quality)
 
             return {
                 "success": True,
@@ -2812,9 +4590,11 @@ def handler(job: Dict) -> Dict[str, Any]:
                 "video_duration": result['video_duration'],
                 "trilha_duration": result['trilha_duration'],
                 "loops_applied": result['loops_applied'],
+                "loop_mode": result['loop_mode'],
                 "volume_reduction_db": result['volume_reduction_db'],
                 "gpu_accelerated": result['gpu_accelerated'],
                 "encoder": result['encoder'],
+                "draft": result['draft'],
                 "message": f"Trilha sonora added with GPU acceleration ({result['loops_applied']} loops, -{result['volume_reduction_db']}dB, {result['encoder']})"
             }
 
@@ -2887,4 +4667,11 @@ if __name__ == "__main__":
     logger.info("=" * 60)
 
     # Start RunPod handler
-    runpod.serverless.start({"handler": handler})
+    if STREAMING_HANDLER:
+        # Generator handler: per-clip events need a client reading /stream; /run,
+        # /runsync and /status return the list of all yielded events, whose last
+        # entry is the job result (the orchestrator's RunPodService unwraps it)
+        logger.info("📡 Streaming handler enabled (img2vid yields per-clip results)")
+        runpod.serverless.start({"handler": stream_handler, "return_aggregate_stream": True})
+    else:
+        runpod.serverless.start({"handler": handler})
@@ -0,0 +1,505 @@
+"""
+Segment-Parallel Encoder for CPU-only Workers
+Splits a long video at keyframes into N segments, encodes them in parallel
+libx264 processes and joins them with stream-copy concat.
+
+Why: a single libx264 process stops scaling past a few threads, so on 9+ vCPU
+containers N processes x few threads finish long renders much faster.
+
+Correctness:
+  - Segments start at source keyframes (cheap, exact seek points)
+  - Each segment is cut with half-frame guards: frames with pts in
+    [start - h, end - h) where h = 0.5 / fps, so every source frame lands in
+    exactly one segment (frame-accurate seams)
+  - Timeline filters (ass/subtitles) see original timestamps:
+    setpts=PTS+seek/TB,<filter>,setpts=PTS-STARTPTS
+  - Audio is never split: it is copied/encoded once in the final mux
+"""
+
+import os
+import time
+import logging
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from resource_tracker import run_tracked
+from media_probe import probe_media, get_stream, get_media_duration, parse_rate, probe_keyframe_times, probe_packet_times
+from stream_compat import stream_signature
+
+logger = logging.getLogger(__name__)
+
+# Chunked mode configuration
+# CHUNKED_ENCODING: "auto" (default) | "on" | "off"
+CHUNKED_ENCODING = os.getenv('CHUNKED_ENCODING', 'auto').lower()
+CHUNKED_MIN_VCPUS = int(os.getenv('CHUNKED_MIN_VCPUS', '9'))
+CHUNKED_MIN_DURATION = float(os.getenv('CHUNKED_MIN_DURATION', '120'))  # seconds
+CHUNK_THREADS = int(os.getenv('CHUNK_THREADS', '3'))  # libx264 threads per segment
+MIN_SEGMENT_DURATION = 10.0  # seconds - shorter segments waste encoder warm-up
+
+# Smart-cut trimming: stream-copy up to the last keyframe, re-encode only the tail GOP
+# SMART_CUT: "on" (default) | "off"
+SMART_CUT = os.getenv('SMART_CUT', 'on').lower() in ('on', 'true', '1')
+SMART_CUT_TOLERANCE = 0.1  # seconds - same limit as the cyclic sync warning
+SMART_CUT_MIN_COPY = 2.0  # seconds - shorter heads don't pay for the extra passes
+
+
+def should_use_chunked(
+    duration: float,
+    requested: Optional[bool],
+    gpu_available: bool,
+    vcpus: int
+) -> bool:
+    """
+    Decide whether to use segment-parallel encoding
+
+    Args:
+        duration: Video duration in seconds
+        requested: Job-level override (True/False), None = auto
+        gpu_available: NVENC available (chunking only helps libx264)
+        vcpus: Container vCPUs
+
+    Returns:
+        True if chunked mode should be used
+    """
+    if requested is not None:
+        return bool(requested) and vcpus >= 2
+    if CHUNKED_ENCODING == 'off':
+        return False
+    if CHUNKED_ENCODING == 'on':
+        return vcpus >= 2
+    # auto: CPU-only, large container, long video
+    return (
+        not gpu_available
+        and vcpus >= CHUNKED_MIN_VCPUS
+        and duration >= CHUNKED_MIN_DURATION
+    )
+
+
+def parallel_plan(vcpus: int, duration: float) -> Tuple[int, int]:
+    """
+    Compute (segment_count, threads_per_segment) for a container
+
+    Returns:
+        Tuple of segment count and libx264 threads per segment
+    """
+    threads = max(1, min(CHUNK_THREADS, vcpus))
+    segments = max(1, vcpus // threads)
+    # Avoid tiny segments on medium-length videos
+    segments = max(1, min(segments, int(duration // MIN_SEGMENT_DURATION)))
+    return segments, threads
+
+
+def pool_plan(jobs: int, vcpus: int) -> Tuple[int, int]:
+    """
+    Compute (workers, threads_per_job) for independent per-file encodes
+
+    Returns:
+        Tuple of concurrent ffmpeg processes and libx264 threads each
+    """
+    workers = max(1, min(jobs, vcpus // max(1, CHUNK_THREADS)))
+    threads = max(1, vcpus // workers)
+    return workers, threads
+
+
+# ============================================
+# Probing
+# ============================================
+
+def probe_video_stream(video_path: Path) -> Dict[str, Any]:
+    """Get duration, fps and dimensions of the first video stream (and whether audio exists)"""
+    info = probe_media(video_path)
+    stream = get_stream(info, 'video')
+    if stream is None:
+        raise RuntimeError(f"No video stream in {video_path}")
+
+    fps = parse_rate(stream.get('avg_frame_rate')) or parse_rate(stream.get('r_frame_rate')) or 30.0
+
+    return {
+        'width': int(stream['width']),
+        'height': int(stream['height']),
+        'fps': fps,
+        'duration': get_media_duration(info),
+        'has_audio': get_stream(info, 'audio') is not None
+    }
+
+
+def probe_keyframes(video_path: Path) -> List[float]:
+    """
+    List keyframe timestamps (seconds) of the first video stream
+
+    Reads packet flags only (no decoding).
+    """
+    return probe_keyframe_times(video_path)
+
+
+def plan_segments(
+    duration: float,
+    keyframes: List[float],
+    segment_count: int
+) -> List[Tuple[float, float]]:
+    """
+    Split [0, duration) into up to segment_count ranges at keyframes
+
+    Each boundary is the keyframe closest to an equal split point.
+
+    Returns:
+        List of (start, end) tuples covering the whole timeline
+    """
+    if segment_count <= 1 or not keyframes:
+        return [(0.0, duration)]
+
+    boundaries = [0.0]
+    for i in range(1, segment_count):
+        target = duration * i / segment_count
+        candidate = min(keyframes, key=lambda kf: abs(kf - target))
+        if candidate - boundaries[-1] >= MIN_SEGMENT_DURATION and duration - candidate >= MIN_SEGMENT_DURATION:
+            boundaries.append(candidate)
+    boundaries.append(duration)
+
+    return [(boundaries[i], boundaries[i + 1]) for i in range(len(boundaries) - 1)]
+
+
+# ============================================
+# Encoding
+# ============================================
+
+def _write_concat_list(list_path: Path, files: List[Path]) -> None:
+    with open(list_path, 'w', encoding='utf-8') as f:
+        for file in files:
+            abs_path = str(file.absolute()).replace('\\', '/')
+            f.write(f"file '{abs_path}'\n")
+
+
+def _run_parallel(commands: List[List[str]], workers: int, stage: str) -> float:
+    """Run ffmpeg commands in a bounded pool, preserving failure semantics"""
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_tracked, cmd, check=True, stage=stage) for cmd in commands]
+        for future in futures:
+            future.result()  # Propagate first failure
+    return time.time() - start
+
+
+def encode_segments_parallel(
+    input_path: Path,
+    output_path: Path,
+    work_dir: Path,
+    video_args: List[str],
+    vcpus: int,
+    video_filter: Optional[str] = None,
+    pts_factor: float = 1.0,
+    audio_path: Optional[Path] = None,
+    audio_args: Optional[List[str]] = None,
+    extra_output_args: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Encode a long video as N keyframe-aligned segments in parallel
+
+    Args:
+        input_path: Source video
+        output_path: Final MP4
+        work_dir: Directory for segment files (created/cleaned here)
+        video_args: Encoder args shared by all segments (e.g. libx264 preset/crf)
+        vcpus: Container vCPUs
+        video_filter: Timeline filter chain (e.g. "ass='file.ass'"), sees source timestamps
+        pts_factor: Retime factor applied per segment (add_audio speed sync)
+        audio_path: External audio for the final mux (None = source audio)
+        audio_args: Audio codec args for the final mux (default: copy)
+        extra_output_args: Extra args for the final mux (e.g. -shortest)
+
+    Returns:
+        Stats dict (segments, threads, encode/join timings)
+    """
+    info = probe_video_stream(input_path)
+    segment_count, threads = parallel_plan(vcpus, info['duration'])
+    keyframes = probe_keyframes(input_path) if segment_count > 1 else []
+    segments = plan_segments(info['duration'], keyframes, segment_count)
+
+    half_frame = 0.5 / info['fps']
+    logger.info(
+        f"🧩 Chunked encoding: {len(segments)} segments × {threads} threads "
+        f"({info['duration']:.1f}s @ {info['fps']:.3f}fps, {vcpus} vCPUs)"
+    )
+
+    work_dir.mkdir(parents=True, exist_ok=True)
+    segment_files: List[Path] = []
+    commands = []
+
+    for i, (start, end) in enumerate(segments):
+        seek = max(0.0, start - half_frame)
+        is_last = i == len(segments) - 1
+        segment_path = work_dir / f"segment_{i:03d}.mp4"
+        segment_files.append(segment_path)
+
+        filters = []
+        if video_filter:
+            # Restore source timeline for timeline-dependent filters, then rebase
+            filters.extend([f"setpts=PTS+{seek:.6f}/TB", video_filter, "setpts=PTS-STARTPTS"])
+        if abs(pts_factor - 1.0) > 1e-9:
+            filters.append(f"setpts={pts_factor:.6f}*PTS")
+
+        # -ss/-t as INPUT options: limits are in source time (independent of pts_factor)
+        cmd = ['ffmpeg', '-y', '-ss', f'{seek:.6f}']
+        if not is_last:
+            cmd.extend(['-t', f'{(end - half_frame) - seek:.6f}'])
+        cmd.extend(['-i', str(input_path)])
+        if filters:
+            cmd.extend(['-vf', ','.join(filters)])
+        cmd.extend(['-map', '0:v:0', '-an'])
+        cmd.extend(video_args)
+        cmd.extend(['-threads', str(threads), str(segment_path)])
+        commands.append(cmd)
+
+        logger.info(f"  • Segment {i}: {start:.3f}s → {end:.3f}s")
+
+    try:
+        encode_time = _run_parallel(commands, len(segments), 'chunk_encode')
+        logger.info(f"✅ {len(segments)} segments encoded in {encode_time:.2f}s")
+
+        # Join segments with stream copy; audio handled once here
+        list_path = work_dir / "segments.txt"
+        _write_concat_list(list_path, segment_files)
+
+        join_start = time.time()
+        cmd = [
+            'ffmpeg', '-y',
+            '-f', 'concat', '-safe', '0', '-i', str(list_path),
+            '-i', str(audio_path or input_path),
+            '-map', '0:v:0', '-map', '1:a:0?',
+            '-c:v', 'copy'
+        ]
+        cmd.extend(audio_args or ['-c:a', 'copy'])
+        if extra_output_args:
+            cmd.extend(extra_output_args)
+        cmd.extend(['-movflags', '+faststart', str(output_path)])
+
+        run_tracked(cmd, check=True, stage='chunk_join')
+        join_time = time.time() - join_start
+        logger.info(f"✅ Segments joined (stream copy) in {join_time:.2f}s")
+
+        return {
+            'chunked': True,
+            'segments': len(segments),
+            'threads_per_segment': threads,
+            'encode_time_s': round(encode_time, 2),
+            'join_time_s': round(join_time, 2)
+        }
+
+    finally:
+        for segment_path in segment_files:
+            segment_path.unlink(missing_ok=True)
+        (work_dir / "segments.txt").unlink(missing_ok=True)
+        try:
+            work_dir.rmdir()
+        except OSError:
+            pass
+
+
+def concat_inputs_parallel(
+    input_paths: List[Path],
+    output_path: Path,
+    work_dir: Path,
+    video_args: List[str],
+    vcpus: int,
+    audio_args: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Concatenate videos by encoding each input in parallel, then stream-copy join
+
+    All inputs are encoded to the first input's resolution/fps with identical
+    encoder settings so the concat demuxer can join them without re-encoding.
+    Audio is concatenated once in a separate audio-only pass.
+
+    Returns:
+        Stats dict (inputs, threads, encode/join timings)
+    """
+    reference = probe_video_stream(input_paths[0])
+    workers, threads = pool_plan(len(input_paths), vcpus)
+
+    logger.info(
+        f"🧩 Chunked concatenation: {len(input_paths)} inputs, {workers} parallel × {threads} threads "
+        f"→ {reference['width']}x{reference['height']}@{reference['fps']:.3f}fps"
+    )
+
+    work_dir.mkdir(parents=True, exist_ok=True)
+    encoded_files: List[Path] = []
+    audio_path = work_dir / "audio.m4a"
+    commands = []
+
+    vf = f"scale={reference['width']}:{reference['height']},fps={reference['fps']:.6f},format=yuv420p"
+    for i, input_path in enumerate(input_paths):
+        encoded_path = work_dir / f"part_{i:03d}.mp4"
+        encoded_files.append(encoded_path)
+        cmd = ['ffmpeg', '-y', '-i', str(input_path), '-map', '0:v:0', '-an', '-vf', vf]
+        cmd.extend(video_args)
+        cmd.extend(['-threads', str(threads), str(encoded_path)])
+        commands.append(cmd)
+
+    try:
+        encode_time = _run_parallel(commands, workers, 'chunk_encode')
+        logger.info(f"✅ {len(input_paths)} inputs encoded in {encode_time:.2f}s")
+
+        join_start = time.time()
+
+        # Audio: single concat pass over the original inputs (audio decode only).
+        # The concat demuxer takes its stream layout from the first input; a
+        # failure raises so the caller falls back to the single-process path.
+        has_audio = reference['has_audio']
+        if has_audio:
+            source_list = work_dir / "sources.txt"
+            _write_concat_list(source_list, input_paths)
+            run_tracked([
+                'ffmpeg', '-y',
+                '-f', 'concat', '-safe', '0', '-i', str(source_list),
+                '-vn', '-map', '0:a:0'
+            ] + (audio_args or ['-c:a', 'aac', '-b:a', '192k']) + [str(audio_path)], check=True, stage='chunk_audio')
+
+        list_path = work_dir / "parts.txt"
+        _write_concat_list(list_path, encoded_files)
+        cmd = ['ffmpeg', '-y', '-f', 'concat', '-safe', '0', '-i', str(list_path)]
+        if has_audio:
+            cmd.extend(['-i', str(audio_path), '-map', '0:v:0', '-map', '1:a:0'])
+        cmd.extend(['-c', 'copy', '-movflags', '+faststart', str(output_path)])
+
+        run_tracked(cmd, check=True, stage='chunk_join')
+        join_time = time.time() - join_start
+        logger.info(f"✅ Inputs joined (stream copy) in {join_time:.2f}s")
+
+        return {
+            'chunked': True,
+            'segments': len(input_paths),
+            'threads_per_segment': threads,
+            'encode_time_s': round(encode_time, 2),
+            'join_time_s': round(join_time, 2)
+        }
+
+    finally:
+        for file in encoded_files + [audio_path, work_dir / "sources.txt", work_dir / "parts.txt"]:
+            file.unlink(missing_ok=True)
+        try:
+            work_dir.rmdir()
+        except OSError:
+            pass
+
+
+# ============================================
+# Smart-cut trimming
+# ============================================
+
+def smart_trim(
+    input_path: Path,
+    output_path: Path,
+    duration: float,
+    video_args: List[str],
+    work_dir: Path
+) -> Optional[Dict[str, Any]]:
+    """
+    Keep [0, duration) of a video, re-encoding only the GOP containing the cut
+
+    The head (start → last keyframe before the cut) is stream-copied, the tail
+    is re-encoded from that keyframe and both are joined with the concat
+    demuxer. Only valid when video_args reproduce the input's encoder settings:
+    the tail must carry the same SPS/PPS as the copied head.
+
+    The head is cut by frame count, not "-t": "-t" stops on DTS, and with
+    B-frames the next GOP's keyframe (and its reordered P-frame) decode
+    before the cut time, so they would land in the head and again in the
+    tail. The head's frame count and last PTS are checked before joining.
+
+    Args:
+        input_path: Video to trim (video stream only is kept)
+        output_path: Trimmed output
+        duration: Requested duration in seconds
+        video_args: Encoder args matching the input (codec, preset, profile, level, pix_fmt, fps)
+        work_dir: Directory for the head/tail parts
+
+    Returns:
+        Stats dict (copied_s, encoded_s, error_ms, time_s) or None when the
+        caller should fall back to a full re-encode
+    """
+    if not SMART_CUT:
+        return None
+
+    start = time.time()
+    packets = probe_packet_times(input_path)
+    keyframes = sorted(set(pts for pts, keyframe in packets if keyframe))
+    if not keyframes:
+        return None
+
+    # Keyframe times relative to the first one (ffmpeg -ss/-t timeline)
+    origin = keyframes[0]
+    split = max((kf - origin for kf in keyframes if kf - origin < duration - 1e-3), default=0.0)
+    if split < SMART_CUT_MIN_COPY:
+        return None
+
+    # Frames presented before the split keyframe (closed GOPs: also the first ones decoded)
+    head_frames = sum(1 for pts, _ in packets if pts - origin < split - 1e-6)
+
+    head_path = work_dir / f"{output_path.stem}_head.mp4"
+    tail_path = work_dir / f"{output_path.stem}_tail.mp4"
+    list_path = work_dir / f"{output_path.stem}_parts.txt"
+
+    try:
+        run_tracked([
+            'ffmpeg', '-y', '-i', str(input_path),
+            '-map', '0:v:0', '-an', '-frames:v', str(head_frames),
+            '-c', 'copy', str(head_path)
+        ], check=True, stage='trim')
+
+        # Open GOPs (or odd muxing) reorder frames across the split: don't join a broken seam
+        head_packets = probe_packet_times(head_path)
+        head_origin = min((pts for pts, _ in head_packets), default=0.0)
+        if len(head_packets) != head_frames or any(pts - head_origin >= split - 1e-6 for pts, _ in head_packets):
+            logger.info(
+                f"✂️ Smart-cut: copied head has {len(head_packets)}/{head_frames} frames before "
+                f"{split:.3f}s, using full re-encode"
+            )
+            return None
+
+        run_tracked([
+            'ffmpeg', '-y', '-ss', f'{split:.6f}', '-i', str(input_path),
+            '-map', '0:v:0', '-an', '-t', f'{duration - split:.6f}'
+        ] + video_args + [str(tail_path)], check=True, stage='trim')
+
+        head_signature = stream_signature(probe_media(head_path), include_audio=False)
+        if stream_signature(probe_media(tail_path), include_audio=False) != head_signature:
+            logger.info("✂️ Smart-cut: re-encoded tail differs from the source parameters, using full re-encode")
+            return None
+
+        _write_concat_list(list_path, [head_path, tail_path])
+        run_tracked([
+            'ffmpeg', '-y', '-f', 'concat', '-safe', '0', '-i', str(list_path),
+            '-c', 'copy', '-movflags', '+faststart', str(output_path)
+        ], check=True, stage='trim')
+
+        actual = get_media_duration(probe_media(output_path))
+        error = abs(actual - duration) if actual is not None else float('inf')
+        if error > SMART_CUT_TOLERANCE:
+            logger.info(f"✂️ Smart-cut: duration error {error * 1000:.0f}ms above tolerance, using full re-encode")
+            output_path.unlink(missing_ok=True)
+            return None
+
+        stats = {
+            'copied_s': round(split, 3),
+            'encoded_s': round(duration - split, 3),
+            'duration': actual,
+            'error_ms': round(error * 1000, 1),
+            'time_s': round(time.time() - start, 2)
+        }
+        logger.info(
+            f"✂️ Smart-cut: {split:.3f}s copied + {duration - split:.3f}s re-encoded "
+            f"(error {stats['error_ms']}ms, {stats['time_s']:.2f}s)"
+        )
+        return stats
+
+    except (subprocess.CalledProcessError, RuntimeError) as e:
+        stderr = getattr(e, 'stderr', None) or str(e)
+        logger.warning(f"⚠️ Smart-cut failed, using full re-encode: {stderr[-200:]}")
+        output_path.unlink(missing_ok=True)
+        return None
+
+    finally:
+        for file in (head_path, tail_path, list_path):
+            file.unlink(missing_ok=True)
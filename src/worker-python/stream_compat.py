@@ -0,0 +1,194 @@
+"""
+Stream Compatibility Analyzer for copy-only concatenation
+The concat demuxer with "-c copy" is only safe when every input carries the
+same stream layout and decoder configuration:
+  - Video: codec, profile, level, pix_fmt, size, SAR, frame rate, time base
+    and identical extradata (H.264 SPS/PPS - the output keeps only the first
+    file's, so different encoder settings would decode with the wrong SPS)
+  - Audio: codec, profile, sample rate, channels, layout
+
+Audio-only inputs (MP3/AAC narration) also need the same container and the
+audio stream at the same index (MP3 cover art is a video stream).
+
+Inputs are compared on probe_media() dicts (cached in the metadata store).
+
+Usage:
+    compat = analyze_concat_compat([probe(p) for p in inputs])
+    if compat['compatible']: stream copy, else re-encode
+    analyze_audio_concat_compat(infos): same check for audio-only files
+    spec_differences(info, spec): keys where an input misses a normalization target
+"""
+
+import os
+import logging
+from collections import Counter
+from fractions import Fraction
+from typing import Dict, List, Any
+
+from media_probe import get_stream
+
+logger = logging.getLogger(__name__)
+
+# STREAM_COPY_CONCAT: "on" (default) | "off" (always re-encode / normalize every input)
+STREAM_COPY_CONCAT = os.getenv('STREAM_COPY_CONCAT', 'on').lower() in ('on', 'true', '1')
+
+VIDEO_KEYS = (
+    'codec_name', 'profile', 'level', 'pix_fmt', 'width', 'height',
+    'sample_aspect_ratio', 'r_frame_rate', 'time_base', 'extradata_hash'
+)
+AUDIO_KEYS = ('codec_name', 'profile', 'sample_rate', 'channels', 'channel_layout', 'extradata_hash')
+
+
+def _normalize_value(key: str, value: Any) -> Any:
+    """Canonical form so PyAV and ffprobe spellings compare equal"""
+    if value in (None, '', 'unknown', 'N/A'):
+        return None
+    if key in ('r_frame_rate', 'time_base', 'sample_aspect_ratio'):
+        try:
+            fraction = Fraction(str(value).replace(':', '/'))
+        except (ValueError, ZeroDivisionError):
+            return str(value)
+        # SAR 0:1 (unset) is displayed as square pixels
+        if key == 'sample_aspect_ratio' and fraction == 0:
+            return Fraction(1)
+        return fraction
+    if key == 'profile':
+        return str(value).lower()
+    if key == 'level' and isinstance(value, int) and value < 0:  # FF_LEVEL_UNKNOWN (-99)
+        return None
+    return value
+
+
+def stream_signature(info: Dict[str, Any], include_audio: bool = True) -> Dict[str, Any]:
+    """
+    Comparable stream parameters of a probed file
+
+    Returns:
+        Dict with video_index, video (dict or None) and audio (dict or None)
+    """
+    video = get_stream(info, 'video')
+    audio = get_stream(info, 'audio') if include_audio else None
+    video_index = video.get('index') if video else None
+    return {
+        # Concat maps streams by index: video must sit at the same position everywhere
+        'video_index': video_index,
+        'video': {k: _normalize_value(k, video.get(k)) for k in VIDEO_KEYS} if video else None,
+        'audio': {k: _normalize_value(k, audio.get(k)) for k in AUDIO_KEYS} if audio else None
+    }
+
+
+def audio_signature(info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Comparable parameters of a probed audio-only file
+
+    Returns:
+        Dict with format, audio_index and audio (dict or None)
+    """
+    audio = get_stream(info, 'audio')
+    return {
+        'format': info.get('format_name'),
+        'audio_index': audio.get('index') if audio else None,
+        'audio': {k: _normalize_value(k, audio.get(k)) for k in AUDIO_KEYS} if audio else None
+    }
+
+
+def _differences(a: Dict[str, Any], b: Dict[str, Any]) -> List[str]:
+    """Keys (video_index, video.x, audio.x, ...) that differ between two signatures"""
+    diffs = []
+    for key in a:
+        if isinstance(a[key], dict) and isinstance(b[key], dict):
+            diffs.extend(f"{key}.{k}" for k in a[key] if a[key][k] != b[key][k])
+        elif a[key] != b[key]:
+            diffs.append(key)
+    return diffs
+
+
+def _freeze(signature: Dict[str, Any]) -> tuple:
+    return tuple(
+        (key, tuple(sorted(value.items())) if isinstance(value, dict) else value)
+        for key, value in sorted(signature.items())
+    )
+
+
+def analyze_concat_compat(infos: List[Dict[str, Any]], include_audio: bool = True) -> Dict[str, Any]:
+    """
+    Check whether inputs can be joined with stream copy
+
+    The most common signature is the reference, so the result names the
+    minority of inputs that differ.
+
+    Args:
+        infos: probe_media() dicts, in concat order
+        include_audio: Compare audio streams too (False when audio is replaced)
+
+    Returns:
+        Dict with compatible, mismatched (input indices), differences
+        (index → differing keys) and reference (signature)
+    """
+    return _compare_signatures([stream_signature(info, include_audio) for info in infos], 'video')
+
+
+def analyze_audio_concat_compat(infos: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Check whether audio-only inputs can be joined with stream copy
+
+    Args:
+        infos: probe_media() dicts, in concat order
+
+    Returns:
+        Same structure as analyze_concat_compat (reference = audio_signature)
+    """
+    return _compare_signatures([audio_signature(info) for info in infos], 'audio')
+
+
+def _compare_signatures(signatures: List[Dict[str, Any]], required: str) -> Dict[str, Any]:
+    """Majority reference + per-input differences (required stream kind must exist)"""
+    if not signatures:
+        return {'compatible': False, 'mismatched': [], 'differences': {}, 'reference': None}
+
+    counts = Counter(_freeze(s) for s in signatures)
+    reference_key = counts.most_common(1)[0][0]
+    reference = next(s for s in signatures if _freeze(s) == reference_key)
+
+    differences = {
+        i: _differences(reference, s)
+        for i, s in enumerate(signatures)
+        if _freeze(s) != reference_key
+    }
+    compatible = not differences and reference[required] is not None
+
+    if compatible:
+        logger.info(f"🧬 Stream compat: {len(signatures)} inputs identical → stream copy is safe")
+    else:
+        summary = '; '.join(f"{i}: {', '.join(d)}" for i, d in list(differences.items())[:5])
+        logger.info(
+            f"🧬 Stream compat: {len(differences)}/{len(signatures)} inputs differ from the reference ({summary})"
+        )
+
+    return {
+        'compatible': compatible,
+        'mismatched': sorted(differences),
+        'differences': differences,
+        'reference': reference
+    }
+
+
+def spec_differences(info: Dict[str, Any], spec: Dict[str, Any]) -> List[str]:
+    """
+    Compare the video stream of a probed file with a normalization target
+
+    Args:
+        info: probe_media() dict
+        spec: Target values for any of VIDEO_KEYS (e.g. codec_name, profile,
+            pix_fmt, width, height, r_frame_rate, sample_aspect_ratio)
+
+    Returns:
+        List of differing keys (empty = matches)
+    """
+    video = get_stream(info, 'video')
+    if not video:
+        return ['video']
+    return [
+        key for key, expected in spec.items()
+        if _normalize_value(key, video.get(key)) != _normalize_value(key, expected)
+    ]
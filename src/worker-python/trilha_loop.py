@@ -0,0 +1,105 @@
+"""
+Soundtrack Looping for trilhasonora
+The soundtrack is looped under the video's audio for the whole video. The
+aloop filter (legacy) keeps every decoded sample in RAM: a 10 minute stereo
+48 kHz track is ~230 MB of float PCM per job before the first loop plays.
+
+Loop modes (TRILHA_LOOP):
+  - "stream" (default): -stream_loop -1 on the soundtrack input. The demuxer
+    rewinds the file at EOF and the decoder streams it again, so memory is
+    constant whatever the track length; amix duration=first ends the
+    infinite input with the video's audio.
+  - "aloop" (legacy): aloop filter with the whole track buffered.
+
+Optional crossfade at the loop seam (TRILHA_CROSSFADE seconds, stream mode):
+a loop unit is rendered once where the track's tail fades into its start,
+then that unit is stream-looped.
+"""
+
+import os
+import subprocess
+import logging
+from pathlib import Path
+from typing import List, Tuple
+
+from resource_tracker import run_tracked
+
+logger = logging.getLogger(__name__)
+
+# TRILHA_LOOP: "stream" (default) | "aloop"
+TRILHA_LOOP = os.getenv('TRILHA_LOOP', 'stream').lower()
+TRILHA_CROSSFADE = float(os.getenv('TRILHA_CROSSFADE', '0'))  # Seconds (0 = hard seam)
+
+
+def build_loop_unit(trilha_path: Path, trilha_duration: float, crossfade: float) -> Path:
+    """
+    Render a seamless loop unit: acrossfade(track[T-d:T], track[0:T-d])
+
+    The unit lasts T-d and its end flows straight into its own (faded) start.
+    The track is opened twice (seeked tail + trimmed body), so only the
+    crossfade window is buffered. Written as FLAC (lossless, cheap to decode).
+    """
+    body_end = trilha_duration - crossfade
+    unit_path = trilha_path.with_name(f"{trilha_path.stem}_loop.flac")
+    cmd = [
+        'ffmpeg', '-y',
+        '-ss', f'{body_end:.3f}', '-i', str(trilha_path),  # Input 0: tail
+        '-i', str(trilha_path),                             # Input 1: body
+        '-filter_complex',
+        f"[1:a]atrim=end={body_end:.3f},asetpts=PTS-STARTPTS[body];"
+        f"[0:a][body]acrossfade=d={crossfade:.3f}:c1=tri:c2=tri[unit]",
+        '-map', '[unit]',
+        '-c:a', 'flac',
+        str(unit_path)
+    ]
+    run_tracked(cmd, capture_output=True, text=True, check=True, stage='trilha_loop')
+    return unit_path
+
+
+def build_trilha_mix(
+    trilha_path: Path,
+    trilha_duration: float,
+    loops_needed: int,
+    volume_reduction_db: float,
+    mode: str = TRILHA_LOOP,
+    crossfade: float = TRILHA_CROSSFADE
+) -> Tuple[List[str], str, List[Path], str]:
+    """
+    Soundtrack input args and filter graph (input 0 = video, input 1 = trilha)
+
+    Args:
+        trilha_path: Local soundtrack file
+        trilha_duration: Soundtrack duration in seconds
+        loops_needed: Plays needed to cover the video (aloop mode)
+        volume_reduction_db: Soundtrack attenuation
+        mode: "stream" | "aloop"
+        crossfade: Loop seam crossfade in seconds (stream mode, 0 = off)
+
+    Returns:
+        Tuple of (input args for the soundtrack, filter_complex producing
+        [aout], temporary files to delete, loop mode used)
+    """
+    if mode == 'aloop':
+        filter_complex = (
+            f"[1:a]aloop=loop={loops_needed}:size=2e+09[loop];"  # Loop soundtrack (size=2e+09 for safety)
+            f"[loop]volume=-{volume_reduction_db}dB[reduced];"   # Reduce volume
+            f"[0:a][reduced]amix=inputs=2:duration=first[aout]"  # Mix original + reduced soundtrack
+        )
+        return ['-i', str(trilha_path)], filter_complex, [], 'aloop'
+
+    loop_source, temp_files, loop_mode = trilha_path, [], 'stream'
+    # Crossfade only matters when the seam is heard, and must fit twice in the track
+    if loops_needed > 1 and 0 < crossfade < trilha_duration / 2:
+        try:
+            loop_source = build_loop_unit(trilha_path, trilha_duration, crossfade)
+            temp_files.append(loop_source)
+            loop_mode = 'crossfade'
+            logger.info(f"🔁 Trilha loop unit with {crossfade:.1f}s crossfade at the seam")
+        except subprocess.CalledProcessError as e:
+            logger.warning(f"⚠️ Trilha loop unit failed, looping with a hard seam: {(e.stderr or '')[-200:]}")
+
+    filter_complex = (
+        f"[1:a]volume=-{volume_reduction_db}dB[reduced];"    # Reduce volume (input loops endlessly)
+        f"[0:a][reduced]amix=inputs=2:duration=first[aout]"  # Mix, ends with the original audio
+    )
+    return ['-stream_loop', '-1', '-i', str(loop_source)], filter_complex, temp_files, loop_mode
@@ -0,0 +1,140 @@
+"""
+Upscale Planner for image_to_video
+Chooses the working resolution the image is lanczos-upscaled to before
+zoompan, instead of a fixed factor of the source size.
+
+Why upscale at all: zoompan places its crop window on integer pixels of the
+working image. One working pixel maps to
+
+    q = out_w * zoom / W    output pixels
+
+so the crop moves in steps of q. Motion is smooth when q is sub-pixel
+(below the tolerance) and small compared to the per-frame motion.
+
+Plan:
+  1. Required W from tolerance:     W >= out_w * max_zoom / tolerance
+  2. Required W from motion:        q <= motion_per_frame / 2
+  3. Floor (no detail loss at max zoom): W >= out_w * max_zoom
+  4. Cap: working frames must fit the memory budget of one concurrent slot
+The source aspect ratio is preserved (same as the fixed-factor behavior).
+"""
+
+import os
+import math
+import logging
+from typing import Dict, Any, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# Memory share (of container RAM) usable by concurrent img2vid slots
+UPSCALE_MEMORY_FRACTION = float(os.getenv('UPSCALE_MEMORY_FRACTION', '0.6'))
+
+# yuv420p working frames alive at once in scale → zoompan (scaler output,
+# zoompan input hold, scaler scratch)
+BYTES_PER_WORKING_PIXEL = 1.5
+WORKING_FRAME_COPIES = 3
+# Decoded source (yuvj444p worst case) + scaler line buffers
+BYTES_PER_SOURCE_PIXEL = 3.0
+
+
+def get_container_memory_bytes() -> int:
+    """Container memory limit (cgroup v2/v1), falling back to host RAM"""
+    for cgroup_file in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        try:
+            with open(cgroup_file, 'r') as f:
+                value = f.read().strip()
+            if value != 'max':
+                limit = int(value)
+                # cgroup v1 reports a huge number when unlimited
+                if 0 < limit < psutil.virtual_memory().total:
+                    return limit
+        except (OSError, ValueError):
+            continue
+    return psutil.virtual_memory().total
+
+
+def memory_budget_per_slot(concurrent_slots: int) -> int:
+    """Bytes one image_to_video job may use for its working frames"""
+    return int(get_container_memory_bytes() * UPSCALE_MEMORY_FRACTION / max(1, concurrent_slots))
+
+
+def _even(value: float) -> int:
+    return max(2, int(math.ceil(value / 2.0)) * 2)
+
+
+def estimate_memory_bytes(width: int, height: int, src_width: int, src_height: int) -> int:
+    """Estimated peak memory of the scale → zoompan chain"""
+    working = width * height * BYTES_PER_WORKING_PIXEL * WORKING_FRAME_COPIES
+    source = src_width * src_height * BYTES_PER_SOURCE_PIXEL
+    return int(working + source)
+
+
+def plan_working_resolution(
+    src_width: int,
+    src_height: int,
+    out_width: int,
+    out_height: int,
+    max_zoom: float,
+    total_frames: float,
+    tolerance: float,
+    memory_budget: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Compute the smallest working resolution with sub-pixel-smooth zoompan motion
+
+    Args:
+        src_width, src_height: Source image dimensions
+        out_width, out_height: Output video dimensions
+        max_zoom: Largest zoom reached by the effect (e.g. 1.40)
+        total_frames: Frames in the clip
+        tolerance: Max crop step in output pixels (0.25 = quarter pixel)
+        memory_budget: Bytes available to this job (None = unbounded)
+
+    Returns:
+        Dict with width, height, factor, step_px, estimated_mb, limited_by
+    """
+    # Crop edge motion per frame in output pixels (zoom from 1 to max_zoom)
+    motion_per_frame = out_width * (max_zoom - 1.0) / (2.0 * max(1.0, total_frames))
+
+    step_target = tolerance
+    limited_by = 'tolerance'
+    if motion_per_frame > 0 and motion_per_frame / 2.0 < step_target:
+        step_target = motion_per_frame / 2.0
+        limited_by = 'motion'
+
+    # Never go below full detail at max zoom (step = 1 output pixel)
+    step_target = min(step_target, 1.0)
+    if step_target == 1.0:
+        limited_by = 'floor'
+
+    # Required working size per axis, then scale the source uniformly (keep aspect)
+    required_w = out_width * max_zoom / step_target
+    required_h = out_height * max_zoom / step_target
+    factor = max(required_w / src_width, required_h / src_height)
+
+    if memory_budget:
+        # Solve estimate_memory_bytes(factor) <= budget for factor
+        src_pixels = src_width * src_height
+        available = memory_budget - src_pixels * BYTES_PER_SOURCE_PIXEL
+        max_factor = math.sqrt(max(available, 0) / (src_pixels * BYTES_PER_WORKING_PIXEL * WORKING_FRAME_COPIES))
+        floor_factor = max(out_width * max_zoom / src_width, out_height * max_zoom / src_height)
+        if factor > max_factor:
+            # Memory cap wins over smoothness, but never below the detail floor
+            factor = max(max_factor, floor_factor)
+            limited_by = 'memory'
+
+    width = _even(src_width * factor)
+    height = _even(src_height * factor)
+    step_px = out_width * max_zoom / width
+
+    return {
+        'width': width,
+        'height': height,
+        'factor': round(factor, 3),
+        'step_px': round(step_px, 3),
+        'motion_px_per_frame': round(motion_per_frame, 3),
+        'estimated_mb': round(estimate_memory_bytes(width, height, src_width, src_height) / (1024 * 1024), 1),
+        'limited_by': limited_by
+    }